@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Adaptive Monte Carlo
+====================================================
+
+Runs a simulation in batches until every reported metric is known to a
+requested precision, instead of using a fixed sample size:
+- each metric is a per-sample observation whose mean is reported
+  (lifespan, 0/100 survival indicators, retention indicators, ...)
+- running mean and variance are merged batch by batch (Chan et al.)
+- sampling stops when every CI half-width is within tolerance, or when the
+  time budget or sample cap is reached
+
+Usage
+-----
+    result = adaptive_civilization_survival(tolerance=0.5, time_budget=10)
+    print(result.estimates)
+    print(result.n_samples, result.stop_reason)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Union
+import time
+
+from kernels import civilization_lifespans
+from temporal_validation_framework import (threat_exposure, memory_half_lives,
+                                           MEMORY_TIERS, MEMORY_CHECKPOINTS)
+
+
+Sampler = Callable[[int, np.random.RandomState], Dict[str, np.ndarray]]
+
+
+@dataclass
+class AdaptiveResult:
+    """Outcome of an adaptive Monte Carlo run."""
+    estimates: pd.DataFrame
+    n_samples: int
+    n_batches: int
+    elapsed: float
+    converged: bool
+    stop_reason: str
+
+
+class RunningMoments:
+    """Count, mean and sum of squared deviations per metric, merged by batch."""
+    
+    def __init__(self):
+        self.count: Dict[str, int] = {}
+        self.mean: Dict[str, float] = {}
+        self.m2: Dict[str, float] = {}
+    
+    def update(self, name: str, values: np.ndarray) -> None:
+        """Merge one batch of observations; NaN marks 'not applicable'."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        n_b = len(values)
+        if n_b == 0:
+            self.count.setdefault(name, 0)
+            self.mean.setdefault(name, 0.0)
+            self.m2.setdefault(name, 0.0)
+            return
+        
+        mean_b = values.mean()
+        m2_b = np.sum((values - mean_b) ** 2)
+        n_a = self.count.get(name, 0)
+        mean_a = self.mean.get(name, 0.0)
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        
+        self.count[name] = n
+        self.mean[name] = mean_a + delta * n_b / n
+        self.m2[name] = self.m2.get(name, 0.0) + m2_b + delta ** 2 * n_a * n_b / n
+    
+    def summary(self, confidence: float) -> pd.DataFrame:
+        """Mean, standard deviation and CI per metric."""
+        z = stats.norm.ppf(0.5 + confidence / 2)
+        rows = []
+        for name, n in self.count.items():
+            var = self.m2[name] / (n - 1) if n > 1 else np.nan
+            half_width = z * np.sqrt(var / n) if n > 1 else np.inf
+            mean = self.mean[name] if n > 0 else np.nan
+            rows.append({
+                'metric': name,
+                'mean': mean,
+                'std': np.sqrt(var),
+                'ci_low': mean - half_width,
+                'ci_high': mean + half_width,
+                'half_width': half_width,
+                'n': n,
+            })
+        return pd.DataFrame(rows)
+
+
+def adaptive_monte_carlo(sampler: Sampler, tolerance: Union[float, Dict[str, float]],
+                         relative: bool = False, confidence: float = 0.95,
+                         batch_size: int = 1000, min_samples: int = 1000,
+                         max_samples: int = 10_000_000,
+                         time_budget: Optional[float] = None,
+                         seed: int = 42) -> AdaptiveResult:
+    """
+    Sample in batches until every metric's CI is narrow enough.
+    
+    Parameters
+    ----------
+    sampler : callable
+        sampler(n, rng) -> {metric: array of n per-sample observations}
+    tolerance : float or Dict[str, float]
+        Target CI half-width, for all metrics or per metric (metrics not
+        listed are reported but do not gate stopping)
+    relative : bool
+        Interpret tolerance as a fraction of |mean|
+    confidence : float
+        CI confidence level
+    batch_size : int
+        Samples per batch
+    min_samples : int
+        Samples drawn before convergence is checked; also the observations
+        a metric needs before it counts as converged (a metric seen a few
+        times with identical values has zero variance, not a narrow CI)
+    max_samples : int
+        Hard cap on samples
+    time_budget : float, optional
+        Wall-clock seconds after which sampling stops
+    seed : int
+        Random seed
+    
+    Returns
+    -------
+    AdaptiveResult
+        Per-metric estimates (mean, std, CI, half-width, n, target,
+        converged) with the samples used and why sampling stopped
+    """
+    rng = np.random.RandomState(seed)
+    moments = RunningMoments()
+    started = time.perf_counter()
+    n_samples = 0
+    n_batches = 0
+    
+    while True:
+        n = min(batch_size, max_samples - n_samples)
+        for name, values in sampler(n, rng).items():
+            moments.update(name, values)
+        n_samples += n
+        n_batches += 1
+        elapsed = time.perf_counter() - started
+        
+        estimates = moments.summary(confidence)
+        if isinstance(tolerance, dict):
+            target = estimates['metric'].map(tolerance).astype(np.float64)
+        else:
+            target = pd.Series(float(tolerance), index=estimates.index)
+        if relative:
+            target = target * estimates['mean'].abs()
+        estimates['target'] = target
+        estimates['converged'] = (estimates['half_width'] <= target) & (estimates['n'] >= min_samples)
+        
+        gating = target.notna()
+        converged = bool(estimates.loc[gating, 'converged'].all())
+        if n_samples >= min_samples and converged:
+            stop_reason = 'tolerance'
+            break
+        if n_samples >= max_samples:
+            stop_reason = 'max_samples'
+            break
+        if time_budget is not None and elapsed >= time_budget:
+            stop_reason = 'time_budget'
+            break
+    
+    return AdaptiveResult(estimates, n_samples, n_batches, elapsed,
+                          converged and n_samples >= min_samples, stop_reason)
+
+
+# =============================================================================
+# SAMPLERS FOR THE FRAMEWORK SIMULATIONS
+# =============================================================================
+
+def civilization_sampler(tau_distribution: Optional[Dict[str, float]] = None,
+                         max_years: int = 500, backend: Optional[str] = None) -> Sampler:
+    """
+    Per-civilization observations for `simulate_civilization_survival`.
+    
+    Metrics: avg_lifespan (years), survival_250y and survival_500y (0/100
+    indicators, so their means are percentages).
+    """
+    if tau_distribution is None:
+        tau_distribution = {'quarterly': 0.70, 'decadal': 0.25, 'generational': 0.04, 'civilizational': 0.01}
+    short_vulnerable, medium_vulnerable, century_vulnerable = (
+        bool(v) for v in threat_exposure(tau_distribution)
+    )
+    
+    def sample(n: int, rng: np.random.RandomState) -> Dict[str, np.ndarray]:
+        lifespans = civilization_lifespans(rng.random_sample((n, max_years, 6)), max_years,
+                                           short_vulnerable, medium_vulnerable,
+                                           century_vulnerable, backend=backend)
+        return {
+            'avg_lifespan': lifespans,
+            'survival_250y': (lifespans >= 250) * 100.0,
+            'survival_500y': (lifespans >= 500) * 100.0,
+        }
+    
+    return sample
+
+
+def memory_decay_sampler() -> Sampler:
+    """
+    Per-item observations for `simulate_memory_decay`.
+    
+    '<Tier> share' is 100 for items in the tier, else 0 (the tier's share of
+    items, in percent). '<Tier> <days>d' is 100 if an item in the tier
+    retains more than 10% of its memory at that checkpoint, 0 if it does
+    not, and NaN for items outside the tier.
+    """
+    def sample(n: int, rng: np.random.RandomState) -> Dict[str, np.ndarray]:
+        tvi_scores = rng.pareto(1.5, n) * 2
+        half_lives = memory_half_lives(tvi_scores)
+        observations = {}
+        for tier_name, (low, high) in MEMORY_TIERS:
+            observations[f'{tier_name} share'] = ((tvi_scores >= low) & (tvi_scores < high)) * 100.0
+        for t in MEMORY_CHECKPOINTS:
+            retained = np.where(0.5 ** (t / half_lives) > 0.1, 100.0, 0.0)
+            for tier_name, (low, high) in MEMORY_TIERS:
+                in_tier = (tvi_scores >= low) & (tvi_scores < high)
+                observations[f'{tier_name} {t}d'] = np.where(in_tier, retained, np.nan)
+        return observations
+    
+    return sample
+
+
+def adaptive_civilization_survival(tau_distribution: Optional[Dict[str, float]] = None,
+                                   max_years: int = 500, tolerance: float = 1.0,
+                                   **kwargs) -> AdaptiveResult:
+    """
+    Civilization survival with sample size chosen by precision.
+    
+    `tolerance` is the CI half-width in the units of each metric (years for
+    avg_lifespan, percentage points for the survival rates); other keyword
+    arguments go to `adaptive_monte_carlo`.
+    """
+    return adaptive_monte_carlo(civilization_sampler(tau_distribution, max_years),
+                                tolerance, **kwargs)
+
+
+def adaptive_memory_decay(tolerance: float = 1.0, **kwargs) -> AdaptiveResult:
+    """
+    Memory retention by tier and checkpoint with sample size chosen by precision.
+    
+    `tolerance` is the CI half-width in percentage points of retention;
+    other keyword arguments go to `adaptive_monte_carlo`. Rare tiers need
+    the most samples; pass a per-metric tolerance dict to gate on a subset.
+    """
+    return adaptive_monte_carlo(memory_decay_sampler(), tolerance, **kwargs)
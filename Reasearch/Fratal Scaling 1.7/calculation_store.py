@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Bulk Calculation Storage
+========================================================
+
+Writes batch scoring results into the `calculations` table from
+supabase/migrations/001_init.sql (domain, inputs jsonb, outputs jsonb) using
+PostgreSQL COPY instead of one INSERT per row.
+
+- Rows are encoded to CSV in batches (JSON via pandas' C encoder)
+- Batches go through a bounded queue to writer threads; `submit` blocks
+  when the queue is full, so producers cannot outrun the database
+- Each writer holds a pooled connection and COPYs one batch per
+  transaction into a temporary staging table, then inserts it into
+  `calculations` with ON CONFLICT (id) DO NOTHING
+- Row ids are generated when a batch is encoded, so retrying a batch whose
+  commit did go through (the connection dropped before the
+  acknowledgement) inserts nothing twice
+- Connection-level failures are retried with exponential backoff
+
+Requires psycopg2 (`pip install psycopg2-binary`).
+
+Usage
+-----
+    with CalculationStore('postgresql://localhost/tvi') as store:
+        store.submit('viral', inputs_frame, outputs_frame)
+    print(store.stats)
+    
+    python calculation_store.py postgresql://localhost/tvi 1000000
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import List, Optional
+import csv
+import io
+import queue
+import sys
+import threading
+import time
+import uuid
+
+try:
+    import psycopg2
+    from psycopg2 import pool as pg_pool
+except ImportError:
+    psycopg2 = None
+    pg_pool = None
+
+
+# Stand-alone version of the Supabase table for local Postgres testing
+# (auth.users does not exist outside Supabase, so user_id has no FK here)
+LOCAL_SCHEMA_SQL = """
+create table if not exists calculations (
+  id uuid primary key default gen_random_uuid(),
+  user_id uuid,
+  domain text not null,
+  inputs jsonb,
+  outputs jsonb,
+  created_at timestamptz default now()
+);
+"""
+
+COPY_COLUMNS = ('id', 'user_id', 'domain', 'inputs', 'outputs')
+
+
+@dataclass
+class CopyStats:
+    """Running totals for a CalculationStore."""
+    rows: int = 0
+    batches: int = 0
+    bytes: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+    
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+def encode_calculations(domain: str, inputs: pd.DataFrame, outputs: pd.DataFrame,
+                        user_id: Optional[str] = None) -> str:
+    """
+    Encode rows of (id, user_id, domain, inputs, outputs) as COPY-ready CSV.
+    
+    Each row of `inputs`/`outputs` becomes one jsonb document; each row
+    gets a fresh uuid, which makes re-sending the payload idempotent.
+    """
+    if len(inputs) != len(outputs):
+        raise ValueError("inputs and outputs must have the same number of rows")
+    inputs_json = inputs.to_json(orient='records', lines=True, double_precision=15).splitlines() if len(inputs) else []
+    outputs_json = outputs.to_json(orient='records', lines=True, double_precision=15).splitlines() if len(outputs) else []
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    user = '' if user_id is None else user_id
+    for row_inputs, row_outputs in zip(inputs_json, outputs_json):
+        writer.writerow((uuid.uuid4(), user, domain, row_inputs, row_outputs))
+    return buffer.getvalue()
+
+
+class CalculationStore:
+    """
+    Pooled, back-pressured COPY writer for the `calculations` table.
+    
+    Parameters
+    ----------
+    dsn : str
+        PostgreSQL connection string
+    max_connections : int
+        Pool size, and number of writer threads
+    queue_size : int
+        Encoded batches allowed to wait for a writer before `submit` blocks
+    batch_size : int
+        Rows per COPY
+    max_retries : int
+        Attempts per batch on connection errors before giving up
+    retry_backoff : float
+        Initial retry delay in seconds (doubled after each failure)
+    table : str
+        Target table
+    """
+    
+    def __init__(self, dsn: str, max_connections: int = 4, queue_size: int = 8,
+                 batch_size: int = 50_000, max_retries: int = 5,
+                 retry_backoff: float = 0.5, table: str = 'calculations'):
+        if psycopg2 is None:
+            raise ImportError("CalculationStore requires psycopg2 (pip install psycopg2-binary)")
+        
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        columns = ', '.join(COPY_COLUMNS)
+        self.staging_sql = (f"CREATE TEMP TABLE calculations_staging "
+                            f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+        self.copy_sql = (f"COPY calculations_staging ({columns}) "
+                         f"FROM STDIN WITH (FORMAT csv, NULL '')")
+        self.insert_sql = (f"INSERT INTO {table} ({columns}) "
+                           f"SELECT {columns} FROM calculations_staging "
+                           f"ON CONFLICT (id) DO NOTHING")
+        self.stats = CopyStats()
+        
+        self._pool = pg_pool.ThreadedConnectionPool(1, max_connections, dsn)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._errors: List[BaseException] = []
+        self._started = time.perf_counter()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f'copy-writer-{i}', daemon=True)
+            for i in range(max_connections)
+        ]
+        for worker in self._workers:
+            worker.start()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    # -------------------------------------------------------------------------
+    # Producer side
+    # -------------------------------------------------------------------------
+    
+    def submit(self, domain: str, inputs: pd.DataFrame, outputs: pd.DataFrame,
+               user_id: Optional[str] = None) -> None:
+        """
+        Queue scoring results for writing, batch_size rows per COPY.
+        
+        Blocks while the queue is full (backpressure). Raises the first
+        error a writer thread hit, if any.
+        """
+        self._raise_errors()
+        for start in range(0, len(inputs), self.batch_size):
+            stop = start + self.batch_size
+            payload = encode_calculations(domain, inputs.iloc[start:stop],
+                                          outputs.iloc[start:stop], user_id)
+            self._queue.put((payload, min(stop, len(inputs)) - start))
+    
+    def ensure_schema(self) -> None:
+        """Create the stand-alone calculations table (local testing only)."""
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(LOCAL_SCHEMA_SQL)
+            conn.commit()
+        finally:
+            self._pool.putconn(conn)
+    
+    def flush(self) -> None:
+        """Wait until every submitted batch is written."""
+        self._queue.join()
+        self._raise_errors()
+    
+    def close(self) -> None:
+        """Flush, stop the writers and close all pooled connections."""
+        try:
+            self._queue.join()
+        finally:
+            for _ in self._workers:
+                self._queue.put(None)
+            for worker in self._workers:
+                worker.join()
+            self._pool.closeall()
+        self._raise_errors()
+    
+    def _raise_errors(self) -> None:
+        with self._lock:
+            if self._errors:
+                raise self._errors[0]
+    
+    # -------------------------------------------------------------------------
+    # Writer side
+    # -------------------------------------------------------------------------
+    
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                payload, n_rows = item
+                self._copy_with_retry(payload, n_rows)
+            except BaseException as exc:
+                with self._lock:
+                    self._errors.append(exc)
+            finally:
+                self._queue.task_done()
+    
+    def _copy_with_retry(self, payload: str, n_rows: int) -> None:
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries):
+            try:
+                self._copy(payload)
+                break
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if attempt == self.max_retries - 1:
+                    raise
+                with self._lock:
+                    self.stats.retries += 1
+                time.sleep(delay)
+                delay *= 2
+        
+        with self._lock:
+            self.stats.rows += n_rows
+            self.stats.batches += 1
+            self.stats.bytes += len(payload)
+            self.stats.seconds = time.perf_counter() - self._started
+    
+    def _copy(self, payload: str) -> None:
+        conn = self._pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(self.staging_sql)
+                cur.copy_expert(self.copy_sql, io.StringIO(payload))
+                cur.execute(self.insert_sql)
+            conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Broken connection: drop it from the pool, a fresh one is opened next time
+            self._pool.putconn(conn, close=True)
+            raise
+        except Exception:
+            conn.rollback()
+            self._pool.putconn(conn)
+            raise
+        self._pool.putconn(conn)
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark_copy(dsn: str, n_rows: int = 1_000_000, batch_size: int = 50_000,
+                   max_connections: int = 4, seed: int = 42) -> CopyStats:
+    """
+    Score n_rows synthetic TVI items and COPY them into a local Postgres.
+    
+    Returns
+    -------
+    CopyStats
+        Rows, bytes, retries and elapsed time of the write
+    """
+    from temporal_validation_framework import calculate_tvi_batch
+    
+    rng = np.random.RandomState(seed)
+    inputs = pd.DataFrame({
+        'views': rng.randint(100_000, 1_000_000_000, n_rows),
+        'year': rng.randint(2000, 2026, n_rows),
+        'platform_users': rng.randint(10_000_000, 2_000_000_000, n_rows),
+        'persistence_months': rng.randint(1, 180, n_rows),
+        'resurfacing_rate': rng.random_sample(n_rows),
+    })
+    outputs = calculate_tvi_batch(**{c: inputs[c].to_numpy() for c in inputs.columns})
+    outputs['tier'] = outputs['tier'].astype(str)
+    
+    with CalculationStore(dsn, max_connections=max_connections, batch_size=batch_size) as store:
+        store.ensure_schema()
+        store.submit('viral', inputs, outputs)
+    return store.stats
+
+
+if __name__ == "__main__":
+    dsn = sys.argv[1] if len(sys.argv) > 1 else 'postgresql://localhost/tvi'
+    n_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    
+    print("=" * 70)
+    print("CALCULATIONS COPY BENCHMARK")
+    print("=" * 70)
+    stats = benchmark_copy(dsn, n_rows=n_rows)
+    print(f"Rows written:  {stats.rows:,} in {stats.batches} batches")
+    print(f"Elapsed:       {stats.seconds:.2f}s ({stats.retries} retries)")
+    print(f"Throughput:    {stats.rows_per_second:,.0f} rows/s, {stats.mb_per_second:.1f} MB/s")
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Detrended Cross-Correlation Matrix
+==================================================================
+
+DCCA coefficient (Zebende 2011) for every pair of attention series:
+
+    ρ_DCCA(i, j; s) = F²_ij(s) / (F_ii(s) · F_jj(s))
+
+where F²_ij(s) is the mean product of the two series' detrended profile
+residuals over boxes of length s. With each series' residuals flattened
+into a vector r_i, F²_ij ∝ r_i · r_j, so after scaling every r_i to unit
+length the whole ρ matrix is one Gram matrix U Uᵀ:
+- residuals are computed once per series and scale (`dcca_residuals`)
+- U Uᵀ is computed in square tiles, upper triangle only, across threads
+- the matrix can be written straight into a .npy memmap
+
+Usage
+-----
+    rho = dcca_matrix(series_batch, scales=(16, 64, 256), path='dcca.npy')
+    pairs = top_dcca_pairs(rho[1], k=50)
+"""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence, Union
+import os
+
+from temporal_validation_framework import detrended_box_residuals
+
+
+def dcca_residuals(series: np.ndarray, scale: int, order: int = 1,
+                   chunk_size: int = 1024, dtype=np.float64) -> np.ndarray:
+    """
+    Unit-norm detrended residual vector of each series at one scale.
+    
+    Parameters
+    ----------
+    series : np.ndarray
+        Batch of equal-length series, shape (n_series, n)
+    scale : int
+        Box length
+    order : int
+        Degree of the detrending polynomial
+    chunk_size : int
+        Series detrended per block
+    dtype : dtype
+        Storage type of the residuals (float32 halves memory)
+    
+    Returns
+    -------
+    np.ndarray
+        Shape (n_series, (n // scale) * scale); rows with no residual
+        variance are NaN
+    """
+    x = np.atleast_2d(series)
+    n_series, n = x.shape
+    length = (n // scale) * scale
+    residuals = np.empty((n_series, length), dtype=dtype)
+    
+    for start in range(0, n_series, chunk_size):
+        block = np.asarray(x[start:start + chunk_size], dtype=np.float64)
+        profile = np.cumsum(block - block.mean(axis=1, keepdims=True), axis=1)
+        resid = detrended_box_residuals(profile, scale, order).reshape(len(block), length)
+        norms = np.sqrt(np.sum(resid ** 2, axis=1, keepdims=True))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            residuals[start:start + len(block)] = resid / norms
+    return residuals
+
+
+def _tiled_gram(u: np.ndarray, out: np.ndarray, block_size: int, n_jobs: int) -> None:
+    """out = u @ u.T, one upper-triangle tile per task, mirrored below the diagonal."""
+    n = u.shape[0]
+    starts = range(0, n, block_size)
+    tiles = [(i, j) for i in starts for j in starts if j >= i]
+    
+    def compute(tile):
+        i, j = tile
+        product = u[i:i + block_size] @ u[j:j + block_size].T
+        out[i:i + block_size, j:j + block_size] = product
+        if i != j:
+            out[j:j + block_size, i:i + block_size] = product.T
+    
+    # Tiles write disjoint regions; BLAS releases the GIL during the products
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        list(pool.map(compute, tiles))
+
+
+def dcca_matrix(series: np.ndarray, scales: Union[int, Sequence[int]] = (16, 64, 256),
+                order: int = 1, block_size: int = 1024, n_jobs: Optional[int] = None,
+                path: Optional[str] = None, out: Optional[np.ndarray] = None,
+                dtype=np.float64) -> np.ndarray:
+    """
+    DCCA coefficient matrix of a batch of series at one or more scales.
+    
+    Parameters
+    ----------
+    series : np.ndarray
+        Batch of equal-length series, shape (n_series, n); may be a memmap
+    scales : int or sequence of int
+        Box length(s)
+    order : int
+        Degree of the detrending polynomial
+    block_size : int
+        Tile edge of the pair matrix; two (block_size × n) residual slices
+        and one (block_size × block_size) tile are live per task
+    n_jobs : int, optional
+        Threads computing tiles (default: CPU count)
+    path : str, optional
+        Write the result to this .npy file as a memmap
+    out : np.ndarray, optional
+        Destination array of the result shape
+    dtype : dtype
+        Type of the residuals and the result
+    
+    Returns
+    -------
+    np.ndarray
+        ρ of shape (n_series, n_series) for a single int scale, else
+        (n_scales, n_series, n_series); values in [-1, 1], NaN for
+        series with no residual variance
+    """
+    single = np.ndim(scales) == 0
+    scales = np.atleast_1d(scales).astype(int)
+    n_series, n = np.shape(series)
+    if scales.max() > n or scales.min() <= order + 1:
+        raise ValueError(f"scales must be in ({order + 1}, {n}]")
+    
+    shape = (len(scales), n_series, n_series)
+    if out is None:
+        if path is not None:
+            out = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+        else:
+            out = np.empty(shape, dtype=dtype)
+    elif single:
+        out = out[None]
+    
+    for k, scale in enumerate(scales):
+        u = dcca_residuals(series, scale, order, chunk_size=block_size, dtype=dtype)
+        _tiled_gram(u, out[k], block_size, n_jobs or os.cpu_count())
+    
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out[0] if single else out
+
+
+def top_dcca_pairs(rho: np.ndarray, k: int = 20, labels: Optional[Sequence] = None,
+                   block_size: int = 4096) -> pd.DataFrame:
+    """
+    Most strongly co-moving pairs of one ρ matrix.
+    
+    The upper triangle is scanned in row blocks, so a memmapped matrix is
+    never loaded whole.
+    
+    Returns
+    -------
+    pd.DataFrame
+        Top k pairs (i, j, rho), highest ρ first, with labels if given
+    """
+    n = rho.shape[0]
+    best_i = np.empty(0, dtype=np.int64)
+    best_j = np.empty(0, dtype=np.int64)
+    best_rho = np.empty(0)
+    
+    for start in range(0, n, block_size):
+        block = np.array(rho[start:start + block_size], dtype=np.float64)
+        block[np.arange(n)[None, :] <= np.arange(start, start + len(block))[:, None]] = -np.inf
+        values = np.nan_to_num(block, nan=-np.inf).ravel()
+        keep = np.argpartition(values, -k)[-k:] if len(values) > k else np.arange(len(values))
+        keep = keep[np.isfinite(values[keep])]
+        
+        best_i = np.concatenate([best_i, keep // n + start])
+        best_j = np.concatenate([best_j, keep % n])
+        best_rho = np.concatenate([best_rho, values[keep]])
+        order = np.argsort(best_rho)[::-1][:k]
+        best_i, best_j, best_rho = best_i[order], best_j[order], best_rho[order]
+    
+    pairs = pd.DataFrame({'i': best_i, 'j': best_j, 'rho': best_rho})
+    if labels is not None:
+        labels = np.asarray(labels)
+        pairs['label_i'] = labels[best_i]
+        pairs['label_j'] = labels[best_j]
+    return pairs
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Experiment Cache
+================================================
+
+Content-addressed cache for the experiment stages run by
+`run_all_experiments`. Every stage result is keyed by a hash of:
+- the stage name, its parameters (including the seed) and the module-level
+  tables it reads
+- the full source of the module defining the stage function and of every
+  project module it references, directly or transitively (helpers, kernels
+  and constant tables included, with no hand-kept list to go stale)
+- the global float precision and the resolved kernel backend
+- the keys of the upstream stages it consumes
+
+A rerun therefore only recomputes stages whose inputs changed. Editing any
+project module a stage can reach invalidates it, so a change to the
+framework recomputes all of its stages; changing only a seed or parameter
+recomputes just the stages that take it and those downstream.
+
+Results are stored as NPZ (arrays and DataFrame columns) with a JSON
+manifest per key. Both are written under unique temporary names and
+renamed into place, so several processes may share one cache directory.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple, Any
+import hashlib
+import json
+import os
+import sys
+import sysconfig
+import types
+import uuid
+
+
+# Bump to invalidate every cached result after a storage format change
+CACHE_FORMAT_VERSION = 1
+
+
+# =============================================================================
+# STAGE DEFINITION
+# =============================================================================
+
+@dataclass
+class Stage:
+    """
+    A single cacheable experiment stage.
+    
+    `func` is called as func(*upstream_values, **params). The key covers the
+    source of the module defining `func` and of every project module it
+    references (see `_code_fingerprint`); `code` adds the modules of
+    further functions, e.g. ones only reached through a callback.
+    `constants` holds module-level tables the stage reads, so changes made
+    to them at run time (which the source hash cannot see) are keyed too;
+    they are hashed like `params` but not passed to `func`.
+    
+    Params, constants and `json` results must be JSON-serializable (numpy
+    scalars and arrays are converted); anything else raises TypeError
+    rather than being keyed by its repr.
+    """
+    name: str
+    func: Callable
+    params: Dict = field(default_factory=dict)
+    depends_on: Tuple['Stage', ...] = ()
+    code: Tuple[Callable, ...] = ()
+    constants: Dict = field(default_factory=dict)
+
+
+# Installed packages (numpy, pandas, ...) are not part of any key
+_LIBRARY_PATHS = tuple(os.path.realpath(p) for p in {
+    sys.prefix, sys.base_prefix, sys.exec_prefix,
+    sysconfig.get_paths()['stdlib'], sysconfig.get_paths()['purelib'],
+    sysconfig.get_paths()['platlib'],
+})
+
+# Source hash per module file, invalidated by mtime/size
+_source_hashes: Dict[str, Tuple[float, int, str]] = {}
+
+
+def _project_module(obj) -> Optional[types.ModuleType]:
+    """The project (non-library) module defining obj, if any."""
+    module = obj if isinstance(obj, types.ModuleType) else sys.modules.get(getattr(obj, '__module__', None) or '')
+    path = getattr(module, '__file__', None)
+    if path is None or not path.endswith('.py'):
+        return None
+    path = os.path.realpath(path)
+    if any(path.startswith(lib + os.sep) for lib in _LIBRARY_PATHS):
+        return None
+    return module
+
+
+def _source_hash(module: types.ModuleType) -> str:
+    path = os.path.realpath(module.__file__)
+    stat = os.stat(path)
+    cached = _source_hashes.get(path)
+    if cached is None or cached[:2] != (stat.st_mtime, stat.st_size):
+        with open(path, 'rb') as f:
+            cached = (stat.st_mtime, stat.st_size, hashlib.sha256(f.read()).hexdigest())
+        _source_hashes[path] = cached
+    return cached[2]
+
+
+def _code_fingerprint(funcs) -> str:
+    """
+    Hash the source of the project modules reachable from some functions.
+    
+    Starts from the modules defining `funcs` and follows every module-level
+    name (imported modules, functions, classes) to the project module that
+    defines it. Functions without a project module (builtins, library code)
+    are keyed by their qualified name.
+    """
+    seen: Dict[str, types.ModuleType] = {}
+    names = []
+    pending = []
+    for func in funcs:
+        module = _project_module(func)
+        if module is None:
+            names.append(f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}")
+        else:
+            pending.append(module)
+    while pending:
+        module = pending.pop()
+        if module.__name__ in seen:
+            continue
+        seen[module.__name__] = module
+        for value in list(vars(module).values()):
+            referenced = _project_module(value)
+            if referenced is not None and referenced.__name__ not in seen:
+                pending.append(referenced)
+    
+    digest = hashlib.sha256()
+    for name in sorted(names):
+        digest.update(name.encode('utf-8'))
+    for name in sorted(seen):
+        digest.update(f'{name}:{_source_hash(seen[name])}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _runtime_settings() -> Dict[str, str]:
+    """Global settings that change stage results without changing any source."""
+    # Imported here: the framework imports this module
+    from temporal_validation_framework import get_precision
+    from kernels import resolve_backend
+    return {'precision': get_precision(), 'backend': resolve_backend()}
+
+
+def _to_json_safe(obj):
+    """Convert numpy scalars/arrays into plain Python for JSON encoding."""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class ExperimentCache:
+    """
+    On-disk, content-addressed store of stage results.
+    
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding cached results (created if missing)
+    verbose : bool
+        Print a line per stage saying whether it was loaded or recomputed
+    """
+    
+    def __init__(self, cache_dir: str = '.tvi_cache', verbose: bool = False):
+        self.cache_dir = cache_dir
+        self.verbose = verbose
+        self.hits = []
+        self.misses = []
+        self._values = {}
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+    
+    def key(self, stage: Stage) -> str:
+        """Content hash of a stage, including all of its upstream stages."""
+        payload = {
+            'format': CACHE_FORMAT_VERSION,
+            'name': stage.name,
+            'params': stage.params,
+            'constants': stage.constants,
+            'settings': _runtime_settings(),
+            'code': _code_fingerprint((stage.func,) + tuple(stage.code)),
+            'upstream': [self.key(dep) for dep in stage.depends_on],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=_to_json_safe)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:32]
+    
+    def _paths(self, stage_key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, stage_key)
+        return base + '.json', base + '.npz'
+    
+    def contains(self, stage: Stage) -> bool:
+        """True if a result for this exact stage is already on disk."""
+        manifest_path, _ = self._paths(self.key(stage))
+        return os.path.exists(manifest_path)
+    
+    # -------------------------------------------------------------------------
+    # Resolution
+    # -------------------------------------------------------------------------
+    
+    def run(self, stage: Stage) -> Any:
+        """
+        Return the result of a stage, computing it only if not cached.
+        
+        Upstream stages are resolved lazily: when a stage is a cache hit its
+        dependencies are neither loaded nor recomputed.
+        """
+        stage_key = self.key(stage)
+        if stage_key in self._values:
+            return self._values[stage_key]
+        
+        if self.contains(stage):
+            value = self.load(stage_key)
+            self.hits.append(stage.name)
+            if self.verbose:
+                print(f"[cache] {stage.name:<24} hit   {stage_key[:12]}")
+        else:
+            upstream = [self.run(dep) for dep in stage.depends_on]
+            value = stage.func(*upstream, **stage.params)
+            self.store(stage_key, value, stage_name=stage.name)
+            self.misses.append(stage.name)
+            if self.verbose:
+                print(f"[cache] {stage.name:<24} miss  {stage_key[:12]}")
+        
+        self._values[stage_key] = value
+        return value
+    
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+    
+    def store(self, stage_key: str, value: Any, stage_name: str = '') -> None:
+        """Write a stage result (ndarray, DataFrame or dict) to disk."""
+        manifest_path, data_path = self._paths(stage_key)
+        manifest = {'stage': stage_name, 'format': CACHE_FORMAT_VERSION}
+        arrays = None
+        
+        if isinstance(value, np.ndarray):
+            manifest['kind'] = 'ndarray'
+            arrays = {'array': value}
+        elif isinstance(value, pd.DataFrame):
+            manifest['kind'] = 'dataframe'
+            manifest['columns'] = [str(c) for c in value.columns]
+            arrays = {}
+            object_columns = {}
+            for i, col in enumerate(value.columns):
+                column = value[col]
+                if column.dtype.kind in 'biufc':
+                    arrays[f'c{i}'] = column.to_numpy()
+                else:
+                    # Strings and nested dicts stay in the JSON manifest
+                    object_columns[str(col)] = column.tolist()
+            manifest['object_columns'] = object_columns
+        else:
+            manifest['kind'] = 'json'
+            manifest['value'] = value
+        
+        # Encode first so an unserializable value fails before anything is written
+        encoded = json.dumps(manifest, default=_to_json_safe)
+        
+        # Unique temporary names: concurrent writers of one key never share a
+        # file, and readers only ever see complete files
+        tmp_suffix = f'.{uuid.uuid4().hex}.tmp'
+        if arrays is not None:
+            with open(data_path + tmp_suffix, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(data_path + tmp_suffix, data_path)
+        # Write manifest last so a partial write is never seen as a hit
+        with open(manifest_path + tmp_suffix, 'w') as f:
+            f.write(encoded)
+        os.replace(manifest_path + tmp_suffix, manifest_path)
+    
+    def load(self, stage_key: str) -> Any:
+        """Read a stage result previously written by `store`."""
+        manifest_path, data_path = self._paths(stage_key)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        
+        if manifest['kind'] == 'ndarray':
+            with np.load(data_path) as data:
+                return data['array']
+        elif manifest['kind'] == 'dataframe':
+            columns = {}
+            with np.load(data_path) as data:
+                for i, col in enumerate(manifest['columns']):
+                    if col in manifest['object_columns']:
+                        columns[col] = manifest['object_columns'][col]
+                    else:
+                        columns[col] = data[f'c{i}']
+            return pd.DataFrame(columns, columns=manifest['columns'])
+        return manifest['value']
+    
+    def clear(self) -> None:
+        """Remove every cached result."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.json', '.npz', '.tmp')):
+                os.remove(os.path.join(self.cache_dir, name))
+        self._values.clear()
+
+
+def run_stage(stage: Stage, cache: Optional[ExperimentCache] = None) -> Any:
+    """
+    Run a stage through `cache`, or compute it directly when cache is None.
+    """
+    if cache is not None:
+        return cache.run(stage)
+    upstream = [run_stage(dep) for dep in stage.depends_on]
+    return stage.func(*upstream, **stage.params)
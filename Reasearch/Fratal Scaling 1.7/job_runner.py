@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Asynchronous Experiment Jobs
+============================================================
+
+asyncio front end to the experiment stages of `run_all_experiments`, for
+orchestration that must not block on a sweep (e.g. runs triggered behind
+api/tvi-run.js):
+- `submit` queues an experiment config and returns a job id at once
+- `events` streams progress: stage started/finished, percent done and the
+  stage's headline metrics, then one terminal event
+- jobs have a priority; pending stages of higher-priority jobs are
+  dispatched first, and independent stages of one job run side by side
+- stages run in a shared process pool (one slot per worker), so the event
+  loop stays responsive with many concurrent jobs
+- `cancel` drops a job's pending stages; a stage already running in a
+  worker finishes there and its result is discarded
+- with a cache, a stage whose key is already being computed for another
+  job waits for that run instead of computing (and storing) it again
+
+Stages are the ones declared by `build_experiment_stages`, computed through
+the optional `ExperimentCache` exactly as `run_stage` would.
+
+Usage
+-----
+    async with JobRunner(max_workers=4) as runner:
+        job_id = runner.submit(seed=7, priority=5)
+        async for event in runner.events(job_id):
+            print(event.to_dict())
+        results = await runner.result(job_id)
+"""
+
+import numpy as np
+import pandas as pd
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+import itertools
+import json
+import os
+import time
+import uuid
+
+from experiment_cache import ExperimentCache, Stage
+from temporal_validation_framework import build_experiment_stages
+
+
+JOB_STATES = ('queued', 'running', 'completed', 'failed', 'cancelled')
+TERMINAL_EVENTS = ('completed', 'failed', 'cancelled')
+
+
+# =============================================================================
+# STAGE EXECUTION (worker side)
+# =============================================================================
+
+def _execute_stage(stage: Stage, upstream: List[Any], cache_dir: Optional[str]) -> Any:
+    """Compute one stage from its upstream values, through the cache if given."""
+    if cache_dir is None:
+        return stage.func(*upstream, **stage.params)
+    cache = ExperimentCache(cache_dir)
+    stage_key = cache.key(stage)
+    if cache.contains(stage):
+        return cache.load(stage_key)
+    value = stage.func(*upstream, **stage.params)
+    cache.store(stage_key, value, stage_name=stage.name)
+    return value
+
+
+def _scalars(result: Dict, keys: Sequence[str]) -> Dict:
+    return {k: result[k] for k in keys if k in result}
+
+
+def stage_metrics(name: str, value: Any) -> Dict:
+    """
+    Headline numbers of a stage result (those `run_all_experiments` prints).
+    """
+    if name == 'fractal_dimension':
+        return _scalars(value, ('hurst_exponent', 'fractal_dimension', 'r_squared',
+                                'matches_prediction', 'error'))
+    if name == 'isps_backtest':
+        return {'accuracy': round(value['Correct'].mean() * 100, 1), 'n_companies': len(value)}
+    if name == 'civilization_survival':
+        return {'survival_500y': dict(zip(value['Distribution'], value['survival_500y']))}
+    if name == 'power_law':
+        return _scalars(value, ('top_0.1%_share', 'bottom_90%_share', 'top_20%_share'))
+    if isinstance(value, (pd.DataFrame, np.ndarray)):
+        return {'rows': len(value)}
+    return {}
+
+
+# =============================================================================
+# JOBS AND EVENTS
+# =============================================================================
+
+@dataclass
+class JobEvent:
+    """One progress event of a job."""
+    job_id: str
+    kind: str
+    percent: float
+    stage: Optional[str] = None
+    metrics: Dict = field(default_factory=dict)
+    error: Optional[str] = None
+    time: float = field(default_factory=time.time)
+    
+    def to_dict(self) -> Dict:
+        return {k: v for k, v in vars(self).items() if v is not None}
+
+
+@dataclass
+class Job:
+    """An experiment run: config, state, event history and stage results."""
+    job_id: str
+    seed: int
+    stages: Dict[str, Stage]
+    priority: int
+    cache_dir: Optional[str]
+    state: str = 'queued'
+    results: Dict[str, Any] = field(default_factory=dict)
+    history: List[JobEvent] = field(default_factory=list)
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    task: Optional[asyncio.Task] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    listeners: List[asyncio.Queue] = field(default_factory=list)
+    
+    @property
+    def percent(self) -> float:
+        return round(100.0 * len(self.results) / len(self.stages), 1)
+
+
+def select_stages(seed: int, names: Optional[Sequence[str]] = None) -> Dict[str, Stage]:
+    """
+    The requested stages of `build_experiment_stages` plus everything they
+    depend on, in execution order.
+    """
+    declared = build_experiment_stages(seed=seed)
+    if names is None:
+        return declared
+    unknown = set(names) - set(declared)
+    if unknown:
+        raise ValueError(f"Unknown stages {sorted(unknown)}, expected {list(declared)}")
+    
+    needed = set()
+    pending = [declared[name] for name in names]
+    while pending:
+        stage = pending.pop()
+        if stage.name not in needed:
+            needed.add(stage.name)
+            pending.extend(stage.depends_on)
+    return {name: stage for name, stage in declared.items() if name in needed}
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+class JobRunner:
+    """
+    Runs experiment jobs concurrently on one process pool.
+    
+    Use as an async context manager (or call `start` / `close`). Pending
+    stages wait in one priority queue; `max_workers` dispatchers feed the
+    pool, so a high-priority job overtakes queued stages of lower ones
+    without ever oversubscribing the machine.
+    
+    Parameters
+    ----------
+    max_workers : int, optional
+        Worker processes (default: CPU count)
+    cache_dir : str, optional
+        Default stage cache directory for submitted jobs
+    executor : concurrent.futures.Executor, optional
+        Use this executor instead of creating a process pool
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, cache_dir: Optional[str] = None,
+                 executor=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._jobs: Dict[str, Job] = {}
+        self._running: Dict[tuple, asyncio.Future] = {}
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+    
+    async def __aenter__(self) -> 'JobRunner':
+        self.start()
+        return self
+    
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+    
+    def start(self) -> None:
+        if self._queue is not None:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._queue = asyncio.PriorityQueue()
+        self._dispatchers = [asyncio.ensure_future(self._dispatch())
+                             for _ in range(self.max_workers)]
+    
+    async def close(self, cancel_pending: bool = True) -> None:
+        """Stop dispatching; cancel unfinished jobs (or wait for them)."""
+        jobs = [job for job in self._jobs.values() if not job.done.is_set()]
+        if cancel_pending:
+            for job in jobs:
+                self.cancel(job.job_id)
+        await asyncio.gather(*(job.done.wait() for job in jobs))
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        self._queue = None
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+    
+    def submit(self, seed: int = 42, stages: Optional[Sequence[str]] = None,
+               priority: int = 0, cache_dir: Optional[str] = None) -> str:
+        """
+        Queue an experiment run and return its job id.
+        
+        Parameters
+        ----------
+        seed : int
+            Random seed passed to `build_experiment_stages`
+        stages : Sequence[str], optional
+            Stages to run (their dependencies are added); default all
+        priority : int
+            Higher runs first among pending stages
+        cache_dir : str, optional
+            Stage cache directory (default: the runner's)
+        """
+        if self._queue is None:
+            raise RuntimeError("JobRunner is not started")
+        job = Job(uuid.uuid4().hex[:12], seed, select_stages(seed, stages), priority,
+                  cache_dir if cache_dir is not None else self.cache_dir)
+        self._jobs[job.job_id] = job
+        self._publish(job, 'queued')
+        job.task = asyncio.ensure_future(self._run_job(job))
+        job.task.add_done_callback(lambda task: self._finish(job, 'cancelled'))
+        return job.job_id
+    
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job; False if it had already finished."""
+        job = self._jobs[job_id]
+        if job.done.is_set():
+            return False
+        job.task.cancel()
+        return True
+    
+    def status(self, job_id: str) -> Dict:
+        """Snapshot of a job: state, percent, finished stages and timings."""
+        job = self._jobs[job_id]
+        return {
+            'job_id': job.job_id,
+            'state': job.state,
+            'priority': job.priority,
+            'seed': job.seed,
+            'percent': job.percent,
+            'stages_done': list(job.results),
+            'stages_total': len(job.stages),
+            'error': job.error,
+            'submitted': job.submitted,
+            'finished': job.finished,
+        }
+    
+    def jobs(self) -> List[Dict]:
+        """Status of every job submitted to this runner."""
+        return [self.status(job_id) for job_id in self._jobs]
+    
+    async def events(self, job_id: str) -> AsyncIterator[JobEvent]:
+        """
+        Stream a job's events from the start, ending with its terminal event.
+        """
+        job = self._jobs[job_id]
+        listener: asyncio.Queue = asyncio.Queue()
+        for event in job.history:
+            listener.put_nowait(event)
+        if not job.done.is_set():
+            job.listeners.append(listener)
+        try:
+            while True:
+                event = await listener.get()
+                yield event
+                if event.kind in TERMINAL_EVENTS:
+                    return
+        finally:
+            if listener in job.listeners:
+                job.listeners.remove(listener)
+    
+    async def result(self, job_id: str) -> Dict[str, Any]:
+        """
+        Stage results of a finished job, keyed by stage name.
+        
+        Raises
+        ------
+        asyncio.CancelledError
+            If the job was cancelled
+        RuntimeError
+            If a stage failed
+        """
+        job = self._jobs[job_id]
+        await job.done.wait()
+        if job.state == 'cancelled':
+            raise asyncio.CancelledError(f"job {job_id} was cancelled")
+        if job.state == 'failed':
+            raise RuntimeError(f"job {job_id} failed: {job.error}")
+        return dict(job.results)
+    
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+    
+    def _publish(self, job: Job, kind: str, stage: Optional[str] = None,
+                 metrics: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        event = JobEvent(job.job_id, kind, job.percent, stage, metrics or {}, error)
+        job.history.append(event)
+        for listener in job.listeners:
+            listener.put_nowait(event)
+    
+    def _finish(self, job: Job, state: str, error: Optional[str] = None) -> None:
+        """Record a job's terminal state once (also covers cancel-before-start)."""
+        if job.done.is_set():
+            return
+        job.state = state
+        job.error = error
+        job.finished = time.time()
+        self._publish(job, state, error=error)
+        job.done.set()
+    
+    async def _dispatch(self) -> None:
+        """Feed the pool one pending stage at a time, highest priority first."""
+        loop = asyncio.get_running_loop()
+        while True:
+            _, _, job, stage, upstream, future = await self._queue.get()
+            if future.cancelled():
+                continue
+            if job.state == 'queued':
+                job.state = 'running'
+                self._publish(job, 'started')
+            self._publish(job, 'stage_started', stage.name)
+            run_key = None
+            if job.cache_dir is not None:
+                run_key = (job.cache_dir, ExperimentCache(job.cache_dir).key(stage))
+            try:
+                if run_key in self._running:
+                    value = await asyncio.shield(self._running[run_key])
+                else:
+                    run = loop.run_in_executor(self._executor, _execute_stage,
+                                               stage, upstream, job.cache_dir)
+                    if run_key is not None:
+                        self._running[run_key] = run
+                        run.add_done_callback(lambda _, key=run_key: self._running.pop(key, None))
+                    value = await asyncio.shield(run)
+            except Exception as exc:
+                if not future.cancelled():
+                    future.set_exception(exc)
+            else:
+                if not future.cancelled():
+                    future.set_result(value)
+    
+    async def _run_stage(self, job: Job, stage: Stage, upstream_tasks: List[asyncio.Task]) -> Any:
+        upstream = [await task for task in upstream_tasks]
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((-job.priority, next(self._sequence), job, stage, upstream, future))
+        value = await future
+        job.results[stage.name] = value
+        self._publish(job, 'stage_finished', stage.name, stage_metrics(stage.name, value))
+        return value
+    
+    async def _run_job(self, job: Job) -> None:
+        tasks: Dict[str, asyncio.Task] = {}
+        try:
+            for name, stage in job.stages.items():
+                upstream = [tasks[dep.name] for dep in stage.depends_on]
+                tasks[name] = asyncio.ensure_future(self._run_stage(job, stage, upstream))
+            await asyncio.gather(*tasks.values())
+            self._finish(job, 'completed')
+        except asyncio.CancelledError:
+            self._finish(job, 'cancelled')
+        except Exception as exc:
+            self._finish(job, 'failed', f"{type(exc).__name__}: {exc}")
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+
+if __name__ == '__main__':
+    async def demo():
+        async with JobRunner(max_workers=2) as runner:
+            low = runner.submit(seed=1, priority=0)
+            high = runner.submit(seed=2, priority=10, stages=['fractal_dimension', 'power_law'])
+            doomed = runner.submit(seed=3)
+            runner.cancel(doomed)
+            
+            async def stream(job_id):
+                async for event in runner.events(job_id):
+                    print(json.dumps(event.to_dict(), default=str))
+            
+            await asyncio.gather(stream(low), stream(high), stream(doomed))
+            print(json.dumps(runner.jobs(), indent=2, default=str))
+    
+    asyncio.run(demo())
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Score Lattice Export
+====================================================
+
+Precomputed lookup tables for the static calculators
+(universal-impact-calculator.html, temporal_death_calculator.html), so a
+page can answer from a file instead of a server round-trip or a JS
+re-implementation of the formulas.
+
+Each table evaluates one framework formula on a lattice of inputs (inputs
+not on the lattice are held at `fixed` values) and is stored quantized:
+- values go through a transform ('log10', floored at `floor`, by default
+  the smallest positive value on the lattice, so zero scores decode to it;
+  or 'linear') and are mapped to 8- or 16-bit codes: t = low + code × step
+- axes are 'linear', 'log' (lattice uniform in log10 x) or 'log1p'
+  (uniform in log10(1 + x): dense near 0, for inputs that may be 0) and interpolate
+  'linear' (multilinear between neighbours) or 'nearest' (discrete inputs
+  such as years, exact on the lattice)
+- interpolation happens on t; the page inverts the transform afterwards
+
+`export_lattices` writes <prefix>.bin (all tables, little-endian, C order,
+8-byte aligned) and <prefix>.json (axes, quantization, tier and
+prediction bounds, fractal D readings and the measured accuracy of each
+table against the Python reference). `lookup` is the reference reader.
+
+Usage
+-----
+    report = export_lattices('calculator_lattice')
+    manifest, codes = load_lattices('calculator_lattice')
+    score = lookup(manifest['tables']['tvi'], codes['tvi'], views=1e9, ...)
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+
+from temporal_validation_framework import (
+    TVI_TIERS, ISPS_TIERS, ISPS_PREDICTIONS, TDIS_RECOMMENDATIONS, MEMORY_TIERS,
+    MEMORY_HALF_LIVES, FRACTAL_INTERPRETATIONS, tvi_score_array, isps_score_array,
+    tdis_score_array
+)
+
+
+LATTICE_FORMAT = 'tvf-lattice'
+LATTICE_VERSION = 1
+
+
+@dataclass
+class LatticeAxis:
+    """One input of a lookup table: n points between start and stop."""
+    name: str
+    start: float
+    stop: float
+    n: int
+    scale: str = 'linear'
+    interpolation: str = 'linear'
+    
+    def points(self) -> np.ndarray:
+        if self.scale == 'log':
+            return np.logspace(np.log10(self.start), np.log10(self.stop), self.n)
+        if self.scale == 'log1p':
+            return np.expm1(np.linspace(np.log1p(self.start), np.log1p(self.stop), self.n))
+        return np.linspace(self.start, self.stop, self.n)
+    
+    def coordinate(self, x) -> np.ndarray:
+        """Fractional lattice index of each x, clipped to the axis."""
+        x = np.asarray(x, dtype=np.float64)
+        if self.n == 1:
+            return np.zeros_like(x)
+        if self.scale == 'log':
+            x, start, stop = np.log10(x), np.log10(self.start), np.log10(self.stop)
+        elif self.scale == 'log1p':
+            x, start, stop = np.log1p(x), np.log1p(self.start), np.log1p(self.stop)
+        else:
+            start, stop = self.start, self.stop
+        return np.clip((x - start) / (stop - start) * (self.n - 1), 0, self.n - 1)
+
+
+@dataclass
+class LatticeTable:
+    """A framework formula evaluated on the product of its axes."""
+    name: str
+    func: Callable
+    axes: List[LatticeAxis]
+    fixed: Dict[str, float] = field(default_factory=dict)
+    transform: str = 'log10'
+    floor: Optional[float] = None
+    bits: int = 16
+    categories: Dict[str, Dict] = field(default_factory=dict)
+    
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(axis.n for axis in self.axes)
+    
+    def evaluate(self, **inputs) -> np.ndarray:
+        return np.asarray(self.func(**inputs, **self.fixed), dtype=np.float64)
+
+
+def upper_bounds(tiers: Dict, side: str = 'right') -> Dict:
+    """
+    Category metadata from a tier table: names plus the upper bounds to
+    search (searchsorted semantics, `side` as in the framework).
+    """
+    names = list(tiers)
+    highs = [v[1] if isinstance(v, tuple) else v for v in tiers.values()]
+    return {'names': names, 'bounds': highs[:-1], 'side': side}
+
+
+def memory_retention_pct(memory_tier, days) -> np.ndarray:
+    """Share of initial memory left after `days`, by MEMORY_TIERS index."""
+    half_lives = np.asarray(MEMORY_HALF_LIVES, dtype=np.float64)
+    return 100 * 0.5 ** (np.asarray(days) / half_lives[np.asarray(memory_tier, dtype=np.int64)])
+
+
+def default_lattices() -> Dict[str, LatticeTable]:
+    """
+    Lookup tables for the calculators' inputs.
+    
+    Inputs the scores are proportional to (views, citations, brand
+    awareness, ...) get two-point log axes, which multilinear interpolation
+    of log10(score) reproduces exactly; discrete inputs (years, legacy
+    level, crises) get 'nearest' axes.
+    
+    The TVI persistence axis starts at 1 month: at 0 the score is 0, which
+    decodes to the floor, and log interpolation from there is meaningless
+    in the first cell. Shorter persistence clamps to 1 month, the
+    calculators' smallest choice.
+    """
+    memory_tiers = {name: bounds for name, bounds in MEMORY_TIERS}
+    return {
+        'tvi': LatticeTable(
+            'tvi', tvi_score_array,
+            [LatticeAxis('views', 1e2, 1e11, 2, 'log'),
+             LatticeAxis('platform_users', 1e5, 1e10, 2, 'log'),
+             LatticeAxis('year', 1996, 2026, 31, interpolation='nearest'),
+             LatticeAxis('persistence_months', 1, 180, 37, 'log1p'),
+             LatticeAxis('resurfacing_rate', 0, 10, 21, 'log1p'),
+             LatticeAxis('legacy_level', 1, 3, 5, interpolation='nearest')],
+            categories={'tier': upper_bounds(TVI_TIERS),
+                        'memory_tier': upper_bounds(memory_tiers)}),
+        'isps': LatticeTable(
+            'isps', isps_score_array,
+            [LatticeAxis('brand_awareness', 0.01, 1, 2, 'log'),
+             LatticeAxis('market_position', 1, 10, 2, 'log'),
+             LatticeAxis('founding_year', 1900, 2026, 127, interpolation='nearest'),
+             LatticeAxis('crisis_survival_score', 0, 5, 6, interpolation='nearest'),
+             LatticeAxis('leadership_continuity', 0.5, 3.5, 7)],
+            categories={'tier': upper_bounds(ISPS_TIERS),
+                        'survival_prediction': upper_bounds(ISPS_PREDICTIONS)}),
+        'tdis': LatticeTable(
+            'tdis', tdis_score_array,
+            [LatticeAxis('citations', 1, 1e6, 2, 'log'),
+             LatticeAxis('usage_score', 0.01, 1, 2, 'log'),
+             LatticeAxis('researcher_population', 1e2, 1e7, 2, 'log'),
+             LatticeAxis('release_year', 1980, 2026, 47, interpolation='nearest')],
+            categories={'tier': upper_bounds(TVI_TIERS),
+                        'recommendation': upper_bounds(TDIS_RECOMMENDATIONS, side='left')}),
+        'memory_retention': LatticeTable(
+            'memory_retention', memory_retention_pct,
+            [LatticeAxis('memory_tier', 0, len(MEMORY_TIERS) - 1, len(MEMORY_TIERS),
+                         interpolation='nearest'),
+             LatticeAxis('days', 1, 36525, 256, 'log')],
+            transform='linear'),
+    }
+
+
+def evaluate_lattice(table: LatticeTable) -> np.ndarray:
+    """The table's formula at every lattice point, shape `table.shape`."""
+    grids = np.meshgrid(*[axis.points() for axis in table.axes], indexing='ij')
+    inputs = {axis.name: grid for axis, grid in zip(table.axes, grids)}
+    return np.broadcast_to(table.evaluate(**inputs), table.shape)
+
+
+def _forward(values: np.ndarray, transform: str, floor: float) -> np.ndarray:
+    if transform == 'log10':
+        return np.log10(np.maximum(values, floor))
+    if transform == 'linear':
+        return values
+    raise ValueError(f"Unknown transform '{transform}', expected 'log10' or 'linear'")
+
+
+def _inverse(t: np.ndarray, transform: str) -> np.ndarray:
+    return 10.0 ** t if transform == 'log10' else t
+
+
+def quantize(values: np.ndarray, transform: str = 'log10', floor: Optional[float] = None,
+             bits: int = 16) -> Tuple[np.ndarray, Dict]:
+    """
+    Transformed values as unsigned integer codes.
+    
+    Returns
+    -------
+    Tuple[np.ndarray, Dict]
+        Codes (uint8/uint16) and the quantization metadata: transform,
+        floor, low and step (t = low + code × step)
+    """
+    if bits not in (8, 16):
+        raise ValueError("bits must be 8 or 16")
+    values = np.asarray(values, dtype=np.float64)
+    if floor is None:
+        positive = values[values > 0]
+        floor = float(positive.min()) if positive.size else 1.0
+    t = _forward(values, transform, floor)
+    low, high = float(t.min()), float(t.max())
+    levels = (1 << bits) - 1
+    step = (high - low) / levels if high > low else 1.0
+    codes = np.rint((t - low) / step).astype(np.uint8 if bits == 8 else np.uint16)
+    return codes, {'transform': transform, 'floor': floor, 'low': low, 'step': step,
+                   'dtype': codes.dtype.name}
+
+
+def lookup(meta: Dict, codes: np.ndarray, **inputs) -> np.ndarray:
+    """
+    Interpolated value from a quantized table (the reference the pages mirror).
+    
+    Parameters
+    ----------
+    meta : Dict
+        The table's manifest entry
+    codes : np.ndarray
+        The table's codes, shape meta['shape']
+    **inputs
+        One array (or scalar) per axis name; out-of-range inputs clamp
+    
+    Returns
+    -------
+    np.ndarray
+        Values at the inputs, broadcast together
+    """
+    axes = [LatticeAxis(**axis) for axis in meta['axes']]
+    coords = np.broadcast_arrays(*[axis.coordinate(inputs[axis.name]) for axis in axes])
+    t_codes = meta['low'] + codes.astype(np.float64).reshape(-1) * meta['step']
+    strides = np.cumprod([1] + [axis.n for axis in axes[:0:-1]])[::-1]
+    
+    base = np.zeros(coords[0].shape, dtype=np.int64)
+    corners = [(base, np.ones(coords[0].shape))]
+    for axis, c, stride in zip(axes, coords, strides):
+        if axis.interpolation == 'nearest' or axis.n == 1:
+            i0 = np.rint(c).astype(np.int64)
+            corners = [(index + i0 * stride, weight) for index, weight in corners]
+            continue
+        i0 = np.minimum(np.floor(c).astype(np.int64), axis.n - 2)
+        w = c - i0
+        corners = ([(index + i0 * stride, weight * (1 - w)) for index, weight in corners] +
+                   [(index + (i0 + 1) * stride, weight * w) for index, weight in corners])
+    
+    t = sum(weight * t_codes[index] for index, weight in corners)
+    return _inverse(t, meta['transform'])
+
+
+def _sample_inputs(table: LatticeTable, n_samples: int, rng: np.random.RandomState) -> Dict:
+    """Random inputs: uniform (log-uniform on 'log' axes), lattice points on 'nearest' axes."""
+    inputs = {}
+    for axis in table.axes:
+        if axis.interpolation == 'nearest':
+            inputs[axis.name] = axis.points()[rng.randint(0, axis.n, n_samples)]
+        elif axis.scale == 'log':
+            inputs[axis.name] = 10 ** rng.uniform(np.log10(axis.start), np.log10(axis.stop), n_samples)
+        else:
+            inputs[axis.name] = rng.uniform(axis.start, axis.stop, n_samples)
+    return inputs
+
+
+def _category_codes(values: np.ndarray, category: Dict) -> np.ndarray:
+    return np.searchsorted(category['bounds'], values, side=category['side'])
+
+
+def lattice_accuracy(table: LatticeTable, meta: Dict, codes: np.ndarray,
+                     n_samples: int = 20000, seed: int = 42) -> Dict:
+    """
+    Interpolated table against the Python formula at random inputs.
+    
+    Returns
+    -------
+    Dict
+        Relative errors (median, p99, max) where the reference is at least
+        the floor ('log10') or 0.1% of its largest value ('linear'), the
+        largest absolute error, and for each category the % of samples that
+        land in the same one
+    """
+    rng = np.random.RandomState(seed)
+    inputs = _sample_inputs(table, n_samples, rng)
+    reference = table.evaluate(**inputs)
+    approx = lookup(meta, codes, **inputs)
+    
+    abs_error = np.abs(approx - reference)
+    if meta['transform'] == 'log10':
+        above = np.abs(reference) >= meta['floor']
+    else:
+        above = np.abs(reference) >= 1e-3 * np.abs(reference).max()
+    rel_error = abs_error[above] / np.abs(reference[above])
+    report = {
+        'n_samples': n_samples,
+        'median_rel_error': float(np.median(rel_error)) if rel_error.size else 0.0,
+        'p99_rel_error': float(np.percentile(rel_error, 99)) if rel_error.size else 0.0,
+        'max_rel_error': float(rel_error.max()) if rel_error.size else 0.0,
+        'max_abs_error': float(abs_error.max()),
+    }
+    for name, category in table.categories.items():
+        agree = _category_codes(approx, category) == _category_codes(reference, category)
+        report[f'{name}_agreement_pct'] = round(100.0 * agree.mean(), 3)
+    return report
+
+
+def export_lattices(prefix: str, tables: Optional[Dict[str, LatticeTable]] = None,
+                    n_samples: int = 20000, seed: int = 42) -> pd.DataFrame:
+    """
+    Evaluate, quantize and write lookup tables with their accuracy.
+    
+    Parameters
+    ----------
+    prefix : str
+        Output path without extension; writes <prefix>.bin and <prefix>.json
+    tables : Dict[str, LatticeTable], optional
+        Tables to export (default: `default_lattices()`)
+    n_samples : int
+        Random inputs per table for the accuracy report
+    seed : int
+        Random seed of the accuracy report
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per table: cells, bytes and the `lattice_accuracy` fields
+    """
+    tables = tables or default_lattices()
+    manifest = {
+        'format': LATTICE_FORMAT,
+        'version': LATTICE_VERSION,
+        'binary': os.path.basename(prefix) + '.bin',
+        'interpretations': {'fractal_dimension': upper_bounds(FRACTAL_INTERPRETATIONS)},
+        'tables': {},
+    }
+    rows = []
+    offset = 0
+    with open(prefix + '.bin', 'wb') as f:
+        for name, table in tables.items():
+            codes, meta = quantize(evaluate_lattice(table), table.transform, table.floor, table.bits)
+            meta.update({
+                'offset': offset,
+                'shape': list(table.shape),
+                'axes': [vars(axis).copy() for axis in table.axes],
+                'fixed': table.fixed,
+                'categories': table.categories,
+            })
+            meta['accuracy'] = lattice_accuracy(table, meta, codes, n_samples, seed)
+            data = codes.astype(codes.dtype.newbyteorder('<')).tobytes()
+            f.write(data + b'\0' * (-len(data) % 8))
+            offset += len(data) + (-len(data) % 8)
+            manifest['tables'][name] = meta
+            rows.append({'table': name, 'cells': codes.size, 'bytes': len(data), **meta['accuracy']})
+    
+    with open(prefix + '.json', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return pd.DataFrame(rows)
+
+
+def load_lattices(prefix: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Manifest and per-table codes of an exported lattice."""
+    with open(prefix + '.json') as f:
+        manifest = json.load(f)
+    raw = np.fromfile(os.path.join(os.path.dirname(prefix), manifest['binary']), dtype=np.uint8)
+    codes = {}
+    for name, meta in manifest['tables'].items():
+        dtype = np.dtype(meta['dtype']).newbyteorder('<')
+        size = int(np.prod(meta['shape'])) * dtype.itemsize
+        codes[name] = raw[meta['offset']:meta['offset'] + size].view(dtype).reshape(meta['shape'])
+    return manifest, codes
+
+
+if __name__ == '__main__':
+    report = export_lattices('calculator_lattice')
+    print(report.to_string(index=False))
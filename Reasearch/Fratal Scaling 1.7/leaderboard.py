@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - TVI Leaderboard Index
+=====================================================
+
+Incrementally maintained ranking of scored items, partitioned by TVI tier
+(`TVI_TIERS`) and structural-resistance era (`SRC_TABLE`), optionally also
+by platform.
+
+Each partition is an indexable skip list ordered by descending score, so:
+- inserting, updating or removing one item is O(log n)
+- top-k in a partition is a walk of k nodes
+- top-k across partitions is a lazy k-way merge
+- percentile rank is one O(log n) rank lookup per partition
+
+Usage
+-----
+    board = TVILeaderboard()
+    board.upsert('charlie', views=880_000_000, year=2007,
+                 platform_users=100_000_000, persistence_months=180,
+                 resurfacing_rate=0.65, legacy_level=3.0, cross_platform=3.5,
+                 platform='youtube')
+    board.update('charlie', views=900_000_000)
+    board.top_k(10, tier='foundation')
+    board.percentile_rank('charlie', era=(2005, 2010))
+"""
+
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+import heapq
+import itertools
+import math
+import random
+
+from temporal_validation_framework import (
+    SRC_TABLE, TVI_TIERS, classify_tvi, tvi_score_array
+)
+
+
+# =============================================================================
+# INDEXABLE SKIP LIST
+# =============================================================================
+
+class _Node:
+    __slots__ = ('key', 'next', 'width')
+    
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class IndexableSkipList:
+    """
+    Sorted container with O(log n) insert, remove, rank and positional
+    access (expected).
+    
+    Keys must be mutually comparable and unique.
+    """
+    
+    def __init__(self, max_levels: int = 32, seed: Optional[int] = None):
+        self.max_levels = max_levels
+        self.head = _Node(None, max_levels)
+        self.size = 0
+        self._levels = 1
+        self._random = random.Random(seed)
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.max_levels and self._random.random() < 0.5:
+            level += 1
+        return level
+    
+    def insert(self, key) -> None:
+        """Insert a key."""
+        chain = [None] * self.max_levels
+        steps = [0] * self.max_levels
+        node = self.head
+        for level in range(self._levels - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        
+        new_levels = self._random_level()
+        if new_levels > self._levels:
+            for level in range(self._levels, new_levels):
+                chain[level] = self.head
+                self.head.width[level] = self.size + 1
+            self._levels = new_levels
+        
+        new = _Node(key, new_levels)
+        distance = 0
+        for level in range(new_levels):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - distance
+            prev.width[level] = distance + 1
+            distance += steps[level]
+        for level in range(new_levels, self._levels):
+            chain[level].width[level] += 1
+        self.size += 1
+    
+    def remove(self, key) -> None:
+        """Remove a key (KeyError if absent)."""
+        chain = [None] * self._levels
+        node = self.head
+        for level in range(self._levels - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+        
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        
+        for level in range(self._levels):
+            prev = chain[level]
+            if prev.next[level] is target:
+                prev.next[level] = target.next[level]
+                prev.width[level] += target.width[level] - 1
+            else:
+                prev.width[level] -= 1
+        self.size -= 1
+    
+    def rank(self, key) -> int:
+        """Number of keys strictly less than `key`."""
+        position = 0
+        node = self.head
+        for level in range(self._levels - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+    
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        node = self.head
+        remaining = index + 1
+        for level in range(self._levels - 1, -1, -1):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+    
+    def __iter__(self) -> Iterator:
+        node = self.head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+
+# =============================================================================
+# LEADERBOARD
+# =============================================================================
+
+ERAS = sorted(SRC_TABLE)
+
+# Arguments of the TVI formula kept per item so single inputs can be changed
+TVI_INPUTS = ('views', 'year', 'platform_users', 'persistence_months',
+              'resurfacing_rate', 'legacy_level', 'cross_platform', 'account_factor')
+
+
+def get_era(year: int) -> Optional[Tuple[int, int]]:
+    """SRC_TABLE era (start, end) containing a year, or None."""
+    for start, end in ERAS:
+        if start <= year < end:
+            return (start, end)
+    return None
+
+
+@dataclass
+class LeaderboardEntry:
+    """A scored item held in the leaderboard."""
+    item_id: object
+    score: float
+    tier: str
+    era: Optional[Tuple[int, int]]
+    platform: Optional[str]
+    inputs: Dict
+    seq: int
+
+
+class TVILeaderboard:
+    """
+    Ranking index over TVI-scored items.
+    
+    Parameters
+    ----------
+    current_year : int
+        Year used for the account factor when it is not given per item
+    seed : int, optional
+        Seed for the skip list level draws
+    """
+    
+    def __init__(self, current_year: int = 2026, seed: Optional[int] = None):
+        self.current_year = current_year
+        self.entries: Dict[object, LeaderboardEntry] = {}
+        self._by_seq: Dict[int, LeaderboardEntry] = {}
+        self.partitions: Dict[Tuple, IndexableSkipList] = {}
+        self._seq = itertools.count()
+        self._random = random.Random(seed)
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+    
+    def _score(self, inputs: Dict) -> float:
+        return float(tvi_score_array(current_year=self.current_year, **inputs))
+    
+    def _partition(self, key: Tuple) -> IndexableSkipList:
+        partition = self.partitions.get(key)
+        if partition is None:
+            partition = IndexableSkipList(seed=self._random.random())
+            self.partitions[key] = partition
+        return partition
+    
+    def _insert(self, item_id, score: float, inputs: Dict, platform: Optional[str]) -> None:
+        entry = LeaderboardEntry(
+            item_id=item_id,
+            score=score,
+            tier=classify_tvi(score),
+            era=get_era(inputs['year']),
+            platform=platform,
+            inputs=inputs,
+            seq=next(self._seq)
+        )
+        self.entries[item_id] = entry
+        self._by_seq[entry.seq] = entry
+        # Descending score; insertion sequence breaks ties
+        self._partition((entry.tier, entry.era, platform)).insert((-score, entry.seq))
+    
+    def remove(self, item_id) -> None:
+        """Remove an item from the index."""
+        entry = self.entries.pop(item_id)
+        del self._by_seq[entry.seq]
+        key = (entry.tier, entry.era, entry.platform)
+        partition = self.partitions[key]
+        partition.remove((-entry.score, entry.seq))
+        if len(partition) == 0:
+            del self.partitions[key]
+    
+    def upsert(self, item_id, views: int, year: int, platform_users: int,
+               persistence_months: int, resurfacing_rate: float = 0.0,
+               legacy_level: float = 1.0, cross_platform: float = 1.0,
+               account_factor: float = None, platform: Optional[str] = None) -> float:
+        """
+        Insert or replace an item, scoring it with the TVI formula.
+        
+        Returns
+        -------
+        float
+            The item's (unrounded) TVI score
+        """
+        if item_id in self.entries:
+            self.remove(item_id)
+        inputs = {
+            'views': views, 'year': year, 'platform_users': platform_users,
+            'persistence_months': persistence_months, 'resurfacing_rate': resurfacing_rate,
+            'legacy_level': legacy_level, 'cross_platform': cross_platform,
+            'account_factor': account_factor
+        }
+        score = self._score(inputs)
+        self._insert(item_id, score, inputs, platform)
+        return score
+    
+    def update(self, item_id, **changes) -> float:
+        """
+        Change some inputs of an existing item (e.g. views or
+        persistence_months) and move it to its new rank.
+        """
+        entry = self.entries[item_id]
+        unknown = set(changes) - set(TVI_INPUTS) - {'platform'}
+        if unknown:
+            raise ValueError(f"Unknown TVI inputs {sorted(unknown)}")
+        inputs = dict(entry.inputs)
+        inputs.update({k: v for k, v in changes.items() if k != 'platform'})
+        platform = changes.get('platform', entry.platform)
+        
+        self.remove(item_id)
+        score = self._score(inputs)
+        self._insert(item_id, score, inputs, platform)
+        return score
+    
+    def load_frame(self, frame: pd.DataFrame, id_column: str = 'item_id',
+                   platform_column: Optional[str] = None) -> None:
+        """
+        Bulk-insert items from a DataFrame with TVI input columns.
+        
+        Scores are computed in one vectorized pass before insertion.
+        """
+        columns = [c for c in TVI_INPUTS if c in frame.columns]
+        inputs = {c: frame[c].to_numpy() for c in columns}
+        scores = tvi_score_array(current_year=self.current_year, **inputs)
+        
+        ids = frame[id_column].to_numpy()
+        platforms = frame[platform_column].to_numpy() if platform_column else [None] * len(frame)
+        for i, item_id in enumerate(ids):
+            if item_id in self.entries:
+                self.remove(item_id)
+            item_inputs = {'resurfacing_rate': 0.0, 'legacy_level': 1.0,
+                           'cross_platform': 1.0, 'account_factor': None}
+            item_inputs.update({c: inputs[c][i].item() for c in columns})
+            self._insert(item_id, float(scores[i]), item_inputs, platforms[i])
+    
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    
+    def _matching(self, tier: Optional[str], era: Optional[Tuple[int, int]],
+                  year: Optional[int], platform: Optional[str]) -> List[IndexableSkipList]:
+        if tier is not None and tier not in TVI_TIERS and tier != 'unknown':
+            raise ValueError(f"Unknown tier '{tier}'")
+        filter_era = era is not None or year is not None
+        if year is not None:
+            era = get_era(year)
+        return [
+            partition for (p_tier, p_era, p_platform), partition in self.partitions.items()
+            if (tier is None or p_tier == tier)
+            and (not filter_era or p_era == era)
+            and (platform is None or p_platform == platform)
+        ]
+    
+    def top_k(self, k: int = 10, tier: Optional[str] = None,
+              era: Optional[Tuple[int, int]] = None, year: Optional[int] = None,
+              platform: Optional[str] = None) -> pd.DataFrame:
+        """
+        Highest-scoring items, optionally restricted to a tier, an era (or
+        the era containing `year`) and a platform.
+        
+        Returns
+        -------
+        pd.DataFrame
+            Columns: Rank, Item, TVI, Tier, Era, Platform
+        """
+        merged = heapq.merge(*self._matching(tier, era, year, platform))
+        
+        rows = []
+        for rank, (neg_score, seq) in enumerate(itertools.islice(merged, k), start=1):
+            entry = self._by_seq[seq]
+            rows.append({
+                'Rank': rank,
+                'Item': entry.item_id,
+                'TVI': round(entry.score, 2),
+                'Tier': entry.tier,
+                'Era': entry.era,
+                'Platform': entry.platform
+            })
+        return pd.DataFrame(rows, columns=['Rank', 'Item', 'TVI', 'Tier', 'Era', 'Platform'])
+    
+    def percentile_rank(self, item_id, tier: Optional[str] = None,
+                        era: Optional[Tuple[int, int]] = None, year: Optional[int] = None,
+                        platform: Optional[str] = None) -> float:
+        """
+        Percentage of items in scope scoring at or below the given item.
+        
+        The scope defaults to the whole index; pass tier/era/year/platform to
+        rank within a subset.
+        """
+        score = self.entries[item_id].score
+        total = 0
+        above = 0
+        for partition in self._matching(tier, era, year, platform):
+            total += len(partition)
+            above += partition.rank((-score, -math.inf))
+        if total == 0:
+            return float('nan')
+        return 100.0 * (total - above) / total
+    
+    def score_rank(self, score: float, **scope) -> int:
+        """1-based rank a given score would take within a scope."""
+        return 1 + sum(partition.rank((-score, -math.inf))
+                       for partition in self._matching(scope.get('tier'), scope.get('era'),
+                                                       scope.get('year'), scope.get('platform')))
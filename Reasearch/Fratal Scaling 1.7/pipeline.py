@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Lazy Chunked Pipeline
+=====================================================
+
+Declares a generate → extract → score → aggregate workflow without running
+it, then executes it chunk by chunk so no intermediate array ever exists
+for the whole dataset:
+- a source produces one chunk of items (a dict of row-aligned arrays)
+- element-wise map stages add columns to a chunk
+- an aggregator folds each finished chunk into its result
+
+Planning fuses the source and all map stages into a single task per chunk
+and drops every column as soon as no later stage (or the aggregator) reads
+it, so e.g. the raw series are released right after feature extraction and
+only the aggregated columns leave a worker. Tasks run on a serial, thread
+or process executor; chunks are folded in order, so results do not depend
+on the executor or on the number of workers.
+
+Usage
+-----
+    pipe = attention_pipeline(n_items=100_000, chunk_size=2_000)
+    print(pipe.explain())
+    result = pipe.run(executor='process', n_jobs=4)
+    result.value; result.timings
+"""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import copy
+import os
+import time
+
+from kernels import decay_recurrence
+from temporal_validation_framework import (calculate_hurst_variance, calculate_tvi_batch,
+                                           memory_concentration)
+from burst_features import extract_burst_features
+
+
+Chunk = Dict[str, np.ndarray]
+
+EXECUTORS = ('serial', 'thread', 'process')
+
+
+# =============================================================================
+# STAGES
+# =============================================================================
+
+@dataclass
+class SourceStage:
+    """
+    Produces the items of a half-open index range.
+    
+    `func` is called as func(start, stop, **params) and returns a Chunk.
+    Items must depend only on their index (not on the chunk boundaries).
+    """
+    name: str
+    func: Callable
+    n_items: int
+    chunk_size: int
+    outputs: Tuple[str, ...]
+    params: Dict = field(default_factory=dict)
+
+
+@dataclass
+class MapStage:
+    """
+    Element-wise stage: func(chunk, **params) returns new columns.
+    
+    `inputs` are the columns it reads and `outputs` the columns it returns,
+    used by the planner to drop columns early.
+    """
+    name: str
+    func: Callable
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    params: Dict = field(default_factory=dict)
+
+
+@dataclass
+class FusedTask:
+    """The source and all map stages of a plan, run together on one chunk."""
+    source: SourceStage
+    maps: Tuple[MapStage, ...]
+    source_keep: Tuple[str, ...]
+    keep: Tuple[Tuple[str, ...], ...]
+    
+    def __call__(self, bounds: Tuple[int, int]) -> Tuple[Chunk, List[float]]:
+        start, stop = bounds
+        seconds = []
+        t0 = time.perf_counter()
+        produced = self.source.func(start, stop, **self.source.params)
+        chunk = {name: produced[name] for name in self.source_keep}
+        seconds.append(time.perf_counter() - t0)
+        
+        for stage, keep in zip(self.maps, self.keep):
+            t0 = time.perf_counter()
+            chunk.update(stage.func(chunk, **stage.params))
+            chunk = {name: chunk[name] for name in keep}
+            seconds.append(time.perf_counter() - t0)
+        return chunk, seconds
+
+
+@dataclass
+class PipelineResult:
+    """Aggregated value of a pipeline run with per-stage timings."""
+    value: Any
+    timings: pd.DataFrame
+    n_items: int
+    n_chunks: int
+    elapsed: float
+    executor: str
+
+
+# =============================================================================
+# AGGREGATORS
+# =============================================================================
+
+class CollectAggregate:
+    """Concatenate the given columns of every chunk into one DataFrame."""
+    
+    def __init__(self, columns: Tuple[str, ...]):
+        self.columns = tuple(columns)
+        self._parts: Dict[str, List[np.ndarray]] = {c: [] for c in self.columns}
+    
+    def update(self, chunk: Chunk) -> None:
+        for c in self.columns:
+            self._parts[c].append(chunk[c])
+    
+    def result(self) -> pd.DataFrame:
+        return pd.DataFrame({c: np.concatenate(parts) if parts else np.empty(0)
+                             for c, parts in self._parts.items()})
+
+
+class ConcentrationAggregate:
+    """
+    Memory concentration of a score column (as in `analyze_power_law`) plus
+    the mean of any other columns.
+    
+    The score column is kept (one float per item) because the shares need
+    exact percentiles; means are accumulated as running sums.
+    """
+    
+    def __init__(self, score: str = 'tvi', means: Tuple[str, ...] = ()):
+        self.score = score
+        self.means = tuple(means)
+        self.columns = (score,) + self.means
+        self._scores: List[np.ndarray] = []
+        self._sums = {c: 0.0 for c in self.means}
+        self._counts = {c: 0 for c in self.means}
+    
+    def update(self, chunk: Chunk) -> None:
+        self._scores.append(np.asarray(chunk[self.score], dtype=np.float64))
+        for c in self.means:
+            values = np.asarray(chunk[c], dtype=np.float64)
+            values = values[~np.isnan(values)]
+            self._sums[c] += values.sum()
+            self._counts[c] += len(values)
+    
+    def result(self) -> Dict:
+        scores = np.concatenate(self._scores) if self._scores else np.empty(0)
+        results = {'n_items': len(scores)}
+        if len(scores):
+            results.update(memory_concentration(scores))
+        for c in self.means:
+            results[f'mean_{c}'] = self._sums[c] / self._counts[c] if self._counts[c] else np.nan
+        return results
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def _live_columns(source: SourceStage, maps: Tuple[MapStage, ...],
+                  needed: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, ...], ...]]:
+    """Columns to keep after the source and after each map (backward liveness)."""
+    live = set(needed)
+    live_after = []
+    for stage in reversed(maps):
+        live_after.append(live)
+        live = (live - set(stage.outputs)) | set(stage.inputs)
+    live_after.reverse()
+    missing = live - set(source.outputs)
+    if missing:
+        raise ValueError(f"no stage produces column(s) {sorted(missing)}")
+    
+    # Keep columns that are both live and already produced, in production order
+    available = list(source.outputs)
+    source_keep = tuple(c for c in available if c in live)
+    keep = []
+    for stage, cols in zip(maps, live_after):
+        available += [c for c in stage.outputs if c not in available]
+        keep.append(tuple(c for c in available if c in cols))
+    return source_keep, tuple(keep)
+
+
+class Pipeline:
+    """
+    Lazily declared chunked pipeline.
+    
+    Builder methods return a new Pipeline; nothing runs until `run`.
+    With the process executor, stage functions must be importable
+    module-level functions (not lambdas or closures).
+    """
+    
+    def __init__(self, source: SourceStage, maps: Tuple[MapStage, ...] = (),
+                 aggregator: Any = None):
+        self.source = source
+        self.maps = tuple(maps)
+        self.aggregator = aggregator
+    
+    @classmethod
+    def from_source(cls, func: Callable, n_items: int, outputs: Tuple[str, ...],
+                    chunk_size: int = 1000, name: Optional[str] = None, **params) -> 'Pipeline':
+        """Start a pipeline from func(start, stop, **params) -> Chunk."""
+        return cls(SourceStage(name or func.__name__, func, n_items, chunk_size,
+                               tuple(outputs), params))
+    
+    def map(self, func: Callable, inputs: Tuple[str, ...], outputs: Tuple[str, ...],
+            name: Optional[str] = None, **params) -> 'Pipeline':
+        """Append an element-wise stage func(chunk, **params) -> new columns."""
+        stage = MapStage(name or func.__name__, func, tuple(inputs), tuple(outputs), params)
+        return Pipeline(self.source, self.maps + (stage,), self.aggregator)
+    
+    def aggregate(self, aggregator: Any) -> 'Pipeline':
+        """
+        Set the final stage: an object with `columns`, `update(chunk)` and
+        `result()`. A fresh copy is used by every run.
+        """
+        return Pipeline(self.source, self.maps, aggregator)
+    
+    def with_chunk_size(self, chunk_size: int) -> 'Pipeline':
+        return Pipeline(replace(self.source, chunk_size=chunk_size), self.maps, self.aggregator)
+    
+    def plan(self) -> FusedTask:
+        """Fuse the source and map stages into one per-chunk task with column pruning."""
+        if self.aggregator is None:
+            raise ValueError("pipeline has no aggregate stage")
+        source_keep, keep = _live_columns(self.source, self.maps, tuple(self.aggregator.columns))
+        return FusedTask(self.source, self.maps, source_keep, keep)
+    
+    def chunks(self) -> List[Tuple[int, int]]:
+        size = self.source.chunk_size
+        return [(start, min(start + size, self.source.n_items))
+                for start in range(0, self.source.n_items, size)]
+    
+    def explain(self) -> str:
+        """Human-readable plan: fused stages and the columns alive after each."""
+        task = self.plan()
+        lines = [f"{len(self.chunks())} chunks of ≤ {self.source.chunk_size} items "
+                 f"({self.source.n_items} total), one fused task per chunk:",
+                 f"  source    {self.source.name:<20} keep {list(task.source_keep)}"]
+        for stage, keep in zip(task.maps, task.keep):
+            lines.append(f"  map       {stage.name:<20} keep {list(keep)}")
+        lines.append(f"  aggregate {type(self.aggregator).__name__:<20} (in order, on the driver)")
+        return '\n'.join(lines)
+    
+    def run(self, executor: str = 'serial', n_jobs: Optional[int] = None,
+            max_in_flight: Optional[int] = None) -> PipelineResult:
+        """
+        Execute the plan.
+        
+        Parameters
+        ----------
+        executor : str
+            'serial', 'thread' or 'process'
+        n_jobs : int, optional
+            Workers for the thread/process executors (default: CPU count)
+        max_in_flight : int, optional
+            Chunks submitted but not yet aggregated (default: 2 × n_jobs);
+            bounds memory when aggregation is slower than the workers
+        
+        Returns
+        -------
+        PipelineResult
+            Aggregated value, per-stage timings (summed over chunks, so
+            parallel runs can exceed the wall-clock time) and run metadata
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}")
+        task = self.plan()
+        aggregator = copy.deepcopy(self.aggregator)
+        n_jobs = n_jobs or os.cpu_count()
+        bounds = self.chunks()
+        stage_seconds = np.zeros(1 + len(task.maps))
+        aggregate_seconds = 0.0
+        
+        started = time.perf_counter()
+        if executor == 'serial':
+            results = map(task, bounds)
+            pool = None
+        else:
+            pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+            pool = pool_class(max_workers=n_jobs)
+            results = _ordered(pool, task, bounds, max_in_flight or 2 * n_jobs)
+        try:
+            for chunk, seconds in results:
+                stage_seconds += seconds
+                t0 = time.perf_counter()
+                aggregator.update(chunk)
+                aggregate_seconds += time.perf_counter() - t0
+            t0 = time.perf_counter()
+            value = aggregator.result()
+            aggregate_seconds += time.perf_counter() - t0
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        elapsed = time.perf_counter() - started
+        
+        seconds = np.append(stage_seconds, aggregate_seconds)
+        timings = pd.DataFrame({
+            'stage': [self.source.name] + [s.name for s in task.maps] + [type(aggregator).__name__],
+            'kind': ['source'] + ['map'] * len(task.maps) + ['aggregate'],
+            'seconds': seconds,
+            'share': seconds / seconds.sum() if seconds.sum() > 0 else 0.0,
+            'items_per_second': self.source.n_items / np.where(seconds > 0, seconds, np.nan),
+        })
+        return PipelineResult(value, timings, self.source.n_items, len(bounds), elapsed, executor)
+
+
+def _ordered(pool, task: Callable, bounds: List[Tuple[int, int]], window: int):
+    """Yield task results in submission order with at most `window` pending."""
+    pending = deque()
+    for b in bounds:
+        pending.append(pool.submit(task, b))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+# =============================================================================
+# FRAMEWORK STAGES
+# =============================================================================
+
+def cultural_catalog(start: int, stop: int, length: int = 2000, seed: int = 42) -> Chunk:
+    """
+    Synthetic catalog items with attention series.
+    
+    Item i's series is `generate_cultural_timeseries(length, seed=seed + i)`
+    (same draws, from a local RandomState so threads do not share state);
+    views, year and platform_users are drawn after it.
+    """
+    n = stop - start
+    series = np.empty((n, length))
+    views = np.empty(n)
+    year = np.empty(n, dtype=np.int64)
+    platform_users = np.empty(n)
+    for k, i in enumerate(range(start, stop)):
+        rng = np.random.RandomState(seed + i)
+        burst_draws = rng.random_sample(length)
+        burst_sizes = rng.pareto(1.5, length) * 10
+        bursts = np.where(burst_draws < 0.02, burst_sizes, 0.0)
+        noise = rng.randn(length) * 0.5
+        series[k] = decay_recurrence(bursts, noise, decay=0.95, floor=0.0)
+        views[k] = 10 ** rng.uniform(3, 9)
+        year[k] = rng.randint(1990, 2026)
+        platform_users[k] = 10 ** rng.uniform(7, 9.5)
+    return {'series': series, 'views': views, 'year': year, 'platform_users': platform_users}
+
+
+CATALOG_COLUMNS = ('series', 'views', 'year', 'platform_users')
+
+
+def fractal_features(chunk: Chunk, max_lag: int = 100) -> Chunk:
+    """Variance-method Hurst exponent and D = 2 - H per series."""
+    H, r_squared = calculate_hurst_variance(np.atleast_2d(chunk['series']), max_lag=max_lag)
+    return {'hurst': H, 'fractal_dimension': 2 - H, 'hurst_r_squared': r_squared}
+
+
+def tvi_features(chunk: Chunk, current_year: int = 2026, **burst_kwargs) -> Chunk:
+    """Burst features of each series scored with batch TVI; tier as int8 codes."""
+    bursts = extract_burst_features(chunk['series'], **burst_kwargs)
+    scored = calculate_tvi_batch(chunk['views'], chunk['year'], chunk['platform_users'],
+                                 bursts['persistence_months'].to_numpy(),
+                                 bursts['resurfacing_rate'].to_numpy(),
+                                 current_year=current_year)
+    return {
+        'resurfacing_rate': bursts['resurfacing_rate'].to_numpy(),
+        'persistence_months': bursts['persistence_months'].to_numpy(),
+        'tvi': scored['score'].to_numpy(),
+        'tvi_tier': scored['tier'].cat.codes.to_numpy(),
+    }
+
+
+def attention_pipeline(n_items: int = 10_000, chunk_size: int = 1000, length: int = 2000,
+                       seed: int = 42, current_year: int = 2026) -> Pipeline:
+    """
+    generate → fractal estimation → TVI scoring → memory concentration.
+    
+    The aggregate reports `memory_concentration` of the TVI scores and the
+    mean Hurst exponent, fractal dimension and persistence.
+    """
+    return (Pipeline.from_source(cultural_catalog, n_items, CATALOG_COLUMNS,
+                                 chunk_size=chunk_size, length=length, seed=seed)
+            .map(fractal_features, inputs=('series',),
+                 outputs=('hurst', 'fractal_dimension', 'hurst_r_squared'))
+            .map(tvi_features, inputs=CATALOG_COLUMNS,
+                 outputs=('resurfacing_rate', 'persistence_months', 'tvi', 'tvi_tier'),
+                 current_year=current_year)
+            .aggregate(ConcentrationAggregate('tvi', means=('hurst', 'fractal_dimension',
+                                                            'persistence_months'))))
+
+
+if __name__ == '__main__':
+    pipe = attention_pipeline()
+    print(pipe.explain())
+    for executor in EXECUTORS:
+        result = pipe.run(executor=executor)
+        print(f"\n{executor}: {result.elapsed:.2f}s")
+        print(result.timings.to_string(index=False))
+    print(result.value)
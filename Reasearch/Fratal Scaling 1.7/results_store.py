@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Columnar Results Store
+======================================================
+
+Binary export of experiment results. A results directory contains:
+- manifest.json : scalar results plus the schema of every table
+- tables/<name>/c<i>.bin : one raw little-endian column file per column
+
+Numeric and boolean columns are written as raw arrays so they can be
+appended chunk by chunk and memory-mapped on read. String columns are stored
+as int32 category codes with the categories kept in the manifest; other
+objects (e.g. the tau distribution dicts) are JSON-encoded before being
+categorised.
+
+Usage
+-----
+    results = run_all_experiments(as_frames=True)
+    write_results(results, 'experimental_results')
+    prior = read_results('experimental_results')
+    
+    with ResultsWriter('sweep') as writer:
+        for chunk in chunks:
+            writer.append_table('scores', chunk)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Any
+import json
+import os
+
+
+MANIFEST_NAME = 'manifest.json'
+STORE_FORMAT_VERSION = 1
+
+
+def _json_default(obj):
+    """Convert numpy scalars/arrays into plain Python for JSON encoding."""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _is_records(value) -> bool:
+    """True for a non-empty list of dicts, i.e. DataFrame.to_dict('records')."""
+    return isinstance(value, list) and len(value) > 0 and all(isinstance(v, dict) for v in value)
+
+
+# =============================================================================
+# WRITER
+# =============================================================================
+
+class ResultsWriter:
+    """
+    Streaming writer for a columnar results directory.
+    
+    Tables may be written in one call or appended chunk by chunk. The
+    manifest is written by `flush` and `close` (not on every append, which
+    would make a long stream of appends quadratic); a reader sees the rows
+    written up to the last flush.
+    
+    Parameters
+    ----------
+    path : str
+        Results directory (created if missing, existing tables are replaced)
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.values = {}
+        self.tables = {}
+        self._category_index = {}
+        os.makedirs(os.path.join(path, 'tables'), exist_ok=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def write_value(self, name: str, value: Any) -> None:
+        """Store a small JSON-serializable result (dict, scalar, list)."""
+        self.values[name] = value
+    
+    def write_table(self, name: str, frame: pd.DataFrame) -> None:
+        """Write a complete table, replacing any existing table of that name."""
+        self._drop_table(name)
+        self.append_table(name, frame)
+    
+    def append_table(self, name: str, frame: pd.DataFrame) -> None:
+        """
+        Append a chunk of rows to a table.
+        
+        The first chunk fixes the schema; later chunks must have the same
+        columns and are cast to the stored dtypes.
+        """
+        if name not in self.tables:
+            self._create_table(name, frame)
+        schema = self.tables[name]
+        
+        if [str(c) for c in frame.columns] != [c['name'] for c in schema['columns']]:
+            raise ValueError(f"Columns of chunk do not match table '{name}'")
+        
+        table_dir = os.path.join(self.path, 'tables', name)
+        for i, column in enumerate(schema['columns']):
+            values = frame.iloc[:, i]
+            if column['kind'] == 'category':
+                data = self._encode_categories(name, column, values)
+            else:
+                data = np.ascontiguousarray(values.to_numpy(), dtype=column['dtype'])
+            with open(os.path.join(table_dir, column['file']), 'ab') as f:
+                f.write(data.tobytes())
+        
+        schema['n_rows'] += len(frame)
+    
+    def flush(self) -> None:
+        """Write the manifest, making everything written so far readable."""
+        self._write_manifest()
+    
+    def close(self) -> None:
+        """Flush the final manifest."""
+        self.flush()
+    
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+    
+    def _create_table(self, name: str, frame: pd.DataFrame) -> None:
+        table_dir = os.path.join(self.path, 'tables', name)
+        os.makedirs(table_dir, exist_ok=True)
+        
+        columns = []
+        for i, col in enumerate(frame.columns):
+            values = frame.iloc[:, i]
+            column = {'name': str(col), 'file': f'c{i}.bin'}
+            if values.dtype.kind in 'biuf':
+                column['kind'] = 'array'
+                column['dtype'] = np.dtype(values.dtype).newbyteorder('<').str
+            else:
+                is_categorical = isinstance(values.dtype, pd.CategoricalDtype)
+                if is_categorical:
+                    is_text = (pd.api.types.infer_dtype(values.cat.categories) == 'string'
+                               and not values.isna().any())
+                else:
+                    is_text = pd.api.types.infer_dtype(values, skipna=False) in ('string', 'empty')
+                column['kind'] = 'category'
+                column['dtype'] = '<i4'
+                column['encoding'] = 'text' if is_text else 'json'
+                column['categories'] = []
+                # A Categorical keeps its full category list (and order), so
+                # tables written in pieces decode to the same dtype
+                if is_categorical and is_text:
+                    column['categories'] = list(values.cat.categories)
+            columns.append(column)
+            open(os.path.join(table_dir, column['file']), 'wb').close()
+        
+        self.tables[name] = {'n_rows': 0, 'columns': columns}
+        self._category_index[name] = {
+            c['name']: {v: code for code, v in enumerate(c['categories'])}
+            for c in columns if c['kind'] == 'category'
+        }
+    
+    def _encode_categories(self, table: str, column: Dict, values: pd.Series) -> np.ndarray:
+        """
+        Stored codes of a chunk: codes local to the chunk (a Categorical's own
+        codes, or pd.factorize) remapped through the column's category index,
+        so only the chunk's distinct values are looked up in Python.
+        """
+        if column['encoding'] == 'json':
+            values = pd.Series([json.dumps(v, sort_keys=True, default=_json_default) for v in values])
+        if isinstance(values.dtype, pd.CategoricalDtype) and not values.isna().any():
+            local_codes = values.cat.codes.to_numpy()
+            uniques = values.cat.categories
+        else:
+            local_codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        
+        index = self._category_index[table][column['name']]
+        remap = np.empty(len(uniques), dtype='<i4')
+        for i, v in enumerate(uniques):
+            code = index.get(v)
+            if code is None:
+                code = len(column['categories'])
+                index[v] = code
+                column['categories'].append(v)
+            remap[i] = code
+        return remap[local_codes]
+    
+    def _drop_table(self, name: str) -> None:
+        if name not in self.tables:
+            return
+        table_dir = os.path.join(self.path, 'tables', name)
+        for column in self.tables.pop(name)['columns']:
+            os.remove(os.path.join(table_dir, column['file']))
+        self._category_index.pop(name, None)
+    
+    def _write_manifest(self) -> None:
+        manifest = {
+            'format': STORE_FORMAT_VERSION,
+            'values': self.values,
+            'tables': self.tables
+        }
+        manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        tmp_path = manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, default=_json_default)
+        os.replace(tmp_path, manifest_path)
+
+
+# =============================================================================
+# READER
+# =============================================================================
+
+class ResultsReader:
+    """
+    Reader for a results directory written by `ResultsWriter`.
+    
+    Parameters
+    ----------
+    path : str
+        Results directory
+    mmap : bool
+        Memory-map column files instead of reading them into memory
+    """
+    
+    def __init__(self, path: str, mmap: bool = True):
+        self.path = path
+        self.mmap = mmap
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+    
+    @property
+    def values(self) -> Dict:
+        return self.manifest['values']
+    
+    def table_names(self) -> List[str]:
+        return list(self.manifest['tables'])
+    
+    def column(self, table: str, name: str) -> np.ndarray:
+        """
+        Raw stored array of one column (category codes for string columns).
+        """
+        schema = self.manifest['tables'][table]
+        column = next(c for c in schema['columns'] if c['name'] == name)
+        return self._load_column(table, column, schema['n_rows'])
+    
+    def table(self, table: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load a table as a DataFrame, optionally restricted to some columns."""
+        schema = self.manifest['tables'][table]
+        data = {}
+        for column in schema['columns']:
+            if columns is not None and column['name'] not in columns:
+                continue
+            raw = self._load_column(table, column, schema['n_rows'])
+            if column['kind'] == 'category':
+                categories = column['categories']
+                if column['encoding'] == 'json':
+                    decoded = [json.loads(c) for c in categories]
+                    data[column['name']] = [decoded[code] for code in raw]
+                else:
+                    data[column['name']] = pd.Categorical.from_codes(raw, categories)
+            else:
+                data[column['name']] = raw
+        return pd.DataFrame(data, copy=False)
+    
+    def _load_column(self, table: str, column: Dict, n_rows: int) -> np.ndarray:
+        file_path = os.path.join(self.path, 'tables', table, column['file'])
+        dtype = np.dtype(column['dtype'])
+        if n_rows == 0:
+            return np.empty(0, dtype=dtype)
+        if self.mmap:
+            return np.memmap(file_path, dtype=dtype, mode='r', shape=(n_rows,))
+        return np.fromfile(file_path, dtype=dtype, count=n_rows)
+
+
+# =============================================================================
+# EXPERIMENT RESULTS
+# =============================================================================
+
+def write_results(results: Dict, path: str) -> str:
+    """
+    Write a `run_all_experiments` result dict to a results directory.
+    
+    DataFrames (and lists of record dicts) become columnar tables named by
+    their dotted key path, e.g. 'isps_backtest.data'. Everything else is kept
+    in the manifest.
+    
+    Parameters
+    ----------
+    results : Dict
+        Experiment results
+    path : str
+        Output directory
+    
+    Returns
+    -------
+    str
+        Path of the written manifest
+    """
+    with ResultsWriter(path) as writer:
+        def walk(prefix, value):
+            if isinstance(value, pd.DataFrame):
+                writer.write_table(prefix, value)
+            elif _is_records(value):
+                writer.write_table(prefix, pd.DataFrame(value))
+            elif isinstance(value, dict) and any(
+                isinstance(v, pd.DataFrame) or _is_records(v) for v in value.values()
+            ):
+                for key, sub in value.items():
+                    walk(f'{prefix}.{key}', sub)
+            else:
+                writer.values[prefix] = value
+        
+        for key, value in results.items():
+            walk(key, value)
+    
+    return os.path.join(path, MANIFEST_NAME)
+
+
+def read_results(path: str, mmap: bool = True) -> Dict:
+    """
+    Read a results directory back into a nested result dict.
+    
+    Tables are returned as DataFrames backed by memory-mapped columns when
+    `mmap` is True.
+    """
+    reader = ResultsReader(path, mmap=mmap)
+    results = {}
+    
+    def assign(dotted, value):
+        keys = dotted.split('.')
+        node = results
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = value
+    
+    for name, value in reader.values.items():
+        assign(name, value)
+    for name in reader.table_names():
+        assign(name, reader.table(name))
+    
+    return results
@@ -14,6 +14,9 @@ import json
 import warnings
 warnings.filterwarnings('ignore')
 
+from kernels import dfa_fluctuation
+from temporal_validation_framework import increment_variances
+
 print("="*70)
 print("TEMPORAL VALIDATION FRAMEWORK - EXPERIMENTAL VALIDATION")
 print("Author: Carl van der Linden | January 2026")
@@ -23,10 +26,12 @@ print("="*70)
 # FRACTAL DIMENSION - CORRECTED METHOD
 # =============================================================================
 
-def calculate_hurst_dfa(series: np.ndarray, min_box: int = 4, max_box: int = None) -> Tuple[float, float]:
+def calculate_hurst_dfa(series: np.ndarray, min_box: int = 4, max_box: int = None,
+                        backend: str = None) -> Tuple[float, float]:
     """
     Calculate Hurst exponent using Detrended Fluctuation Analysis (DFA).
     More robust than R/S for non-stationary series with trends.
+    The per-box detrending runs in `kernels.dfa_fluctuation` (NumPy or Numba).
     """
     n = len(series)
     if max_box is None:
@@ -50,23 +55,8 @@ def calculate_hurst_dfa(series: np.ndarray, min_box: int = 4, max_box: int = Non
         if n_boxes < 2:
             continue
         
-        # Calculate fluctuation for each box
-        f_n = []
-        for i in range(n_boxes):
-            start = i * box_size
-            end = start + box_size
-            box_data = y[start:end]
-            
-            # Linear detrend
-            x = np.arange(box_size)
-            slope, intercept = np.polyfit(x, box_data, 1)
-            trend = slope * x + intercept
-            
-            # RMS of residuals
-            rms = np.sqrt(np.mean((box_data - trend) ** 2))
-            f_n.append(rms)
-        
-        fluctuations.append((box_size, np.mean(f_n)))
+        # Mean RMS of linearly detrended residuals over all boxes
+        fluctuations.append((box_size, dfa_fluctuation(y, box_size, backend=backend)))
     
     if len(fluctuations) < 5:
         return None, None
@@ -87,10 +77,8 @@ def calculate_hurst_variance(series: np.ndarray, max_lag: int = 100) -> Tuple[fl
     n = len(series)
     lags = np.unique(np.logspace(0, np.log10(min(max_lag, n//4)), 30).astype(int))
     
-    variances = []
-    for lag in lags:
-        increments = series[lag:] - series[:-lag]
-        variances.append((lag, np.var(increments)))
+    # All lags in one pass, without building each increment array
+    variances = list(zip(lags, increment_variances(series, lags)))
     
     if len(variances) < 5:
         return None, None
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Global Sensitivity Analysis
+==========================================================
+
+Sobol (Saltelli sampling) and Morris (elementary effects) sensitivity of the
+TVI, ISPS and TDIS scores to their inputs.
+
+Sample matrices are generated and evaluated in fixed-size chunks through the
+vectorized scoring kernels (`tvi_score_array`, `isps_score_array`,
+`tdis_score_array`), so only the model outputs are kept in memory:
+(d + 2) floats per Sobol base sample and (d + 1) per Morris trajectory point.
+
+Usage
+-----
+    sobol = sobol_analysis('tvi', n_samples=2**18)
+    morris = morris_analysis('isps', n_trajectories=2000)
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from temporal_validation_framework import tvi_score_array, isps_score_array, tdis_score_array
+
+
+# =============================================================================
+# MODEL DEFINITIONS
+# =============================================================================
+
+# Ranges of the varied inputs, taken from the parameter docs of each formula
+TVI_SENSITIVITY_INPUTS = {
+    'resurfacing_rate': (0.0, 1.5),
+    'legacy_level': (1.0, 3.0),
+    'cross_platform': (1.0, 3.5),
+    'account_factor': (1.0, 2.5),
+}
+
+ISPS_SENSITIVITY_INPUTS = {
+    'leadership_continuity': (0.5, 2.0),
+    'ecosystem_factor': (0.5, 2.0),
+    'brand_awareness': (0.0, 1.0),
+    'market_position': (1.0, 10.0),
+    'crisis_survival_score': (0.0, 5.0),
+    'cross_asset': (1.0, 3.0),
+}
+
+TDIS_SENSITIVITY_INPUTS = {
+    'usage_score': (0.0, 1.0),
+    'cross_framework': (1.0, 3.0),
+    'citations': (1_000, 100_000),
+    'researcher_population': (10_000, 100_000),
+}
+
+# Inputs held fixed unless overridden (Charlie Bit My Finger, Apple, MNIST)
+TVI_FIXED_INPUTS = {
+    'views': 880_000_000,
+    'year': 2007,
+    'platform_users': 100_000_000,
+    'persistence_months': 180,
+}
+
+ISPS_FIXED_INPUTS = {
+    'brand_awareness': 0.95,
+    'market_position': 10,
+    'founding_year': 1976,
+    'crisis_survival_score': 4,
+}
+
+TDIS_FIXED_INPUTS = {
+    'citations': 45_000,
+    'usage_score': 0.95,
+    'release_year': 1998,
+    'researcher_population': 50_000,
+}
+
+MODELS = {
+    'tvi': (tvi_score_array, TVI_SENSITIVITY_INPUTS, TVI_FIXED_INPUTS),
+    'isps': (isps_score_array, ISPS_SENSITIVITY_INPUTS, ISPS_FIXED_INPUTS),
+    'tdis': (tdis_score_array, TDIS_SENSITIVITY_INPUTS, TDIS_FIXED_INPUTS),
+}
+
+
+def _resolve_model(model: Union[str, Callable], inputs: Optional[Dict],
+                   fixed: Optional[Dict]) -> Tuple[Callable, Dict, Dict]:
+    """Look up a named model, applying any overrides of inputs/fixed values."""
+    if callable(model):
+        if inputs is None:
+            raise ValueError("inputs must be given for a custom model")
+        return model, inputs, fixed or {}
+    if model not in MODELS:
+        raise ValueError(f"Unknown model '{model}', expected one of {list(MODELS)}")
+    
+    score_fn, default_inputs, default_fixed = MODELS[model]
+    inputs = dict(default_inputs if inputs is None else inputs)
+    fixed = {k: v for k, v in {**default_fixed, **(fixed or {})}.items() if k not in inputs}
+    return score_fn, inputs, fixed
+
+
+def _evaluate(score_fn: Callable, names, bounds: np.ndarray, fixed: Dict,
+              unit_points: np.ndarray) -> np.ndarray:
+    """Scale unit-cube points to the input bounds and score them."""
+    values = bounds[:, 0] + unit_points * (bounds[:, 1] - bounds[:, 0])
+    kwargs = dict(fixed)
+    kwargs.update({name: values[:, i] for i, name in enumerate(names)})
+    return np.asarray(score_fn(**kwargs), dtype=np.float64)
+
+
+def _confidence_interval(samples: np.ndarray, confidence: float) -> Tuple[np.ndarray, np.ndarray]:
+    alpha = (1 - confidence) / 2
+    return np.quantile(samples, alpha, axis=0), np.quantile(samples, 1 - alpha, axis=0)
+
+
+# =============================================================================
+# SOBOL INDICES
+# =============================================================================
+
+def _sobol_indices(fA: np.ndarray, fB: np.ndarray, fAB: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """First-order (Saltelli 2010) and total-order (Jansen) estimators."""
+    variance = np.var(np.concatenate([fA, fB]))
+    if variance == 0:
+        return np.zeros(fAB.shape[1]), np.zeros(fAB.shape[1])
+    first = np.mean(fB[:, None] * (fAB - fA[:, None]), axis=0) / variance
+    total = 0.5 * np.mean((fA[:, None] - fAB) ** 2, axis=0) / variance
+    return first, total
+
+
+def sobol_analysis(
+    model: Union[str, Callable] = 'tvi',
+    inputs: Optional[Dict[str, Tuple[float, float]]] = None,
+    fixed: Optional[Dict] = None,
+    n_samples: int = 2 ** 14,
+    chunk_size: int = 2 ** 16,
+    n_bootstrap: int = 100,
+    confidence: float = 0.95,
+    sampler: str = 'sobol',
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Sobol first- and total-order sensitivity indices.
+    
+    Uses Saltelli's scheme: two base matrices A and B plus, for each input
+    i, A with column i taken from B. That is n_samples × (d + 2) model
+    evaluations, done chunk_size rows at a time.
+    
+    Parameters
+    ----------
+    model : str or callable
+        'tvi', 'isps', 'tdis' or a vectorized function of keyword arrays
+    inputs : Dict[str, Tuple[float, float]], optional
+        Varied inputs and their (low, high) uniform ranges
+    fixed : Dict, optional
+        Values for the remaining model arguments
+    n_samples : int
+        Base sample size N (a power of two for the Sobol sampler)
+    chunk_size : int
+        Base rows generated and evaluated per chunk
+    n_bootstrap : int
+        Bootstrap resamples for the confidence intervals (0 to skip)
+    confidence : float
+        Confidence level of the intervals
+    sampler : str
+        'sobol' (scrambled quasi-random) or 'random'
+    seed : int
+        Random seed
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per input: S1, S1_low, S1_high, ST, ST_low, ST_high
+    """
+    score_fn, inputs, fixed = _resolve_model(model, inputs, fixed)
+    names = list(inputs)
+    bounds = np.array([inputs[name] for name in names], dtype=np.float64)
+    d = len(names)
+    
+    if sampler == 'sobol':
+        engine = qmc.Sobol(d=2 * d, scramble=True, seed=seed)
+        draw = engine.random
+    elif sampler == 'random':
+        rng = np.random.RandomState(seed)
+        draw = lambda n: rng.random_sample((n, 2 * d))
+    else:
+        raise ValueError(f"Unknown sampler '{sampler}', expected 'sobol' or 'random'")
+    
+    fA = np.empty(n_samples)
+    fB = np.empty(n_samples)
+    fAB = np.empty((n_samples, d))
+    
+    for start in range(0, n_samples, chunk_size):
+        stop = min(start + chunk_size, n_samples)
+        points = draw(stop - start)
+        A, B = points[:, :d], points[:, d:]
+        fA[start:stop] = _evaluate(score_fn, names, bounds, fixed, A)
+        fB[start:stop] = _evaluate(score_fn, names, bounds, fixed, B)
+        for i in range(d):
+            AB = A.copy()
+            AB[:, i] = B[:, i]
+            fAB[start:stop, i] = _evaluate(score_fn, names, bounds, fixed, AB)
+    
+    first, total = _sobol_indices(fA, fB, fAB)
+    result = pd.DataFrame({'Input': names, 'S1': first, 'ST': total})
+    
+    if n_bootstrap > 0:
+        rng = np.random.RandomState(seed)
+        boot_first = np.empty((n_bootstrap, d))
+        boot_total = np.empty((n_bootstrap, d))
+        for b in range(n_bootstrap):
+            idx = rng.randint(0, n_samples, n_samples)
+            boot_first[b], boot_total[b] = _sobol_indices(fA[idx], fB[idx], fAB[idx])
+        result['S1_low'], result['S1_high'] = _confidence_interval(boot_first, confidence)
+        result['ST_low'], result['ST_high'] = _confidence_interval(boot_total, confidence)
+        result = result[['Input', 'S1', 'S1_low', 'S1_high', 'ST', 'ST_low', 'ST_high']]
+    
+    result.attrs['n_evaluations'] = n_samples * (d + 2)
+    return result
+
+
+# =============================================================================
+# MORRIS ELEMENTARY EFFECTS
+# =============================================================================
+
+def morris_trajectories(n_trajectories: int, d: int, num_levels: int = 4,
+                        seed: int = 42) -> np.ndarray:
+    """
+    Random one-at-a-time Morris trajectories on a num_levels grid.
+    
+    Returns
+    -------
+    np.ndarray
+        Shape (n_trajectories, d + 1, d); consecutive points differ in one
+        input by +Δ, with Δ = num_levels / (2 (num_levels - 1))
+    """
+    rng = np.random.RandomState(seed)
+    delta = num_levels / (2 * (num_levels - 1))
+    
+    # Start points on the grid low enough that +Δ stays inside [0, 1]
+    grid = np.arange(num_levels) / (num_levels - 1)
+    grid = grid[grid <= 1 - delta + 1e-12]
+    start = grid[rng.randint(0, len(grid), (n_trajectories, d))]
+    
+    # Random order in which inputs are stepped
+    order = np.argsort(rng.random_sample((n_trajectories, d)), axis=1)
+    steps = np.zeros((n_trajectories, d + 1, d))
+    rows = np.arange(n_trajectories)
+    for k in range(d):
+        steps[:, k + 1] = steps[:, k]
+        steps[rows, k + 1, order[:, k]] = delta
+    
+    return start[:, None, :] + steps
+
+
+def morris_analysis(
+    model: Union[str, Callable] = 'tvi',
+    inputs: Optional[Dict[str, Tuple[float, float]]] = None,
+    fixed: Optional[Dict] = None,
+    n_trajectories: int = 1000,
+    num_levels: int = 4,
+    chunk_size: int = 10_000,
+    n_bootstrap: int = 100,
+    confidence: float = 0.95,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Morris screening: mean, mean absolute and standard deviation of the
+    elementary effects of each input.
+    
+    Parameters
+    ----------
+    model, inputs, fixed :
+        As for `sobol_analysis`
+    n_trajectories : int
+        Number of one-at-a-time trajectories (d + 1 evaluations each)
+    num_levels : int
+        Grid levels per input
+    chunk_size : int
+        Trajectories generated and evaluated per chunk
+    n_bootstrap : int
+        Bootstrap resamples for the mu_star interval (0 to skip)
+    confidence : float
+        Confidence level of the interval
+    seed : int
+        Random seed
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per input: mu, mu_star, mu_star_low, mu_star_high, sigma
+    """
+    score_fn, inputs, fixed = _resolve_model(model, inputs, fixed)
+    names = list(inputs)
+    bounds = np.array([inputs[name] for name in names], dtype=np.float64)
+    d = len(names)
+    delta = num_levels / (2 * (num_levels - 1))
+    
+    effects = np.empty((n_trajectories, d))
+    for chunk_index, start in enumerate(range(0, n_trajectories, chunk_size)):
+        stop = min(start + chunk_size, n_trajectories)
+        trajectories = morris_trajectories(stop - start, d, num_levels, seed=seed + chunk_index)
+        outputs = _evaluate(score_fn, names, bounds, fixed,
+                            trajectories.reshape(-1, d)).reshape(stop - start, d + 1)
+        
+        # Input changed between consecutive points, and its effect
+        changed = np.argmax(np.diff(trajectories, axis=1) > 0, axis=2)
+        ee = np.diff(outputs, axis=1) / delta
+        rows = np.arange(stop - start)[:, None]
+        effects[start:stop][rows, changed] = ee
+    
+    result = pd.DataFrame({
+        'Input': names,
+        'mu': effects.mean(axis=0),
+        'mu_star': np.abs(effects).mean(axis=0),
+        'sigma': effects.std(axis=0, ddof=1) if n_trajectories > 1 else np.zeros(d)
+    })
+    
+    if n_bootstrap > 0:
+        rng = np.random.RandomState(seed)
+        boot = np.empty((n_bootstrap, d))
+        for b in range(n_bootstrap):
+            idx = rng.randint(0, n_trajectories, n_trajectories)
+            boot[b] = np.abs(effects[idx]).mean(axis=0)
+        result['mu_star_low'], result['mu_star_high'] = _confidence_interval(boot, confidence)
+        result = result[['Input', 'mu', 'mu_star', 'mu_star_low', 'mu_star_high', 'sigma']]
+    
+    result.attrs['n_evaluations'] = n_trajectories * (d + 1)
+    return result
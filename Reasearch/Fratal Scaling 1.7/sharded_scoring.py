@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Sharded Batch Scoring
+=====================================================
+
+Coordinator/worker mode for rescoring a catalog across several processes or
+machines that share a job directory:
+
+    <root>/job.json            kind (tvi/isps/tdis), shard count, queue spec
+    <root>/shards/<id>/        input rows of one shard (results store)
+    <root>/output/<id>/        committed scores of one shard (results store)
+
+The coordinator splits the input into shards and publishes their ids to a
+queue. Workers lease a shard, score it with the matching `calculate_*_batch`
+function and commit the output by renaming a private temporary directory to
+output/<id>. The rename succeeds for exactly one worker, so a shard that was
+processed twice (a slow worker whose lease expired) is still committed once.
+
+Leases are renewed by a heartbeat while a shard is scored. A lease that is
+not renewed (crashed or stalled worker) is returned to the queue by the next
+worker or coordinator poll; shards that fail `max_attempts` times are parked
+as failed with their last error.
+
+Queue backends:
+- FileQueue  : directories on the shared filesystem, claims by atomic rename
+- RedisQueue : Lua-scripted lists/sorted sets on any server speaking the
+               Redis protocol (redis-server, Valkey, KeyDB, fakeredis);
+               requires the `redis` client
+
+Lease deadlines use wall-clock time, so nodes need synchronized clocks.
+
+Usage
+-----
+    publish_job(catalog, 'rescore', kind='tvi', shard_size=100_000)
+    run_local_workers('rescore', n_workers=4)       # or, on each node:
+    python sharded_scoring.py worker rescore
+    scores = collect_results('rescore')
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import inspect
+import json
+import os
+import shutil
+import socket
+import sys
+import threading
+import time
+import uuid
+
+from temporal_validation_framework import (calculate_tvi_batch, calculate_isps_batch,
+                                           calculate_tdis_batch)
+from results_store import ResultsReader, ResultsWriter
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+SCORERS = {
+    'tvi': calculate_tvi_batch,
+    'isps': calculate_isps_batch,
+    'tdis': calculate_tdis_batch,
+}
+
+JOB_FILE = 'job.json'
+
+
+@dataclass
+class Lease:
+    """A worker's claim on one shard."""
+    shard: str
+    token: str
+    attempts: int
+
+
+@dataclass
+class WorkerStats:
+    """What one worker did before it stopped."""
+    worker_id: str
+    committed: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    rows: int = 0
+    elapsed: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+# =============================================================================
+# QUEUE BACKENDS
+# =============================================================================
+
+class FileQueue:
+    """
+    Shard queue kept as files in pending/, leased/, done/ and failed/.
+    
+    A claim renames pending/<id> to leased/<id>.<token>; only one rename of
+    a file can succeed, so each shard has at most one live lease. The lease
+    deadline is the leased file's mtime plus `lease_seconds`, and renewing
+    a lease touches the file.
+    """
+    
+    DIRS = ('pending', 'leased', 'releasing', 'done', 'failed')
+    
+    def __init__(self, path: str, lease_seconds: float = 60.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for name in self.DIRS:
+            os.makedirs(os.path.join(path, name), exist_ok=True)
+    
+    def _dir(self, name: str) -> str:
+        return os.path.join(self.path, name)
+    
+    def _write(self, directory: str, shard: str, record: Dict) -> None:
+        tmp = os.path.join(self.path, f'.{shard}.{uuid.uuid4().hex}')
+        with open(tmp, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp, os.path.join(self._dir(directory), shard))
+    
+    def publish(self, shards: List[str]) -> None:
+        for shard in shards:
+            self._write('pending', shard, {'shard': shard, 'attempts': 0})
+    
+    def claim(self) -> Optional[Lease]:
+        for shard in sorted(os.listdir(self._dir('pending'))):
+            source = os.path.join(self._dir('pending'), shard)
+            token = uuid.uuid4().hex
+            target = os.path.join(self._dir('leased'), f'{shard}.{token}')
+            try:
+                # Touch first so the lease starts now, not at publish time
+                os.utime(source)
+                os.rename(source, target)
+            except FileNotFoundError:
+                continue
+            with open(target) as f:
+                attempts = json.load(f)['attempts']
+            return Lease(shard, token, attempts)
+        return None
+    
+    def renew(self, lease: Lease) -> bool:
+        try:
+            os.utime(os.path.join(self._dir('leased'), f'{lease.shard}.{lease.token}'))
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def complete(self, lease: Lease) -> bool:
+        try:
+            os.rename(os.path.join(self._dir('leased'), f'{lease.shard}.{lease.token}'),
+                      os.path.join(self._dir('done'), lease.shard))
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def release(self, lease: Lease, error: str) -> bool:
+        """Give a shard back (or park it as failed after max_attempts)."""
+        name = f'{lease.shard}.{lease.token}'
+        leased = os.path.join(self._dir('leased'), name)
+        releasing = os.path.join(self._dir('releasing'), name)
+        try:
+            # Touch first: a releasing/ file older than lease_seconds is stranded
+            os.utime(leased)
+            os.rename(leased, releasing)
+        except FileNotFoundError:
+            return False
+        self._requeue(releasing, lease.shard, error)
+        return True
+    
+    def _requeue(self, releasing: str, shard: str, error: str) -> None:
+        with open(releasing) as f:
+            record = json.load(f)
+        record['attempts'] += 1
+        record['error'] = error
+        self._write('failed' if record['attempts'] >= self.max_attempts else 'pending',
+                    shard, record)
+        os.unlink(releasing)
+    
+    def _queued(self, shard: str) -> bool:
+        """True if the shard is pending, leased, done or failed."""
+        return (any(os.path.exists(os.path.join(self._dir(name), shard))
+                    for name in ('pending', 'done', 'failed')) or
+                any(name.rsplit('.', 1)[0] == shard for name in os.listdir(self._dir('leased'))))
+    
+    def requeue_expired(self) -> int:
+        """
+        Release every lease older than lease_seconds; returns how many.
+        
+        Also finishes releases stranded in releasing/ by a worker that died
+        between moving its lease there and requeueing the shard.
+        """
+        now = time.time()
+        released = 0
+        for name in os.listdir(self._dir('leased')):
+            try:
+                age = now - os.stat(os.path.join(self._dir('leased'), name)).st_mtime
+            except FileNotFoundError:
+                continue
+            if age > self.lease_seconds:
+                shard, token = name.rsplit('.', 1)
+                released += self.release(Lease(shard, token, 0), 'lease expired')
+        
+        for name in os.listdir(self._dir('releasing')):
+            stranded = os.path.join(self._dir('releasing'), name)
+            try:
+                age = now - os.stat(stranded).st_mtime
+            except FileNotFoundError:
+                continue
+            if age <= self.lease_seconds:
+                continue
+            # Take the file over under a new token so only one sweeper finishes it
+            shard = name.rsplit('.', 1)[0]
+            claimed = os.path.join(self._dir('releasing'), f'{shard}.{uuid.uuid4().hex}')
+            try:
+                os.rename(stranded, claimed)
+            except FileNotFoundError:
+                continue
+            if self._queued(shard):
+                # Died after requeueing, before removing the releasing/ file
+                os.unlink(claimed)
+            else:
+                self._requeue(claimed, shard, 'release interrupted')
+                released += 1
+        return released
+    
+    def status(self) -> Dict[str, int]:
+        return {name: len(os.listdir(self._dir(name)))
+                for name in ('pending', 'leased', 'releasing', 'done', 'failed')}
+    
+    def spec(self) -> Dict:
+        return {'backend': 'file', 'lease_seconds': self.lease_seconds,
+                'max_attempts': self.max_attempts}
+
+
+_REDIS_CLAIM = """
+local shard = redis.call('LPOP', KEYS[1])
+if not shard then return nil end
+redis.call('ZADD', KEYS[2], ARGV[2], shard .. '|' .. ARGV[1])
+return {shard, redis.call('HGET', KEYS[3], shard) or '0'}
+"""
+
+_REDIS_RENEW = """
+if redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+_REDIS_COMPLETE = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    redis.call('SADD', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+_REDIS_RELEASE = """
+if redis.call('ZREM', KEYS[1], ARGV[1]) == 1 then
+    local attempts = redis.call('HINCRBY', KEYS[3], ARGV[2], 1)
+    if attempts >= tonumber(ARGV[3]) then
+        redis.call('HSET', KEYS[4], ARGV[2], ARGV[4])
+    else
+        redis.call('RPUSH', KEYS[2], ARGV[2])
+    end
+    return 1
+end
+return 0
+"""
+
+
+class RedisQueue:
+    """
+    Shard queue on a Redis-protocol server.
+    
+    Keys: <name>:pending (list), <name>:leases (sorted set of
+    'shard|token' by deadline), <name>:attempts and <name>:failed (hashes),
+    <name>:done (set). Every state change is one Lua script, so claims and
+    releases are atomic across workers.
+    """
+    
+    def __init__(self, url: str = 'redis://localhost:6379/0', name: str = 'tvi-shards',
+                 lease_seconds: float = 60.0, max_attempts: int = 3):
+        if redis is None:
+            raise ImportError("RedisQueue requires the redis client (pip install redis)")
+        self.url = url
+        self.name = name
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._claim = self.client.register_script(_REDIS_CLAIM)
+        self._renew = self.client.register_script(_REDIS_RENEW)
+        self._complete = self.client.register_script(_REDIS_COMPLETE)
+        self._release = self.client.register_script(_REDIS_RELEASE)
+    
+    def _key(self, suffix: str) -> str:
+        return f'{self.name}:{suffix}'
+    
+    def publish(self, shards: List[str]) -> None:
+        with self.client.pipeline() as pipe:
+            pipe.delete(*(self._key(k) for k in ('pending', 'leases', 'attempts', 'done', 'failed')))
+            pipe.rpush(self._key('pending'), *shards)
+            pipe.execute()
+    
+    def claim(self) -> Optional[Lease]:
+        token = uuid.uuid4().hex
+        claimed = self._claim(keys=[self._key('pending'), self._key('leases'), self._key('attempts')],
+                              args=[token, time.time() + self.lease_seconds])
+        if claimed is None:
+            return None
+        return Lease(claimed[0], token, int(claimed[1]))
+    
+    def renew(self, lease: Lease) -> bool:
+        return bool(self._renew(keys=[self._key('leases')],
+                                args=[f'{lease.shard}|{lease.token}', time.time() + self.lease_seconds]))
+    
+    def complete(self, lease: Lease) -> bool:
+        return bool(self._complete(keys=[self._key('leases'), self._key('done')],
+                                   args=[f'{lease.shard}|{lease.token}', lease.shard]))
+    
+    def release(self, lease: Lease, error: str) -> bool:
+        return bool(self._release(
+            keys=[self._key('leases'), self._key('pending'), self._key('attempts'), self._key('failed')],
+            args=[f'{lease.shard}|{lease.token}', lease.shard, self.max_attempts, error]))
+    
+    def requeue_expired(self) -> int:
+        released = 0
+        for member in self.client.zrangebyscore(self._key('leases'), '-inf', time.time()):
+            shard, token = member.rsplit('|', 1)
+            released += self.release(Lease(shard, token, 0), 'lease expired')
+        return released
+    
+    def status(self) -> Dict[str, int]:
+        return {
+            'pending': self.client.llen(self._key('pending')),
+            'leased': self.client.zcard(self._key('leases')),
+            'releasing': 0,     # releases are atomic scripts
+            'done': self.client.scard(self._key('done')),
+            'failed': self.client.hlen(self._key('failed')),
+        }
+    
+    def spec(self) -> Dict:
+        return {'backend': 'redis', 'url': self.url, 'name': self.name,
+                'lease_seconds': self.lease_seconds, 'max_attempts': self.max_attempts}
+
+
+def open_queue(root: str, spec: Optional[Dict] = None):
+    """Queue described by a job's spec (read from job.json if not given)."""
+    if spec is None:
+        spec = load_job(root)['queue']
+    options = {k: v for k, v in spec.items() if k != 'backend'}
+    if spec['backend'] == 'file':
+        return FileQueue(os.path.join(root, 'queue'), **options)
+    if spec['backend'] == 'redis':
+        return RedisQueue(**options)
+    raise ValueError(f"unknown queue backend {spec['backend']!r}")
+
+
+# =============================================================================
+# COORDINATOR
+# =============================================================================
+
+def load_job(root: str) -> Dict:
+    with open(os.path.join(root, JOB_FILE)) as f:
+        return json.load(f)
+
+
+def publish_job(frame: pd.DataFrame, root: str, kind: str = 'tvi', shard_size: int = 100_000,
+                queue: Optional[Dict] = None, current_year: int = 2026) -> int:
+    """
+    Split an input table into shards and publish them.
+    
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Inputs, one column per argument of the `calculate_<kind>_batch`
+        function (other columns are carried along but not scored)
+    root : str
+        Job directory shared by all workers (created; must not hold a job)
+    kind : str
+        'tvi', 'isps' or 'tdis'
+    shard_size : int
+        Rows per shard
+    queue : Dict, optional
+        Queue spec, e.g. {'backend': 'redis', 'url': ..., 'lease_seconds': 30};
+        default is a FileQueue in <root>/queue
+    current_year : int
+        Scoring year
+    
+    Returns
+    -------
+    int
+        Number of shards
+    """
+    if kind not in SCORERS:
+        raise ValueError(f"kind must be one of {sorted(SCORERS)}")
+    if os.path.exists(os.path.join(root, JOB_FILE)):
+        raise FileExistsError(f"{root} already holds a job")
+    os.makedirs(os.path.join(root, 'output'), exist_ok=True)
+    
+    shards = []
+    for k, start in enumerate(range(0, len(frame), shard_size)):
+        shard = f'{k:06d}'
+        part = frame.iloc[start:start + shard_size].reset_index(drop=True)
+        part.insert(0, 'row', np.arange(start, start + len(part), dtype=np.int64))
+        with ResultsWriter(os.path.join(root, 'shards', shard)) as writer:
+            writer.write_table('input', part)
+        shards.append(shard)
+    
+    spec = queue or FileQueue(os.path.join(root, 'queue')).spec()
+    job = {'kind': kind, 'current_year': current_year, 'n_rows': len(frame),
+           'shards': shards, 'queue': spec}
+    with open(os.path.join(root, JOB_FILE), 'w') as f:
+        json.dump(job, f, indent=2)
+    open_queue(root, spec).publish(shards)
+    return len(shards)
+
+
+def job_status(root: str) -> Dict[str, int]:
+    """Queue counts plus the number of committed output shards."""
+    queue = open_queue(root)
+    queue.requeue_expired()
+    status = queue.status()
+    status['committed'] = sum(not name.startswith('.') for name in os.listdir(os.path.join(root, 'output')))
+    status['total'] = len(load_job(root)['shards'])
+    return status
+
+
+def wait_for_job(root: str, timeout: Optional[float] = None, poll_interval: float = 1.0) -> Dict[str, int]:
+    """Block until every shard is committed or failed (or the timeout passes)."""
+    started = time.time()
+    while True:
+        status = job_status(root)
+        if status['committed'] + status['failed'] >= status['total']:
+            return status
+        if timeout is not None and time.time() - started > timeout:
+            return status
+        time.sleep(poll_interval)
+
+
+def collect_results(root: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Scores of all committed shards in input order.
+    
+    Raises if any shard is not committed yet.
+    """
+    job = load_job(root)
+    frames = []
+    for shard in job['shards']:
+        path = os.path.join(root, 'output', shard)
+        if not os.path.exists(path):
+            raise RuntimeError(f"shard {shard} has not been committed")
+        frames.append(ResultsReader(path, mmap=False).table('scores', columns))
+    result = pd.concat(frames, ignore_index=True)
+    
+    # Shards whose category lists still differ concatenate to plain strings
+    for col in frames[0].columns:
+        if (isinstance(frames[0][col].dtype, pd.CategoricalDtype) and
+                not isinstance(result[col].dtype, pd.CategoricalDtype)):
+            result[col] = union_categoricals([frame[col] for frame in frames])
+    return result
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+def score_shard(kind: str, frame: pd.DataFrame, current_year: int = 2026) -> pd.DataFrame:
+    """Score one shard's inputs; output starts with the global 'row' id."""
+    scorer = SCORERS[kind]
+    parameters = inspect.signature(scorer).parameters
+    inputs = {c: frame[c].to_numpy() for c in frame.columns if c in parameters and c != 'current_year'}
+    scores = scorer(**inputs, current_year=current_year)
+    scores.insert(0, 'row', frame['row'].to_numpy())
+    return scores
+
+
+def commit_output(root: str, lease: Lease, scores: pd.DataFrame) -> bool:
+    """
+    Write a shard's scores and publish them atomically.
+    
+    Returns False if another worker already committed this shard.
+    """
+    final = os.path.join(root, 'output', lease.shard)
+    tmp = os.path.join(root, 'output', f'.{lease.shard}.{lease.token}')
+    with ResultsWriter(tmp) as writer:
+        writer.write_table('scores', scores)
+    try:
+        os.rename(tmp, final)
+        return True
+    except OSError:
+        if not os.path.exists(final):
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+        return False
+
+
+class _Heartbeat:
+    """Renews a lease in the background until stopped."""
+    
+    def __init__(self, queue, lease: Lease, interval: float):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(queue, lease, interval), daemon=True)
+        self._thread.start()
+    
+    def _run(self, queue, lease, interval):
+        while not self._stop.wait(interval):
+            if not queue.renew(lease):
+                return
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(root: str, worker_id: Optional[str] = None, poll_interval: float = 0.5,
+               max_idle: Optional[float] = None, max_shards: Optional[int] = None) -> WorkerStats:
+    """
+    Lease, score and commit shards until the job is finished.
+    
+    Parameters
+    ----------
+    root : str
+        Job directory
+    worker_id : str, optional
+        Name in logs and stats (default: host:pid)
+    poll_interval : float
+        Seconds between polls while other workers hold the remaining shards
+    max_idle : float, optional
+        Stop after this many seconds without a claim (default: run until
+        no shard is pending, leased or being released)
+    max_shards : int, optional
+        Stop after attempting this many shards
+    
+    Returns
+    -------
+    WorkerStats
+    """
+    job = load_job(root)
+    queue = open_queue(root, job['queue'])
+    stats = WorkerStats(worker_id or f'{socket.gethostname()}:{os.getpid()}')
+    started = time.time()
+    idle_since = time.time()
+    attempted = 0
+    
+    while max_shards is None or attempted < max_shards:
+        queue.requeue_expired()
+        lease = queue.claim()
+        if lease is None:
+            status = queue.status()
+            # A stranded release still returns its shard to pending
+            if status['pending'] == 0 and status['leased'] == 0 and status['releasing'] == 0:
+                break
+            if max_idle is not None and time.time() - idle_since > max_idle:
+                break
+            time.sleep(poll_interval)
+            continue
+        
+        attempted += 1
+        heartbeat = _Heartbeat(queue, lease, queue.lease_seconds / 3)
+        try:
+            frame = ResultsReader(os.path.join(root, 'shards', lease.shard), mmap=False).table('input')
+            scores = score_shard(job['kind'], frame, job['current_year'])
+            if commit_output(root, lease, scores):
+                stats.committed += 1
+                stats.rows += len(scores)
+            else:
+                stats.duplicates += 1
+            heartbeat.stop()
+            queue.complete(lease)
+        except Exception as exc:
+            heartbeat.stop()
+            stats.failed += 1
+            stats.errors.append(f'{lease.shard}: {exc!r}')
+            queue.release(lease, repr(exc))
+        idle_since = time.time()
+    
+    stats.elapsed = time.time() - started
+    return stats
+
+
+def run_local_workers(root: str, n_workers: int = 2, **worker_kwargs) -> List[WorkerStats]:
+    """Run `n_workers` worker processes on this machine until the job is done."""
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(run_worker, root, worker_id=f'{socket.gethostname()}:local-{i}',
+                               **worker_kwargs)
+                   for i in range(n_workers)]
+        return [f.result() for f in futures]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 3 and sys.argv[1] == 'worker':
+        print(run_worker(sys.argv[2]))
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'status':
+        print(job_status(sys.argv[2]))
+    else:
+        print("usage: python sharded_scoring.py worker|status <job_dir>")
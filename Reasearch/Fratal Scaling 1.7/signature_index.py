@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Temporal Validation Framework - Attention Signature Index
+=========================================================
+
+Find the items whose attention dynamics look most like a given item's.
+
+Signatures (`extract_signatures`) are compact float32 vectors of:
+- the variance-of-increments Hurst exponent and fractal dimension
+- MFDFA h(q) at q = ±2 and the shape of the fluctuation profile F₂(s)
+- burst features (resurfacing rate, persistence, burst days)
+- TVI components when catalog metadata is given
+
+`SignatureIndex` is an inverted-file (IVF) approximate nearest-neighbour
+index: a k-means coarse quantizer splits the standardized vectors into
+lists stored contiguously, and a query scans only the n_probe lists
+nearest to it. New items go to a small buffer that is scanned exactly and
+merged into the lists once it grows. Saved indexes are a directory of
+.npy files loaded as memmaps.
+
+Usage
+-----
+    signatures = extract_signatures(series_batch, catalog)
+    index = SignatureIndex.build(signatures.to_numpy(), ids=catalog.index)
+    index.save('signatures.idx')
+    index = SignatureIndex.load('signatures.idx')
+    ids, distances = index.query(signatures.iloc[0].to_numpy(), k=100)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple
+import json
+import os
+
+from temporal_validation_framework import (calculate_hurst_variance, calculate_mfdfa,
+                                           calculate_tvi_batch)
+from burst_features import extract_burst_features
+
+
+INDEX_FORMAT_VERSION = 1
+INDEX_ARRAYS = ('centroids', 'mean', 'scale', 'vectors', 'ids', 'offsets', 'sq_norms')
+
+SIGNATURE_SCALES = (16, 32, 64, 128, 256)
+
+
+# =============================================================================
+# SIGNATURE EXTRACTION
+# =============================================================================
+
+def extract_signatures(series: np.ndarray, catalog: Optional[pd.DataFrame] = None,
+                       scales: Sequence[int] = SIGNATURE_SCALES,
+                       chunk_size: int = 2048) -> pd.DataFrame:
+    """
+    Attention signature of each series in a batch.
+    
+    Parameters
+    ----------
+    series : np.ndarray
+        Batch of equal-length daily series, shape (n_items, n); may be a memmap
+    catalog : pd.DataFrame, optional
+        'views', 'year', 'platform_users' per item (as for
+        `calculate_tvi_batch`); adds TVI component features
+    scales : sequence of int
+        Box sizes of the fluctuation profile
+    chunk_size : int
+        Series processed per block
+    
+    Returns
+    -------
+    pd.DataFrame
+        float32 features, one row per item
+    """
+    frames = []
+    for start in range(0, len(series), chunk_size):
+        block = np.asarray(series[start:start + chunk_size], dtype=np.float64)
+        
+        H, _ = calculate_hurst_variance(np.atleast_2d(block))
+        spectrum = calculate_mfdfa(block, q=[-2.0, 2.0], scales=scales)
+        log_f2 = np.log10(spectrum.fluctuations[:, 1, :])
+        bursts = extract_burst_features(block)
+        
+        features = {
+            'hurst_variance': H,
+            'fractal_dimension': 2 - H,
+            'h_q-2': spectrum.h[:, 0],
+            'h_q2': spectrum.h[:, 1],
+            'fluct_level': log_f2.mean(axis=1),
+        }
+        for i, s in enumerate(spectrum.scales):
+            features[f'fluct_shape_{s}'] = log_f2[:, i] - features['fluct_level']
+        features['resurfacing_rate'] = bursts['resurfacing_rate'].to_numpy()
+        features['log_persistence'] = np.log1p(bursts['persistence_months'].to_numpy())
+        features['log_burst_days'] = np.log1p(bursts['burst_days'].to_numpy())
+        
+        if catalog is not None:
+            items = catalog.iloc[start:start + len(block)]
+            tvi = calculate_tvi_batch(items['views'].to_numpy(), items['year'].to_numpy(),
+                                      items['platform_users'].to_numpy(),
+                                      bursts['persistence_months'].to_numpy(),
+                                      bursts['resurfacing_rate'].to_numpy())
+            features['log_saturation'] = np.log10(tvi['saturation'].to_numpy())
+            features['log_tvs'] = np.log10(tvi['tvs'].to_numpy() + 1)
+            features['src'] = tvi['src'].to_numpy()
+        
+        frames.append(pd.DataFrame(features).astype(np.float32))
+    
+    return pd.concat(frames, ignore_index=True)
+
+
+# =============================================================================
+# IVF INDEX
+# =============================================================================
+
+def _as_ids(ids: Sequence) -> np.ndarray:
+    """Item ids as int64, or as fixed-width strings for non-integer ids."""
+    ids = np.asarray(ids)
+    if ids.dtype.kind in 'iub' or len(ids) == 0:
+        return ids.astype(np.int64)
+    return ids.astype(str)
+
+
+def _squared_distances(x: np.ndarray, centroids: np.ndarray, centroid_sq: np.ndarray) -> np.ndarray:
+    """||x - c||² up to the per-row constant ||x||²."""
+    return centroid_sq[None, :] - 2 * (x @ centroids.T)
+
+
+def _assign(x: np.ndarray, centroids: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+    """Nearest centroid of each row."""
+    centroid_sq = np.sum(centroids ** 2, axis=1)
+    labels = np.empty(len(x), dtype=np.int32)
+    for start in range(0, len(x), chunk_size):
+        block = x[start:start + chunk_size]
+        labels[start:start + len(block)] = np.argmin(_squared_distances(block, centroids, centroid_sq), axis=1)
+    return labels
+
+
+def _kmeans(x: np.ndarray, n_clusters: int, n_iter: int, rng: np.random.RandomState) -> np.ndarray:
+    """Lloyd's k-means from a random sample of rows."""
+    centroids = x[rng.choice(len(x), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        labels = _assign(x, centroids)
+        counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.zeros_like(centroids, dtype=np.float64)
+        np.add.at(sums, labels, x)
+        filled = counts > 0
+        centroids[filled] = (sums[filled] / counts[filled, None]).astype(np.float32)
+        # Reseed empty clusters on random points
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = x[rng.choice(len(x), len(empty), replace=False)]
+    return centroids
+
+
+class SignatureIndex:
+    """
+    Inverted-file k-NN index over standardized float32 signatures.
+    
+    Parameters
+    ----------
+    centroids : np.ndarray
+        Coarse quantizer, shape (n_lists, dim), in standardized units
+    mean, scale : np.ndarray
+        Standardization applied to every inserted or queried vector
+    vectors, ids, offsets : np.ndarray, optional
+        Stored vectors sorted by list, their ids (int64 or str), and list boundaries
+        (list c is rows offsets[c]:offsets[c + 1])
+    sq_norms : np.ndarray, optional
+        Squared norms of the stored vectors (computed if not given)
+    buffer_limit : int
+        Buffered inserts merged into the lists when exceeded
+    """
+    
+    def __init__(self, centroids: np.ndarray, mean: np.ndarray, scale: np.ndarray,
+                 vectors: Optional[np.ndarray] = None, ids: Optional[np.ndarray] = None,
+                 offsets: Optional[np.ndarray] = None, sq_norms: Optional[np.ndarray] = None,
+                 buffer_limit: int = 20_000):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.centroid_sq = np.sum(self.centroids ** 2, axis=1)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.dim = self.centroids.shape[1]
+        self.buffer_limit = buffer_limit
+        
+        n_lists = len(self.centroids)
+        self.vectors = vectors if vectors is not None else np.empty((0, self.dim), dtype=np.float32)
+        self.ids = ids if ids is not None else np.empty(0, dtype=np.int64)
+        self.offsets = offsets if offsets is not None else np.zeros(n_lists + 1, dtype=np.int64)
+        self.sq_norms = sq_norms if sq_norms is not None else np.sum(np.asarray(self.vectors) ** 2, axis=1)
+        
+        self._buffer_vectors = []
+        self._buffer_ids = []
+        self._buffered = np.empty((0, self.dim), dtype=np.float32)
+        self._buffered_ids = np.empty(0, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.ids) + len(self._buffered_ids) + sum(len(i) for i in self._buffer_ids)
+    
+    # -------------------------------------------------------------------------
+    # Building and inserting
+    # -------------------------------------------------------------------------
+    
+    @classmethod
+    def build(cls, signatures: np.ndarray, ids: Optional[Sequence] = None,
+              n_lists: Optional[int] = None, n_iter: int = 10, train_size: int = 200_000,
+              seed: int = 42) -> 'SignatureIndex':
+        """
+        Train the quantizer on (a sample of) the signatures and index them.
+        
+        n_lists defaults to about √n, which balances centroid and list scans.
+        """
+        x = np.asarray(signatures, dtype=np.float32)
+        mean = np.nanmean(x, axis=0)
+        scale = np.nanstd(x, axis=0)
+        scale[~(scale > 0)] = 1.0
+        z = np.nan_to_num((x - mean) / scale)
+        
+        n_lists = n_lists or int(np.clip(np.sqrt(len(z)), 1, 4096))
+        rng = np.random.RandomState(seed)
+        sample = z[rng.choice(len(z), min(train_size, len(z)), replace=False)]
+        centroids = _kmeans(sample, min(n_lists, len(sample)), n_iter, rng)
+        
+        index = cls(centroids, mean, scale)
+        index._merge(z, np.arange(len(z)) if ids is None else _as_ids(ids))
+        return index
+    
+    def add(self, signatures: np.ndarray, ids: Sequence) -> None:
+        """Insert signatures; they are searchable immediately."""
+        self._buffer_vectors.append(self._standardize(signatures))
+        self._buffer_ids.append(_as_ids(ids))
+        if sum(len(i) for i in self._buffer_ids) > self.buffer_limit:
+            self.compact()
+    
+    def compact(self) -> None:
+        """Merge buffered inserts into the inverted lists."""
+        self._flush_buffer()
+        if len(self._buffered_ids):
+            self._merge(self._buffered, self._buffered_ids)
+            self._buffered = np.empty((0, self.dim), dtype=np.float32)
+            self._buffered_ids = np.empty(0, dtype=np.int64)
+    
+    def _standardize(self, signatures: np.ndarray) -> np.ndarray:
+        x = np.atleast_2d(np.asarray(signatures, dtype=np.float32))
+        return np.nan_to_num((x - self.mean) / self.scale)
+    
+    def _flush_buffer(self) -> None:
+        if self._buffer_ids:
+            self._buffered = np.concatenate([self._buffered] + self._buffer_vectors)
+            self._buffered_ids = np.concatenate([self._buffered_ids] + self._buffer_ids)
+            self._buffer_vectors, self._buffer_ids = [], []
+    
+    def _merge(self, z: np.ndarray, ids: np.ndarray) -> None:
+        labels = np.concatenate([
+            np.repeat(np.arange(len(self.centroids), dtype=np.int32), np.diff(self.offsets)),
+            _assign(z, self.centroids),
+        ])
+        vectors = np.concatenate([np.asarray(self.vectors), z])
+        all_ids = np.concatenate([np.asarray(self.ids), ids])
+        
+        order = np.argsort(labels, kind='stable')
+        self.vectors = vectors[order]
+        self.ids = all_ids[order]
+        self.sq_norms = np.sum(self.vectors ** 2, axis=1)
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(self.centroids)))])
+    
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    
+    def query(self, signature: np.ndarray, k: int = 100, n_probe: int = 8,
+              exclude=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate k nearest neighbours of one signature.
+        
+        Parameters
+        ----------
+        signature : np.ndarray
+            Raw (unstandardized) signature
+        k : int
+            Neighbours returned
+        n_probe : int
+            Inverted lists scanned; more is slower and closer to exact
+        exclude : int or str, optional
+            Id to leave out (e.g. the query item itself)
+        
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Ids and Euclidean distances (standardized units), nearest first
+        """
+        self._flush_buffer()
+        q = self._standardize(signature)[0]
+        
+        near = np.argpartition(self.centroid_sq - 2 * (self.centroids @ q),
+                               min(n_probe, len(self.centroids)) - 1)[:n_probe]
+        rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in near])
+        
+        candidates = np.concatenate([self.vectors[rows], self._buffered])
+        candidate_ids = np.concatenate([self.ids[rows], self._buffered_ids])
+        candidate_sq = np.concatenate([self.sq_norms[rows], np.sum(self._buffered ** 2, axis=1)])
+        distances = candidate_sq - 2 * (candidates @ q) + q @ q
+        
+        if exclude is not None:
+            distances[candidate_ids == exclude] = np.inf
+        k = min(k, len(distances))
+        top = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        top = top[np.argsort(distances[top])]
+        top = top[np.isfinite(distances[top])]
+        return candidate_ids[top], np.sqrt(np.maximum(distances[top], 0))
+    
+    def query_exact(self, signature: np.ndarray, k: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force k nearest neighbours (reference for recall checks)."""
+        return self.query(signature, k, n_probe=len(self.centroids))
+    
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+    
+    def save(self, path: str) -> None:
+        """
+        Write the index (buffered inserts included) as .npy files plus meta.json.
+        
+        Each file is written under a temporary name and then renamed, so
+        saving over the directory this index was memory-mapped from is safe.
+        """
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        for name in INDEX_ARRAYS:
+            target = os.path.join(path, f'{name}.npy')
+            with open(target + '.tmp', 'wb') as f:
+                np.save(f, np.asarray(getattr(self, name)))
+            os.replace(target + '.tmp', target)
+        target = os.path.join(path, 'meta.json')
+        with open(target + '.tmp', 'w') as f:
+            json.dump({'format': INDEX_FORMAT_VERSION, 'dim': self.dim,
+                       'n_lists': len(self.centroids), 'n_items': len(self.ids)}, f, indent=2)
+        os.replace(target + '.tmp', target)
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, buffer_limit: int = 20_000) -> 'SignatureIndex':
+        """
+        Open a saved index; with mmap the stored vectors and ids stay on disk.
+        
+        Inserts after loading are buffered in memory; the next compaction
+        copies the lists into memory.
+        """
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta['format'] != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format {meta['format']}")
+        arrays = {
+            name: np.load(os.path.join(path, f'{name}.npy'),
+                          mmap_mode='r' if mmap and name in ('vectors', 'ids', 'sq_norms') else None)
+            for name in INDEX_ARRAYS
+        }
+        return cls(buffer_limit=buffer_limit, **arrays)
@@ -25,10 +25,14 @@ from scipy import stats
 from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
-import json
 import warnings
 warnings.filterwarnings('ignore')
 
+from experiment_cache import ExperimentCache, Stage, run_stage
+from results_store import write_results
+from kernels import decay_recurrence, civilization_lifespans, rescaled_range, dfa_fluctuation
+from power_law_fit import fit_power_law
+
 
 # =============================================================================
 # CONSTANTS AND CONFIGURATION
@@ -65,6 +69,70 @@ ISPS_TIERS = {
     'superfoundation': (1000.0, float('inf'))
 }
 
+# ISPS survival predictions by upper score bound (exclusive)
+ISPS_PREDICTIONS = {
+    'HIGH RISK - Likely to collapse in crisis': 20.0,
+    'UNCERTAIN - May survive with adaptation': 50.0,
+    'STABLE - Likely to survive crisis': 200.0,
+    'FOUNDATION - Expected to thrive through crisis': float('inf')
+}
+
+# TDIS recommendations by upper score bound (inclusive)
+TDIS_RECOMMENDATIONS = {
+    'EPHEMERAL - Avoid for long-term projects': 10.0,
+    'USEFUL - Consider for specialized tasks': 100.0,
+    'STANDARD - Recommended for benchmarking': 1000.0,
+    'FOUNDATIONAL - Essential for training': float('inf')
+}
+
+
+# =============================================================================
+# PRECISION POLICY
+# =============================================================================
+# Floating-point type of the array code paths: batch scoring, the batch
+# variance-of-increments Hurst estimator and the simulations. float32 halves
+# memory and bandwidth for very large jobs at the cost listed in
+# PRECISION_ERROR_BOUNDS (measured against float64). Scalar calculators and
+# reported aggregates stay float64. Set globally (`set_precision`) or per
+# call (`dtype=...`).
+
+PRECISIONS = ('float64', 'float32')
+
+PRECISION_ERROR_BOUNDS = {
+    'scores': 'relative error < 1e-6 for TVI/ISPS/TDIS scores and components',
+    'tiers': 'tier/prediction codes differ only for scores within 1e-6 (relative) of a threshold',
+    'hurst_variance': '|ΔH| < 1e-4 for stationary series up to 2·10^4 points; grows ~n·eps for '
+                      'random-walk-like paths (|ΔH| ≈ 5e-3 at 2·10^4 points), use float64 there',
+    'simulations': 'outcomes differ only for uniform draws within 6e-8 of a threshold',
+}
+
+_precision = 'float64'
+
+
+def set_precision(name: str) -> None:
+    """Set the global float type of the array code paths ('float64' or 'float32')."""
+    global _precision
+    if name not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{name}', expected one of {PRECISIONS}")
+    _precision = name
+
+
+def get_precision() -> str:
+    """Return the global precision setting."""
+    return _precision
+
+
+def resolve_dtype(dtype=None) -> np.dtype:
+    """
+    Resolve a per-call dtype argument to np.float64 or np.float32.
+    
+    None uses the global setting.
+    """
+    dtype = np.dtype(_precision if dtype is None else dtype)
+    if dtype.name not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{dtype.name}', expected one of {PRECISIONS}")
+    return dtype
+
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -223,7 +291,8 @@ def calculate_isps(
     crisis_survival_score: int = 0,
     leadership_continuity: float = 1.0,
     cross_asset: float = 1.0,
-    ecosystem_factor: float = 1.0
+    ecosystem_factor: float = 1.0,
+    current_year: int = 2026
 ) -> ISPSResult:
     """
     Calculate Investment Staying Power Score (ISPS).
@@ -244,6 +313,8 @@ def calculate_isps(
         Cross-asset class presence (1.0 - 3.0)
     ecosystem_factor : float
         Ecosystem dependency factor (0.5 - 2.0)
+    current_year : int
+        Current year for calculations
     
     Returns
     -------
@@ -256,7 +327,6 @@ def calculate_isps(
     
     # Calculate TVS proxy
     # TVS = Crisis_Survival × 50 + Age × 0.5
-    current_year = 2026
     company_age = current_year - founding_year
     tvs = crisis_survival_score * 50 + company_age * 0.5 * leadership_continuity
     
@@ -267,14 +337,7 @@ def calculate_isps(
     isps_score = saturation * np.log10(tvs + 1) * src
     
     # Survival prediction
-    if isps_score < 20:
-        prediction = "HIGH RISK - Likely to collapse in crisis"
-    elif isps_score < 50:
-        prediction = "UNCERTAIN - May survive with adaptation"
-    elif isps_score < 200:
-        prediction = "STABLE - Likely to survive crisis"
-    else:
-        prediction = "FOUNDATION - Expected to thrive through crisis"
+    prediction = ISPS_PREDICTION_NAMES[isps_prediction_codes(isps_score)]
     
     return ISPSResult(
         score=round(isps_score, 2),
@@ -312,7 +375,8 @@ def calculate_tdis(
     usage_score: float,
     release_year: int,
     researcher_population: int,
-    cross_framework: float = 1.0
+    cross_framework: float = 1.0,
+    current_year: int = 2026
 ) -> TDISResult:
     """
     Calculate Training Data Impact Score (TDIS).
@@ -329,13 +393,14 @@ def calculate_tdis(
         Size of relevant researcher community at release
     cross_framework : float
         Cross-framework adoption (1.0 - 3.0)
+    current_year : int
+        Current year for calculations
     
     Returns
     -------
     TDISResult
         Complete TDIS calculation result
     """
-    current_year = 2026
     persistence = (current_year - release_year) * 12  # months
     
     # Saturation
@@ -351,14 +416,7 @@ def calculate_tdis(
     tdis_score = saturation * np.log10(tvs + 1) * src
     
     # Recommendation
-    if tdis_score > 1000:
-        recommendation = "FOUNDATIONAL - Essential for training"
-    elif tdis_score > 100:
-        recommendation = "STANDARD - Recommended for benchmarking"
-    elif tdis_score > 10:
-        recommendation = "USEFUL - Consider for specialized tasks"
-    else:
-        recommendation = "EPHEMERAL - Avoid for long-term projects"
+    recommendation = TDIS_RECOMMENDATION_NAMES[tdis_recommendation_codes(tdis_score)]
     
     return TDISResult(
         score=round(tdis_score, 2),
@@ -367,11 +425,244 @@ def calculate_tdis(
     )
 
 
+# =============================================================================
+# VECTORIZED SCORING
+# =============================================================================
+# Array versions of the TVI/ISPS/TDIS formulas for scoring many items at once.
+# Inputs broadcast against each other (scalars or NumPy arrays); scores are
+# returned unrounded.
+
+_SRC_BOUNDS = sorted(SRC_TABLE.items())
+_SRC_STARTS = np.array([start for (start, end), src in _SRC_BOUNDS])
+_SRC_ENDS = np.array([end for (start, end), src in _SRC_BOUNDS])
+_SRC_VALUES = np.array([src for (start, end), src in _SRC_BOUNDS])
+
+TVI_TIER_NAMES = list(TVI_TIERS)
+ISPS_TIER_NAMES = list(ISPS_TIERS)
+ISPS_PREDICTION_NAMES = list(ISPS_PREDICTIONS)
+TDIS_RECOMMENDATION_NAMES = list(TDIS_RECOMMENDATIONS)
+
+
+def get_src_array(years) -> np.ndarray:
+    """Vectorized `get_src`: SRC per year, 1.0 outside the defined eras."""
+    years = np.asarray(years)
+    idx = np.searchsorted(_SRC_STARTS, years, side='right') - 1
+    idx_clipped = np.clip(idx, 0, len(_SRC_STARTS) - 1)
+    in_era = (idx >= 0) & (years < _SRC_ENDS[idx_clipped])
+    return np.where(in_era, _SRC_VALUES[idx_clipped], 1.0)
+
+
+def classify_codes(scores, tiers: Dict[str, Tuple[float, float]]) -> np.ndarray:
+    """
+    Vectorized tier lookup returning the index of each score's tier in
+    `tiers` (-1 where no tier matches, i.e. 'unknown').
+    """
+    scores = np.asarray(scores)
+    lows = np.array([low for low, high in tiers.values()])
+    highs = np.array([high for low, high in tiers.values()])
+    idx = np.searchsorted(lows, scores, side='right') - 1
+    idx_clipped = np.clip(idx, 0, len(lows) - 1)
+    valid = (idx >= 0) & (scores < highs[idx_clipped])
+    return np.where(valid, idx_clipped, -1).astype(np.int8)
+
+
+def isps_prediction_codes(scores) -> np.ndarray:
+    """Index of each ISPS score's survival prediction in ISPS_PREDICTIONS."""
+    bounds = list(ISPS_PREDICTIONS.values())[:-1]
+    return np.searchsorted(bounds, scores, side='right').astype(np.int8)
+
+
+def tdis_recommendation_codes(scores) -> np.ndarray:
+    """Index of each TDIS score's recommendation in TDIS_RECOMMENDATIONS."""
+    bounds = list(TDIS_RECOMMENDATIONS.values())[:-1]
+    return np.searchsorted(bounds, scores, side='left').astype(np.int8)
+
+
+def _tier_categorical(codes: np.ndarray, names: List[str]) -> pd.Categorical:
+    """Tier codes as a Categorical, with -1 mapped to 'unknown'."""
+    codes = np.where(codes < 0, len(names), codes)
+    return pd.Categorical.from_codes(codes, names + ['unknown'])
+
+
+def account_factor_array(year, current_year: int = 2026) -> np.ndarray:
+    """Vectorized default account factor used by `calculate_tvi`."""
+    year = np.asarray(year)
+    years_old = current_year - year
+    return np.select(
+        [year < 2005, years_old < 1, years_old < 5, years_old < 10, years_old < 15],
+        [1.0, 1.1, 1.5, 2.0, 2.3],
+        default=2.5
+    )
+
+
+def _log10_1p(tvs: np.ndarray) -> np.ndarray:
+    """log10(TVS + 1); through log1p in float32, where 1 + TVS drops small TVS."""
+    if tvs.dtype == np.float32:
+        return np.log1p(tvs) / np.float32(np.log(10))
+    return np.log10(tvs + 1)
+
+
+def _broadcast(components: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Components broadcast to one shape, so scalar and array inputs mix."""
+    return dict(zip(components, np.broadcast_arrays(*components.values())))
+
+
+def _tvi_components(views, year, platform_users, persistence_months,
+                    resurfacing_rate=0.0, legacy_level=1.0, cross_platform=1.0,
+                    account_factor=None, current_year=2026, dtype=None) -> Dict[str, np.ndarray]:
+    dtype = resolve_dtype(dtype)
+    if account_factor is None:
+        account_factor = account_factor_array(year, current_year)
+    account_factor = np.asarray(account_factor, dtype=dtype)
+    saturation = ((np.asarray(views, dtype=dtype) / account_factor) / np.asarray(platform_users, dtype=dtype)
+                  * np.asarray(cross_platform, dtype=dtype))
+    tvs = (np.minimum(np.asarray(persistence_months, dtype=dtype), 180)
+           * (np.asarray(resurfacing_rate, dtype=dtype) + 0.1) * np.asarray(legacy_level, dtype=dtype))
+    src = get_src_array(year).astype(dtype)
+    return _broadcast({
+        'score': saturation * _log10_1p(tvs) * src,
+        'saturation': saturation,
+        'tvs': tvs,
+        'src': src,
+        'account_factor': account_factor
+    })
+
+
+def _isps_components(brand_awareness, market_position, founding_year,
+                     crisis_survival_score=0, leadership_continuity=1.0,
+                     cross_asset=1.0, ecosystem_factor=1.0,
+                     current_year=2026, dtype=None) -> Dict[str, np.ndarray]:
+    dtype = resolve_dtype(dtype)
+    saturation = ((np.asarray(brand_awareness, dtype=dtype) * np.asarray(market_position, dtype=dtype))
+                  / np.asarray(ecosystem_factor, dtype=dtype) * np.asarray(cross_asset, dtype=dtype) * 100)
+    company_age = (current_year - np.asarray(founding_year)).astype(dtype)
+    tvs = (np.asarray(crisis_survival_score, dtype=dtype) * 50
+           + company_age * 0.5 * np.asarray(leadership_continuity, dtype=dtype))
+    src = get_src_array(founding_year).astype(dtype)
+    return _broadcast({
+        'score': saturation * _log10_1p(tvs) * src,
+        'saturation': saturation,
+        'tvs': tvs,
+        'src': src
+    })
+
+
+def _tdis_components(citations, usage_score, release_year, researcher_population,
+                     cross_framework=1.0, current_year=2026, dtype=None) -> Dict[str, np.ndarray]:
+    dtype = resolve_dtype(dtype)
+    persistence = (current_year - np.asarray(release_year)) * 12  # months
+    saturation = ((np.asarray(citations, dtype=dtype) * np.asarray(usage_score, dtype=dtype))
+                  / np.asarray(researcher_population, dtype=dtype) * np.asarray(cross_framework, dtype=dtype) * 1000)
+    tvs = (np.minimum(persistence, 180) * 0.5).astype(dtype)
+    src = get_src_array(release_year).astype(dtype)
+    return _broadcast({
+        'score': saturation * _log10_1p(tvs) * src,
+        'saturation': saturation,
+        'tvs': tvs,
+        'src': src
+    })
+
+
+def tvi_score_array(views, year, platform_users, persistence_months,
+                    resurfacing_rate=0.0, legacy_level=1.0, cross_platform=1.0,
+                    account_factor=None, current_year: int = 2026, dtype=None) -> np.ndarray:
+    """Vectorized TVI score (same formula and arguments as `calculate_tvi`)."""
+    return _tvi_components(views, year, platform_users, persistence_months,
+                           resurfacing_rate, legacy_level, cross_platform,
+                           account_factor, current_year, dtype)['score']
+
+
+def isps_score_array(brand_awareness, market_position, founding_year,
+                     crisis_survival_score=0, leadership_continuity=1.0,
+                     cross_asset=1.0, ecosystem_factor=1.0,
+                     current_year: int = 2026, dtype=None) -> np.ndarray:
+    """Vectorized ISPS score (same formula and arguments as `calculate_isps`)."""
+    return _isps_components(brand_awareness, market_position, founding_year,
+                            crisis_survival_score, leadership_continuity,
+                            cross_asset, ecosystem_factor, current_year, dtype)['score']
+
+
+def tdis_score_array(citations, usage_score, release_year, researcher_population,
+                     cross_framework=1.0, current_year: int = 2026, dtype=None) -> np.ndarray:
+    """Vectorized TDIS score (same formula and arguments as `calculate_tdis`)."""
+    return _tdis_components(citations, usage_score, release_year, researcher_population,
+                            cross_framework, current_year, dtype)['score']
+
+
+def calculate_tvi_batch(views, year, platform_users, persistence_months,
+                        resurfacing_rate=0.0, legacy_level=1.0, cross_platform=1.0,
+                        account_factor=None, current_year: int = 2026, dtype=None) -> pd.DataFrame:
+    """
+    Score many items with the TVI formula.
+    
+    `dtype` ('float64'/'float32', default: the global precision) sets the
+    type of the numeric columns.
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per item: score, saturation, tvs, src, account_factor and
+        tier (categorical, int8 codes in TVI_TIER_NAMES order + 'unknown')
+    """
+    components = _tvi_components(views, year, platform_users, persistence_months,
+                                 resurfacing_rate, legacy_level, cross_platform,
+                                 account_factor, current_year, dtype)
+    frame = pd.DataFrame({k: np.ravel(v) for k, v in components.items()})
+    frame['tier'] = _tier_categorical(classify_codes(frame['score'].to_numpy(), TVI_TIERS), TVI_TIER_NAMES)
+    return frame
+
+
+def calculate_isps_batch(brand_awareness, market_position, founding_year,
+                         crisis_survival_score=0, leadership_continuity=1.0,
+                         cross_asset=1.0, ecosystem_factor=1.0,
+                         current_year: int = 2026, dtype=None) -> pd.DataFrame:
+    """
+    Score many companies with the ISPS formula.
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per company: score, saturation, tvs, src, tier and
+        survival_prediction (both categorical with int8 codes)
+    """
+    components = _isps_components(brand_awareness, market_position, founding_year,
+                                  crisis_survival_score, leadership_continuity,
+                                  cross_asset, ecosystem_factor, current_year, dtype)
+    frame = pd.DataFrame({k: np.ravel(v) for k, v in components.items()})
+    scores = frame['score'].to_numpy()
+    frame['tier'] = _tier_categorical(classify_codes(scores, ISPS_TIERS), ISPS_TIER_NAMES)
+    frame['survival_prediction'] = pd.Categorical.from_codes(isps_prediction_codes(scores),
+                                                             ISPS_PREDICTION_NAMES)
+    return frame
+
+
+def calculate_tdis_batch(citations, usage_score, release_year, researcher_population,
+                         cross_framework=1.0, current_year: int = 2026, dtype=None) -> pd.DataFrame:
+    """
+    Score many datasets with the TDIS formula.
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per dataset: score, saturation, tvs, src, tier (TVI tiers)
+        and recommendation (both categorical with int8 codes)
+    """
+    components = _tdis_components(citations, usage_score, release_year, researcher_population,
+                                  cross_framework, current_year, dtype)
+    frame = pd.DataFrame({k: np.ravel(v) for k, v in components.items()})
+    scores = frame['score'].to_numpy()
+    frame['tier'] = _tier_categorical(classify_codes(scores, TVI_TIERS), TVI_TIER_NAMES)
+    frame['recommendation'] = pd.Categorical.from_codes(tdis_recommendation_codes(scores),
+                                                        TDIS_RECOMMENDATION_NAMES)
+    return frame
+
+
 # =============================================================================
 # FRACTAL DIMENSION ANALYSIS
 # =============================================================================
 
-def calculate_hurst_exponent(series: np.ndarray, max_lag: int = 100) -> Tuple[float, float]:
+def calculate_hurst_exponent(series: np.ndarray, max_lag: int = 100,
+                             backend: Optional[str] = None) -> Tuple[float, float]:
     """
     Calculate Hurst exponent using R/S (rescaled range) analysis.
     
@@ -381,6 +672,8 @@ def calculate_hurst_exponent(series: np.ndarray, max_lag: int = 100) -> Tuple[fl
         Time series data
     max_lag : int
         Maximum lag to consider
+    backend : str, optional
+        Kernel backend ('auto', 'numpy', 'numba'); None uses the global setting
     
     Returns
     -------
@@ -395,26 +688,10 @@ def calculate_hurst_exponent(series: np.ndarray, max_lag: int = 100) -> Tuple[fl
     rs_values = []
     
     for lag in lags:
-        # Divide into subseries
-        subseries = [series[i:i+lag] for i in range(0, n-lag, lag)]
-        
-        rs_lag = []
-        for sub in subseries:
-            if len(sub) < 2:
-                continue
-            # Mean-adjusted series
-            mean_adj = sub - np.mean(sub)
-            # Cumulative deviation
-            cumdev = np.cumsum(mean_adj)
-            # Range
-            R = np.max(cumdev) - np.min(cumdev)
-            # Standard deviation
-            S = np.std(sub, ddof=1)
-            if S > 0:
-                rs_lag.append(R / S)
-        
-        if rs_lag:
-            rs_values.append((lag, np.mean(rs_lag)))
+        # Mean R/S over non-overlapping subseries of length lag
+        rs_lag = rescaled_range(series, lag, backend=backend)
+        if not np.isnan(rs_lag):
+            rs_values.append((lag, rs_lag))
     
     if len(rs_values) < 5:
         return None, None
@@ -428,49 +705,558 @@ def calculate_hurst_exponent(series: np.ndarray, max_lag: int = 100) -> Tuple[fl
     return slope, r_value ** 2
 
 
-def estimate_fractal_dimension(series: np.ndarray) -> Dict:
+def _lagged_cross_products(centered: np.ndarray, lags: np.ndarray, method: str = 'auto') -> np.ndarray:
+    """
+    Σ_t x[t+τ]·x[t] for every lag τ and every row of a 2D array.
+    
+    'direct' takes one dot product per lag over array views (no copies);
+    'fft' gets every lag at once from the autocorrelation via the
+    Wiener-Khinchin identity, O(n log n) per series regardless of the
+    number of lags. 'auto' picks FFT once the lag set is large.
+    """
+    n = centered.shape[1]
+    nfft = 1 << int(np.ceil(np.log2(2 * n - 1)))
+    if method == 'auto':
+        method = 'fft' if len(lags) > 2 * np.log2(nfft) else 'direct'
+    
+    if method == 'fft':
+        spectrum = np.fft.rfft(centered, n=nfft, axis=1)
+        autocorr = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=nfft, axis=1)
+        return autocorr[:, lags]
+    elif method == 'direct':
+        cross = np.empty((centered.shape[0], len(lags)))
+        for i, lag in enumerate(lags):
+            cross[:, i] = np.einsum('ij,ij->i', centered[:, lag:], centered[:, :n - lag])
+        return cross
+    raise ValueError(f"Unknown method '{method}', expected 'auto', 'direct' or 'fft'")
+
+
+def _increment_variances_from_sums(profile: np.ndarray, centered_sq_cumsum: np.ndarray,
+                                   cross: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    """
+    Var(x[t+τ] - x[t]) from running sums and lagged cross products.
+    
+    Σ(x[t+τ] - x[t])² = Σx[t+τ]² + Σx[t]² - 2Σx[t+τ]x[t], and the mean
+    increment is a difference of profile values, so no increment array is
+    ever built. All arrays are 2D with one row per series.
+    """
+    n = profile.shape[1] - 1
+    count = n - lags
+    sum_sq = (centered_sq_cumsum[:, [n]] - centered_sq_cumsum[:, lags]) + centered_sq_cumsum[:, count]
+    mean = (profile[:, [n]] - profile[:, lags] - profile[:, count]) / count
+    return (sum_sq - 2 * cross) / count - mean ** 2
+
+
+def increment_variances(series: np.ndarray, lags, method: str = 'auto', dtype=None) -> np.ndarray:
+    """
+    Variance of increments Var(X(t+τ) - X(t)) for many lags at once.
+    
+    Parameters
+    ----------
+    series : np.ndarray
+        One series (1D) or a batch of equal-length series (2D, one per row)
+    lags : array-like of int
+        Lags τ, each between 1 and n-1
+    method : str
+        'auto', 'direct' or 'fft' (see `_lagged_cross_products`)
+    dtype : str or dtype, optional
+        Working precision of the series, running sums and cross products
+        (default: the global precision)
+    
+    Returns
+    -------
+    np.ndarray
+        Variances with shape (len(lags),) or (n_series, len(lags))
+    """
+    x = np.asarray(series, dtype=resolve_dtype(dtype))
+    squeeze = x.ndim == 1
+    x = np.atleast_2d(x)
+    lags = np.asarray(lags, dtype=np.int64)
+    n = x.shape[1]
+    if lags.size and (lags.min() < 1 or lags.max() >= n):
+        raise ValueError("lags must lie between 1 and n-1")
+    
+    # Increments are shift invariant; centering keeps the sums well conditioned
+    centered = x - x.mean(axis=1, keepdims=True)
+    profile = np.zeros((x.shape[0], n + 1), dtype=x.dtype)
+    np.cumsum(centered, axis=1, out=profile[:, 1:])
+    centered_sq_cumsum = np.zeros((x.shape[0], n + 1), dtype=x.dtype)
+    np.cumsum(centered ** 2, axis=1, out=centered_sq_cumsum[:, 1:])
+    
+    cross = _lagged_cross_products(centered, lags, method)
+    variances = _increment_variances_from_sums(profile, centered_sq_cumsum, cross, lags)
+    return variances[0] if squeeze else variances
+
+
+def calculate_hurst_variance(series: np.ndarray, max_lag: int = 100, method: str = 'auto',
+                             dtype=None):
+    """
+    Calculate Hurst exponent using the variance of increments method.
+    
+    For self-affine series: Var(X(t+τ) - X(t)) ~ τ^(2H). Uses the same ~30
+    log-spaced lags as run_experiments.py, with all increment variances
+    computed in one pass by `increment_variances`.
+    
+    Parameters
+    ----------
+    series : np.ndarray
+        One series (1D) or a batch of equal-length series (2D, one per row)
+    max_lag : int
+        Maximum lag to consider (capped at n/4)
+    method : str
+        'auto', 'direct' or 'fft'
+    dtype : str or dtype, optional
+        Working precision (default: the global precision); see
+        PRECISION_ERROR_BOUNDS['hurst_variance'] before using float32
+    
+    Returns
+    -------
+    Tuple
+        (Hurst exponent, R-squared of fit); arrays of both for a 2D batch,
+        (None, None) / NaN where there are too few usable lags
+    """
+    x = np.asarray(series, dtype=resolve_dtype(dtype))
+    n = x.shape[-1]
+    lags = np.unique(np.logspace(0, np.log10(max(min(max_lag, n // 4), 1)), 30).astype(int))
+    
+    if len(lags) < 5:
+        if x.ndim == 1:
+            return None, None
+        return np.full(x.shape[0], np.nan, dtype=x.dtype), np.full(x.shape[0], np.nan, dtype=x.dtype)
+    
+    variances = np.atleast_2d(increment_variances(x, lags, method=method, dtype=x.dtype))
+    
+    # Row-wise least squares of log variance on log lag
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_vars = np.where(variances > 0, np.log(variances), np.nan)
+    log_lags = np.log(lags)
+    lx = log_lags - log_lags.mean()
+    ly = log_vars - log_vars.mean(axis=1, keepdims=True)
+    slope = ly @ lx / np.dot(lx, lx)
+    r_squared = (ly @ lx) ** 2 / (np.dot(lx, lx) * np.sum(ly ** 2, axis=1))
+    
+    H = slope / 2  # Var ~ τ^(2H), so slope = 2H
+    if x.ndim == 1:
+        if np.isnan(H[0]):
+            return None, None
+        return H[0], r_squared[0]
+    return H.astype(x.dtype), r_squared.astype(x.dtype)
+
+
+FRACTAL_METHODS = ('rs', 'dfa', 'variance', 'higuchi')
+
+# Default weights for the consensus D are each method's R² of fit;
+# pass `weights` to estimate_fractal_dimension to override
+
+
+@dataclass
+class FractalProfile:
+    """
+    Intermediate arrays shared by every fractal estimator.
+    
+    Built once per series by `prepare_fractal_profile`; each method then
+    reads from these arrays instead of re-centering and re-integrating.
+    The series is always read as increments: R/S and DFA work on it (and
+    its profile) directly, the variance and Higuchi methods on `path`, the
+    integrated series, so all four estimate the same H.
+    """
+    series: np.ndarray
+    centered: np.ndarray
+    profile: np.ndarray
+    centered_sq_cumsum: np.ndarray
+    scales: np.ndarray
+    
+    @property
+    def path(self) -> np.ndarray:
+        """Cumulative sum of the mean-removed series (the profile without its leading 0)."""
+        return self.profile[1:]
+
+
+def prepare_fractal_profile(series: np.ndarray, num_scales: int = 40) -> FractalProfile:
+    """
+    Compute the shared preprocessing for the fractal estimators.
+    
+    Parameters
+    ----------
+    series : np.ndarray
+        Time series data
+    num_scales : int
+        Number of log-spaced scales between 1 and n/4
+    
+    Returns
+    -------
+    FractalProfile
+        Mean-removed series, cumulative profile (with a leading 0), running
+        sum of squares and the common scale grid
+    """
+    series = np.asarray(series, dtype=np.float64)
+    n = len(series)
+    centered = series - series.mean()
+    
+    profile = np.empty(n + 1)
+    profile[0] = 0.0
+    np.cumsum(centered, out=profile[1:])
+    
+    centered_sq_cumsum = np.empty(n + 1)
+    centered_sq_cumsum[0] = 0.0
+    np.cumsum(centered ** 2, out=centered_sq_cumsum[1:])
+    
+    max_scale = max(n // 4, 1)
+    scales = np.unique(np.logspace(0, np.log10(max_scale), num_scales).astype(int))
+    
+    return FractalProfile(series, centered, profile, centered_sq_cumsum, scales)
+
+
+def _fit_log_log(x: np.ndarray, y: np.ndarray) -> Tuple[Optional[float], Optional[float]]:
+    """Slope and R² of log(y) against log(x), or (None, None) if too few points."""
+    valid = np.isfinite(y) & (y > 0)
+    if valid.sum() < 5:
+        return None, None
+    slope, intercept, r_value, p_value, std_err = stats.linregress(np.log(x[valid]), np.log(y[valid]))
+    return slope, r_value ** 2
+
+
+def _rs_from_profile(fp: FractalProfile) -> Tuple[Optional[float], Optional[float]]:
+    """R/S Hurst exponent from the shared profile (no per-window cumsum)."""
+    n = len(fp.series)
+    scales = fp.scales[(fp.scales >= 10) & (n // fp.scales >= 2)]
+    rs = np.full(len(scales), np.nan)
+    
+    for i, s in enumerate(scales):
+        k = n // s
+        starts = np.arange(k) * s
+        window_sum = fp.profile[starts + s] - fp.profile[starts]
+        mean = window_sum / s
+        
+        # Cumulative deviation within each window, read off the global profile
+        cumdev = (fp.profile[1:k * s + 1].reshape(k, s) - fp.profile[starts][:, None]
+                  - np.arange(1, s + 1) * mean[:, None])
+        R = cumdev.max(axis=1) - cumdev.min(axis=1)
+        
+        sum_sq = fp.centered_sq_cumsum[starts + s] - fp.centered_sq_cumsum[starts]
+        S = np.sqrt(np.maximum(sum_sq - s * mean ** 2, 0.0) / (s - 1))
+        
+        valid = S > 0
+        if valid.any():
+            rs[i] = np.mean(R[valid] / S[valid])
+    
+    return _fit_log_log(scales, rs)
+
+
+def _dfa_from_profile(fp: FractalProfile) -> Tuple[Optional[float], Optional[float]]:
+    """DFA Hurst exponent (slope of F(s) against s) from the shared profile."""
+    n = len(fp.series)
+    scales = fp.scales[(fp.scales >= 4) & (n // fp.scales >= 2)]
+    profile = fp.profile[1:]
+    F = np.array([dfa_fluctuation(profile, s) for s in scales])
+    return _fit_log_log(scales, F)
+
+
+def _variance_from_profile(fp: FractalProfile, max_lag: int = 100) -> Tuple[Optional[float], Optional[float]]:
+    """Variance-of-increments Hurst exponent of the path: Var(Y(t+τ) - Y(t)) ~ τ^(2H)."""
+    n = len(fp.series)
+    lags = fp.scales[fp.scales <= min(max_lag, n // 4)]
+    variances = increment_variances(fp.path, lags, dtype=np.float64)
+    
+    slope, r_squared = _fit_log_log(lags, variances)
+    if slope is None:
+        return None, None
+    return slope / 2, r_squared
+
+
+def _higuchi_from_profile(fp: FractalProfile, k_max: int = 64) -> Tuple[Optional[float], Optional[float]]:
+    """Higuchi curve-length dimension of the path, returned as H = 2 - D."""
+    n = len(fp.series)
+    ks = fp.scales[fp.scales <= min(k_max, n // 10)]
+    x = fp.path
+    lengths = np.empty(len(ks))
+    
+    for i, k in enumerate(ks):
+        diffs = np.abs(x[k:] - x[:-k])
+        # Group |x[m+ik] - x[m+(i-1)k]| by offset m = 0..k-1
+        pad = (-len(diffs)) % k
+        grouped = np.concatenate([diffs, np.zeros(pad)]).reshape(-1, k)
+        sums = grouped.sum(axis=0)
+        counts = (n - 1 - np.arange(k)) // k
+        valid = counts > 0
+        norm = (n - 1) / (counts[valid] * k)
+        lengths[i] = np.mean(sums[valid] * norm / k)
+    
+    slope, r_squared = _fit_log_log(ks, lengths)
+    if slope is None:
+        return None, None
+    # L(k) ~ k^(-D)
+    return 2 + slope, r_squared
+
+
+_FRACTAL_ESTIMATORS = {
+    'rs': _rs_from_profile,
+    'dfa': _dfa_from_profile,
+    'variance': _variance_from_profile,
+    'higuchi': _higuchi_from_profile,
+}
+
+
+# Qualitative readings of a fractal dimension by upper bound (exclusive)
+FRACTAL_INTERPRETATIONS = {
+    'Persistent/trending (memory effects)': 1.5,
+    'Slightly persistent': 1.6,
+    'Edge of chaos (optimal complexity)': 1.8,
+    'Slightly anti-persistent': 1.9,
+    'Anti-persistent/mean-reverting': float('inf')
+}
+
+
+def _interpret_dimension(D: float) -> str:
+    """Qualitative reading of a fractal dimension."""
+    for reading, upper in FRACTAL_INTERPRETATIONS.items():
+        if D < upper:
+            return reading
+    return reading
+
+
+def estimate_fractal_dimension(series: np.ndarray, methods: Optional[List[str]] = None,
+                               weights: Optional[Dict[str, float]] = None) -> Dict:
     """
     Estimate fractal dimension of a time series.
     
+    With no `methods`, H comes from `calculate_hurst_exponent` (R/S). With
+    `methods`, every requested estimator runs off one `FractalProfile`
+    (mean removal, cumulative profile and scale grid computed once) and the
+    reported H/D is the weighted consensus of the individual estimates.
+    Every method reads the series as increments (the variance and Higuchi
+    methods through its integrated path), so the estimates are comparable.
+    
     Parameters
     ----------
     series : np.ndarray
         Time series data
+    methods : List[str], optional
+        Any of 'rs', 'dfa', 'variance', 'higuchi'
+    weights : Dict[str, float], optional
+        Consensus weight per method (defaults to each fit's R²)
     
     Returns
     -------
     Dict
-        Dictionary containing H, D, R², and interpretation
+        Dictionary containing H, D, R², and interpretation; with `methods`
+        also 'estimates' (per-method H, D, R²) and the consensus 'weights'
     """
-    H, r_squared = calculate_hurst_exponent(series)
+    if methods is None:
+        H, r_squared = calculate_hurst_exponent(series)
+        
+        if H is None:
+            return {'error': 'Insufficient data for analysis'}
+        
+        D = 2 - H
+        
+        return {
+            'hurst_exponent': round(H, 4),
+            'fractal_dimension': round(D, 4),
+            'r_squared': round(r_squared, 4),
+            'interpretation': _interpret_dimension(D),
+            'matches_prediction': abs(D - 1.7) < 0.15
+        }
     
-    if H is None:
-        return {'error': 'Insufficient data for analysis'}
+    unknown = set(methods) - set(FRACTAL_METHODS)
+    if unknown:
+        raise ValueError(f"Unknown fractal methods {sorted(unknown)}, expected {FRACTAL_METHODS}")
     
-    D = 2 - H
+    fp = prepare_fractal_profile(series)
     
-    # Interpretation
-    if D < 1.5:
-        interpretation = "Persistent/trending (memory effects)"
-    elif D < 1.6:
-        interpretation = "Slightly persistent"
-    elif D < 1.8:
-        interpretation = "Edge of chaos (optimal complexity)"
-    elif D < 1.9:
-        interpretation = "Slightly anti-persistent"
+    estimates = {}
+    for method in methods:
+        H, r_squared = _FRACTAL_ESTIMATORS[method](fp)
+        if H is not None:
+            estimates[method] = {
+                'hurst_exponent': round(H, 4),
+                'fractal_dimension': round(2 - H, 4),
+                'r_squared': round(r_squared, 4)
+            }
+    
+    if not estimates:
+        return {'error': 'Insufficient data for analysis'}
+    
+    if weights is None:
+        method_weights = {m: e['r_squared'] for m, e in estimates.items()}
     else:
-        interpretation = "Anti-persistent/mean-reverting"
+        method_weights = {m: weights.get(m, 0.0) for m in estimates}
+    total_weight = sum(method_weights.values())
+    if total_weight <= 0:
+        method_weights = {m: 1.0 for m in estimates}
+        total_weight = len(estimates)
+    method_weights = {m: w / total_weight for m, w in method_weights.items()}
+    
+    H = sum(method_weights[m] * e['hurst_exponent'] for m, e in estimates.items())
+    r_squared = sum(method_weights[m] * e['r_squared'] for m, e in estimates.items())
+    D = 2 - H
     
     return {
         'hurst_exponent': round(H, 4),
         'fractal_dimension': round(D, 4),
         'r_squared': round(r_squared, 4),
-        'interpretation': interpretation,
-        'matches_prediction': abs(D - 1.7) < 0.15
+        'interpretation': _interpret_dimension(D),
+        'matches_prediction': abs(D - 1.7) < 0.15,
+        'estimates': estimates,
+        'weights': {m: round(w, 4) for m, w in method_weights.items()}
     }
 
 
-def generate_cultural_timeseries(n: int = 2000, seed: int = None) -> np.ndarray:
+@dataclass
+class MultifractalSpectrum:
+    """
+    MFDFA result over a q-grid.
+    
+    For a single series the arrays have shape (n_q,) / (n_q, n_scales); for
+    a batch a leading axis indexes the series.
+    """
+    q: np.ndarray
+    scales: np.ndarray
+    fluctuations: np.ndarray
+    h: np.ndarray
+    tau: np.ndarray
+    alpha: np.ndarray
+    f_alpha: np.ndarray
+    
+    @property
+    def width(self):
+        """Spectrum width Δα = α_max - α_min (0 for a monofractal)."""
+        return self.alpha.max(axis=-1) - self.alpha.min(axis=-1)
+
+
+def detrended_box_residuals(profile: np.ndarray, scale: int, order: int = 1,
+                            both_ends: bool = False) -> np.ndarray:
+    """
+    Residuals of every box of length `scale` after polynomial detrending.
+    
+    The fit is a projection onto an orthonormal polynomial basis, so all
+    boxes of all series are detrended by two matrix products.
+    
+    Parameters
+    ----------
+    profile : np.ndarray
+        Integrated series, shape (n_series, n)
+    scale : int
+        Box length
+    order : int
+        Degree of the detrending polynomial
+    both_ends : bool
+        Also take boxes from the end of each profile (as in MFDFA)
+    
+    Returns
+    -------
+    np.ndarray
+        Residuals of shape (n_series, n_boxes, scale)
+    """
+    batch, n = profile.shape
+    k = n // scale
+    boxes = profile[:, :k * scale].reshape(batch, k, scale)
+    if both_ends:
+        boxes = np.concatenate([boxes, profile[:, n - k * scale:].reshape(batch, k, scale)], axis=1)
+    
+    t = (np.arange(scale) - (scale - 1) / 2.0) / scale
+    basis, _ = np.linalg.qr(np.vander(t, order + 1))
+    return boxes - (boxes @ basis) @ basis.T
+
+
+def _q_fluctuations(box_variances: np.ndarray, q: np.ndarray, chunk_size: int) -> np.ndarray:
+    """
+    log F_q(s) for every q from one set of box variances.
+    
+    F_q = {mean_v [F²(v)]^(q/2)}^(1/q), and F_0 = exp(mean_v ln F²(v) / 2);
+    the q-means are taken as a log-sum-exp over a (series, q, box) broadcast.
+    Boxes with zero variance are left out.
+    """
+    with np.errstate(divide='ignore'):
+        log_f2 = np.log(box_variances)
+    valid = np.isfinite(log_f2)
+    count = valid.sum(axis=1)
+    log_f2 = np.where(valid, log_f2, 0.0)
+    
+    out = np.empty((box_variances.shape[0], len(q)))
+    block = max(1, chunk_size // box_variances.size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for lo in range(0, len(q), block):
+            qb = q[lo:lo + block]
+            z = 0.5 * qb[None, :, None] * log_f2[:, None, :]
+            z = np.where(valid[:, None, :], z, -np.inf)
+            z_max = z.max(axis=2)
+            log_mean = z_max + np.log(np.exp(z - z_max[:, :, None]).sum(axis=2) / count[:, None])
+            out[:, lo:lo + block] = log_mean / np.where(qb == 0, 1.0, qb)
+        
+        zero = q == 0
+        if zero.any():
+            out[:, zero] = (0.5 * log_f2.sum(axis=1) / count)[:, None]
+    return out
+
+
+def calculate_mfdfa(series: np.ndarray, q=None, scales=None, order: int = 1,
+                    num_scales: int = 20, chunk_size: int = 2**24) -> MultifractalSpectrum:
+    """
+    Multifractal detrended fluctuation analysis (Kantelhardt et al. 2002).
+    
+    The detrended variance of each box is computed once per scale and then
+    raised to every q by broadcasting, so a 50-point q-grid costs about as
+    much as a single DFA. As with DFA in `estimate_fractal_dimension`, the
+    series is treated as increments and integrated to a profile.
+    
+    Parameters
+    ----------
+    series : np.ndarray
+        One series (1D) or a batch of equal-length series (2D, one per row)
+    q : array-like, optional
+        Moment orders (default: 51 values from -5 to 5)
+    scales : array-like, optional
+        Box sizes (default: num_scales log-spaced from 10 to n/4)
+    order : int
+        Degree of the detrending polynomial
+    num_scales : int
+        Number of default scales
+    chunk_size : int
+        Elements per (series, q, box) block, bounding temporary memory
+    
+    Returns
+    -------
+    MultifractalSpectrum
+        F_q(s), generalized Hurst exponents h(q), mass exponents
+        τ(q) = q·h(q) - 1 and the singularity spectrum (α, f(α))
+    """
+    x = np.atleast_2d(np.asarray(series, dtype=np.float64))
+    n = x.shape[1]
+    q = np.unique(np.linspace(-5, 5, 51) if q is None else np.asarray(q, dtype=np.float64))
+    
+    if scales is None:
+        min_scale = max(10, order + 2)
+        scales = np.logspace(np.log10(min_scale), np.log10(max(n // 4, min_scale)), num_scales)
+    scales = np.unique(np.asarray(scales).astype(int))
+    scales = scales[(scales > order + 1) & (n // scales >= 1)]
+    if len(scales) < 3:
+        raise ValueError(f"Series of length {n} is too short for MFDFA")
+    
+    profile = np.cumsum(x - x.mean(axis=1, keepdims=True), axis=1)
+    
+    log_f = np.empty((x.shape[0], len(q), len(scales)))
+    for i, s in enumerate(scales):
+        box_variances = np.mean(detrended_box_residuals(profile, s, order, both_ends=True) ** 2, axis=2)
+        log_f[:, :, i] = _q_fluctuations(box_variances, q, chunk_size)
+    
+    # Row-wise least squares of log F_q(s) on log s
+    lx = np.log(scales) - np.log(scales).mean()
+    h = (log_f - log_f.mean(axis=2, keepdims=True)) @ lx / np.dot(lx, lx)
+    
+    tau = q * h - 1
+    alpha = np.gradient(tau, q, axis=1) if len(q) > 1 else np.full_like(tau, np.nan)
+    f_alpha = q * alpha - tau
+    
+    spectrum = MultifractalSpectrum(q, scales, np.exp(log_f), h, tau, alpha, f_alpha)
+    if np.asarray(series).ndim == 1:
+        for name in ('fluctuations', 'h', 'tau', 'alpha', 'f_alpha'):
+            setattr(spectrum, name, getattr(spectrum, name)[0])
+    return spectrum
+
+
+def generate_cultural_timeseries(n: int = 2000, seed: int = None,
+                                 backend: Optional[str] = None) -> np.ndarray:
     """
     Generate synthetic cultural attention time series.
     
@@ -482,33 +1268,35 @@ def generate_cultural_timeseries(n: int = 2000, seed: int = None) -> np.ndarray:
         Length of time series
     seed : int, optional
         Random seed for reproducibility
+    backend : str, optional
+        Kernel backend for the decay recurrence; None uses the global setting
     
     Returns
     -------
     np.ndarray
         Synthetic cultural time series
+    
+    Notes
+    -----
+    Since the kernel backends the draws are taken as whole arrays (burst
+    draws, burst sizes, then noise) rather than interleaved per step, so a
+    given seed gives a different series than before; at seed 42 the
+    `run_all_experiments` Hurst exponent moved from 0.9637 to 0.9696.
     """
     if seed is not None:
         np.random.seed(seed)
     
-    series = np.zeros(n)
+    # Draw all randomness up front so every backend sees the same draws
+    # Power-law distributed bursts (2% probability)
+    burst_draws = np.random.random(n)
+    burst_sizes = np.random.pareto(1.5, n) * 10
+    bursts = np.where(burst_draws < 0.02, burst_sizes, 0.0)
     
-    for i in range(1, n):
-        # Base decay
-        series[i] = 0.95 * series[i-1]
-        
-        # Power-law distributed bursts (2% probability)
-        if np.random.random() < 0.02:
-            burst_size = np.random.pareto(1.5) * 10
-            series[i] += burst_size
-        
-        # Background noise
-        series[i] += np.random.randn() * 0.5
-        
-        # Floor at zero
-        series[i] = max(0, series[i])
+    # Background noise
+    noise = np.random.randn(n) * 0.5
     
-    return series
+    # Base decay (0.95 per step), floored at zero
+    return decay_recurrence(bursts, noise, decay=0.95, floor=0.0, backend=backend)
 
 
 # =============================================================================
@@ -578,11 +1366,44 @@ def backtest_isps() -> pd.DataFrame:
 # CIVILIZATION SURVIVAL SIMULATION
 # =============================================================================
 
+# Civilization threat model: (yearly threat probability, collapse probability)
+CIVILIZATION_THREATS = {
+    'short_term': (0.10, 0.30),
+    'medium_term': (0.02, 0.50),
+    'century': (0.30, 0.70),  # only in years divisible by 50
+}
+
+CIVILIZATION_TAU_DISTRIBUTIONS = [
+    ('Current Humanity (1%)', {'quarterly': 0.70, 'decadal': 0.25, 'generational': 0.04, 'civilizational': 0.01}),
+    ('5% Civilizational', {'quarterly': 0.60, 'decadal': 0.28, 'generational': 0.07, 'civilizational': 0.05}),
+    ('10% Civilizational', {'quarterly': 0.50, 'decadal': 0.30, 'generational': 0.10, 'civilizational': 0.10}),
+    ('20% Civilizational', {'quarterly': 0.30, 'decadal': 0.30, 'generational': 0.20, 'civilizational': 0.20}),
+]
+
+
+def threat_exposure(tau_distribution) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Which threat classes a τ distribution is exposed to.
+    
+    Accepts a dict of floats or a DataFrame/dict of arrays; returns boolean
+    arrays (short-term, medium-term, century).
+    """
+    quarterly = np.asarray(tau_distribution['quarterly'])
+    civilizational = np.asarray(tau_distribution['civilizational'])
+    medium_thinkers = (np.asarray(tau_distribution['decadal']) +
+                       np.asarray(tau_distribution['generational']) +
+                       civilizational)
+    return quarterly < 0.30, medium_thinkers < 0.20, civilizational < 0.10
+
+
 def simulate_civilization_survival(
     n_civilizations: int = 200,
     max_years: int = 500,
     tau_distribution: Dict[str, float] = None,
-    seed: int = None
+    seed: int = None,
+    backend: Optional[str] = None,
+    chunk_size: int = 4096,
+    dtype=None
 ) -> Dict:
     """
     Simulate civilization survival based on τ (temporal horizon) distribution.
@@ -597,11 +1418,24 @@ def simulate_civilization_survival(
         Distribution of temporal thinking horizons
     seed : int, optional
         Random seed
+    backend : str, optional
+        Kernel backend for the yearly threat loop; None uses the global setting
+    chunk_size : int
+        Civilizations simulated per batch of random draws
+    dtype : str or dtype, optional
+        Type of the draws handed to the kernel (default: the global precision)
     
     Returns
     -------
     Dict
         Simulation results
+    
+    Notes
+    -----
+    Since the kernel backends every civilization-year takes six uniform
+    draws up front instead of drawing only while a threat is pending, so a
+    given seed gives different lifespans than before; at seed 42 the
+    'Current Humanity (1%)' survival_500y moved from 9.0% to 10.5%.
     """
     if seed is not None:
         np.random.seed(seed)
@@ -614,48 +1448,32 @@ def simulate_civilization_survival(
             'civilizational': 0.01
         }
     
-    lifespans = []
+    short_vulnerable, medium_vulnerable, century_vulnerable = (
+        bool(v) for v in threat_exposure(tau_distribution)
+    )
     
-    for _ in range(n_civilizations):
-        years = 0
-        alive = True
-        
-        while alive and years < max_years:
-            years += 1
-            
-            # Short-term threat (annual, 10% probability)
-            if np.random.random() < 0.10:
-                if tau_distribution['quarterly'] < 0.30:
-                    if np.random.random() < 0.30:
-                        alive = False
-            
-            # Medium-term threat (decadal, 2% probability)
-            if alive and np.random.random() < 0.02:
-                medium_thinkers = (tau_distribution['decadal'] + 
-                                   tau_distribution['generational'] + 
-                                   tau_distribution['civilizational'])
-                if medium_thinkers < 0.20:
-                    if np.random.random() < 0.50:
-                        alive = False
-            
-            # Century-scale threat (every 50 years, 30% probability)
-            if alive and years % 50 == 0:
-                if np.random.random() < 0.30:
-                    if tau_distribution['civilizational'] < 0.10:
-                        if np.random.random() < 0.70:
-                            alive = False
-        
-        lifespans.append(years)
+    # Per year: short-term threat (10%) and collapse (30%), medium-term
+    # threat (2%) and collapse (50%), century threat every 50 years (30%)
+    # and collapse (70%)
+    lifespans = []
+    for start in range(0, n_civilizations, chunk_size):
+        n_chunk = min(chunk_size, n_civilizations - start)
+        draws = np.random.random((n_chunk, max_years, 6)).astype(resolve_dtype(dtype), copy=False)
+        lifespans.append(civilization_lifespans(
+            draws, max_years, short_vulnerable, medium_vulnerable,
+            century_vulnerable, backend=backend
+        ))
+    lifespans = np.concatenate(lifespans)
     
     return {
         'tau_distribution': tau_distribution,
         'civilizational_pct': tau_distribution['civilizational'] * 100,
         'avg_lifespan': np.mean(lifespans),
         'median_lifespan': np.median(lifespans),
-        'survival_500y': sum(1 for l in lifespans if l >= 500) / n_civilizations * 100,
-        'survival_250y': sum(1 for l in lifespans if l >= 250) / n_civilizations * 100,
-        'min_lifespan': min(lifespans),
-        'max_lifespan': max(lifespans)
+        'survival_500y': np.sum(lifespans >= 500) / n_civilizations * 100,
+        'survival_250y': np.sum(lifespans >= 250) / n_civilizations * 100,
+        'min_lifespan': int(lifespans.min()),
+        'max_lifespan': int(lifespans.max())
     }
 
 
@@ -668,15 +1486,8 @@ def run_civilization_experiment(seed: int = 42) -> pd.DataFrame:
     pd.DataFrame
         Results for all tested distributions
     """
-    distributions = [
-        ('Current Humanity (1%)', {'quarterly': 0.70, 'decadal': 0.25, 'generational': 0.04, 'civilizational': 0.01}),
-        ('5% Civilizational', {'quarterly': 0.60, 'decadal': 0.28, 'generational': 0.07, 'civilizational': 0.05}),
-        ('10% Civilizational', {'quarterly': 0.50, 'decadal': 0.30, 'generational': 0.10, 'civilizational': 0.10}),
-        ('20% Civilizational', {'quarterly': 0.30, 'decadal': 0.30, 'generational': 0.20, 'civilizational': 0.20}),
-    ]
-    
     results = []
-    for name, dist in distributions:
+    for name, dist in CIVILIZATION_TAU_DISTRIBUTIONS:
         result = simulate_civilization_survival(
             n_civilizations=200,
             max_years=500,
@@ -689,51 +1500,313 @@ def run_civilization_experiment(seed: int = 42) -> pd.DataFrame:
     return pd.DataFrame(results)
 
 
+def _yearly_survival(tau_distributions, max_years: int, tilt: float = 1.0) -> np.ndarray:
+    """
+    Probability of surviving each year 1..max_years, shape (n_distributions, max_years).
+    
+    `tilt` scales every threat's fatal probability (used as the importance
+    sampling proposal; 1.0 is the model itself).
+    """
+    short, medium, century = (np.atleast_1d(v)[:, None] for v in threat_exposure(tau_distributions))
+    
+    yearly = {name: p_threat * p_collapse * tilt for name, (p_threat, p_collapse) in CIVILIZATION_THREATS.items()}
+    years = np.arange(1, max_years + 1)
+    return ((1 - yearly['short_term'] * short) *
+            (1 - yearly['medium_term'] * medium) *
+            (1 - yearly['century'] * (century & (years % 50 == 0))))
+
+
+def civilization_survival_curves(tau_distributions, max_years: int = 500) -> np.ndarray:
+    """
+    Exact survival function of the civilization threat model.
+    
+    The yearly death probability depends only on the year and on which
+    threat classes a distribution is exposed to,
+        
+        h(y) = 1 - (1 - 0.10·0.30·short)(1 - 0.02·0.50·medium)
+                 × (1 - 0.30·0.70·century·[y mod 50 = 0]),
+    
+    so S(t) = P(lifespan > t) = Π_{y ≤ t} (1 - h(y)), one cumulative product
+    of length max_years per distribution.
+    
+    Parameters
+    ----------
+    tau_distributions : dict or pd.DataFrame
+        One τ distribution (dict of floats) or many (DataFrame / dict of
+        arrays with 'quarterly', 'decadal', 'generational', 'civilizational')
+    max_years : int
+        Simulation horizon
+    
+    Returns
+    -------
+    np.ndarray
+        S(t) for t = 0..max_years, shape (max_years + 1,) or
+        (n_distributions, max_years + 1); S(max_years) is the probability of
+        surviving the whole horizon
+    """
+    survive = _yearly_survival(tau_distributions, max_years)
+    curves = np.ones((survive.shape[0], max_years + 1))
+    np.cumprod(survive, axis=1, out=curves[:, 1:])
+    if isinstance(tau_distributions, dict) and np.ndim(tau_distributions['quarterly']) == 0:
+        return curves[0]
+    return curves
+
+
+def exact_civilization_survival(tau_distributions, max_years: int = 500) -> pd.DataFrame:
+    """
+    Closed-form counterpart of `simulate_civilization_survival`.
+    
+    The simulated lifespan is L = min(T, max_years) for the first fatal
+    year T, so with S(t) = P(T > t):
+    - mean lifespan = Σ_{t < max_years} S(t)
+    - P(L ≥ t) = S(t - 1) for t ≤ max_years
+    - median = smallest t with P(L ≤ t) ≥ 0.5
+    
+    Parameters
+    ----------
+    tau_distributions : dict or pd.DataFrame
+        τ distribution(s), as for `civilization_survival_curves`
+    max_years : int
+        Simulation horizon
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per distribution with civilizational_pct, avg_lifespan,
+        median_lifespan, survival_500y and survival_250y
+    """
+    curves = np.atleast_2d(civilization_survival_curves(tau_distributions, max_years))
+    
+    # P(L ≤ t) for t = 1..max_years, where L = max_years has all remaining mass
+    lifespan_cdf = 1 - curves[:, 1:]
+    lifespan_cdf[:, -1] = 1.0
+    median = np.argmax(lifespan_cdf >= 0.5, axis=1) + 1
+    
+    def survival_at(t):
+        return curves[:, t - 1] * 100 if t <= max_years else np.zeros(len(curves))
+    
+    return pd.DataFrame({
+        'civilizational_pct': np.atleast_1d(tau_distributions['civilizational']) * 100,
+        'avg_lifespan': curves[:, :max_years].sum(axis=1),
+        'median_lifespan': median,
+        'survival_500y': survival_at(500),
+        'survival_250y': survival_at(250),
+    })
+
+
+def validate_civilization_survival(n_civilizations: int = 20000, max_years: int = 500,
+                                   seed: int = 42) -> pd.DataFrame:
+    """
+    Compare the exact solver with the Monte Carlo simulator.
+    
+    Runs both on CIVILIZATION_TAU_DISTRIBUTIONS; z-scores use the
+    binomial / sample standard errors of the simulated estimates and
+    should be within about ±3.
+    
+    Returns
+    -------
+    pd.DataFrame
+        Exact and simulated mean lifespan and survival percentages, with
+        z-scores, per distribution
+    """
+    taus = pd.DataFrame([dist for _, dist in CIVILIZATION_TAU_DISTRIBUTIONS])
+    exact = exact_civilization_survival(taus, max_years)
+    curves = civilization_survival_curves(taus, max_years)
+    
+    rows = []
+    for i, (name, dist) in enumerate(CIVILIZATION_TAU_DISTRIBUTIONS):
+        sim = simulate_civilization_survival(n_civilizations, max_years, dist, seed=seed)
+        
+        # Var(L) = Σ (2t + 1) S(t) - E[L]² over t < max_years
+        t = np.arange(max_years)
+        mean = exact['avg_lifespan'][i]
+        var = np.sum((2 * t + 1) * curves[i, :max_years]) - mean ** 2
+        row = {'Distribution': name, 'exact_avg_lifespan': mean, 'simulated_avg_lifespan': sim['avg_lifespan'],
+               'avg_lifespan_z': (sim['avg_lifespan'] - mean) / np.sqrt(var / n_civilizations) if var > 0 else 0.0}
+        for key in ('survival_250y', 'survival_500y'):
+            p = exact[key][i] / 100
+            se = np.sqrt(p * (1 - p) / n_civilizations) * 100
+            row[f'exact_{key}'] = exact[key][i]
+            row[f'simulated_{key}'] = sim[key]
+            row[f'{key}_z'] = (sim[key] - exact[key][i]) / se if se > 0 else 0.0
+        rows.append(row)
+    
+    return pd.DataFrame(rows)
+
+
+def rare_event_civilization_survival(
+    tau_distribution: Dict[str, float] = None,
+    max_years: int = 500,
+    horizons: Tuple[int, ...] = (250, 500),
+    n_civilizations: int = 1000,
+    tilt: Optional[float] = None,
+    seed: int = None
+) -> pd.DataFrame:
+    """
+    Importance-sampling estimate of tail survival probabilities.
+    
+    Civilizations are simulated under tilted hazards, with every threat's
+    fatal probability multiplied by `tilt` < 1, so long lifespans are
+    common. Each sample is reweighted by its likelihood ratio against the
+    model, and the estimate of P(lifespan ≥ t) stays unbiased. With the
+    default tilt about half the proposal civilizations reach the longest
+    horizon, so the relative error is ~1/√n_civilizations however small
+    the probability is.
+    
+    Parameters
+    ----------
+    tau_distribution : Dict[str, float]
+        Distribution of temporal thinking horizons
+    max_years : int
+        Maximum simulation years
+    horizons : Tuple[int, ...]
+        Lifespans t for which P(lifespan ≥ t) is estimated (≤ max_years)
+    n_civilizations : int
+        Civilizations simulated under the proposal
+    tilt : float, optional
+        Hazard multiplier in (0, 1]; by default chosen so the proposal
+        survival to the longest horizon is 50%
+    seed : int, optional
+        Random seed
+    
+    Returns
+    -------
+    pd.DataFrame
+        One row per horizon: estimate and standard error (percent), relative
+        error, proposal hits, effective sample size of the likelihood
+        ratios, the plain Monte Carlo sample size that would give the same
+        standard error, the exact value and the tilt used
+    """
+    if tau_distribution is None:
+        tau_distribution = {
+            'quarterly': 0.70,
+            'decadal': 0.25,
+            'generational': 0.04,
+            'civilizational': 0.01
+        }
+    rng = np.random.RandomState(seed)
+    horizons = np.asarray(horizons)
+    if horizons.max() > max_years or horizons.min() < 1:
+        raise ValueError(f"horizons must be within 1..{max_years}")
+    
+    model = _yearly_survival(tau_distribution, max_years)[0]
+    exact = np.concatenate([[1.0], np.cumprod(model)])
+    
+    if tilt is None:
+        # Bisection on the proposal survival to the longest horizon
+        target = horizons.max() - 1
+        if exact[target] >= 0.5:
+            tilt = 1.0
+        else:
+            low, high = 0.0, 1.0
+            for _ in range(50):
+                tilt = (low + high) / 2
+                if np.prod(_yearly_survival(tau_distribution, target, tilt)[0]) >= 0.5:
+                    low = tilt
+                else:
+                    high = tilt
+            tilt = low
+    
+    proposal = _yearly_survival(tau_distribution, max_years, tilt)[0]
+    proposal_curve = np.concatenate([[1.0], np.cumprod(proposal)])
+    
+    # First fatal year T under the proposal by inverse CDF (T = max_years + 1: none)
+    u = rng.random_sample(n_civilizations)
+    T = np.searchsorted(-proposal_curve, -u, side='left')
+    
+    # log LR of surviving years 1..t, and of dying in year T
+    with np.errstate(divide='ignore'):
+        log_survive_ratio = np.concatenate([[0.0], np.cumsum(np.log(model) - np.log(proposal))])
+        log_death_ratio = np.log(1 - model) - np.log(1 - proposal)
+    
+    rows = []
+    for h in horizons:
+        t = h - 1  # lifespan ≥ h  ⇔  no fatal year in 1..h-1
+        survived = T > t
+        weights = np.where(survived, np.exp(log_survive_ratio[t]), 0.0)
+        
+        # Likelihood ratio of each path restricted to years 1..t
+        died = ~survived
+        path_lr = np.exp(log_survive_ratio[t]) * np.ones(n_civilizations)
+        path_lr[died] = np.exp(log_survive_ratio[T[died] - 1] + log_death_ratio[T[died] - 1])
+        
+        estimate = weights.mean()
+        std_error = weights.std(ddof=1) / np.sqrt(n_civilizations)
+        plain_equivalent = (estimate * (1 - estimate) / std_error ** 2
+                            if std_error > 0 else np.inf)
+        rows.append({
+            'horizon': int(h),
+            'estimate': estimate * 100,
+            'std_error': std_error * 100,
+            'relative_error': std_error / estimate if estimate > 0 else np.nan,
+            'hits': int(survived.sum()),
+            'ess': path_lr.sum() ** 2 / np.sum(path_lr ** 2),
+            'plain_mc_equivalent': plain_equivalent,
+            'exact': exact[t] * 100,
+            'tilt': tilt
+        })
+    
+    return pd.DataFrame(rows)
+
+
 # =============================================================================
 # MEMORY HALF-LIFE ANALYSIS
 # =============================================================================
 
-def simulate_memory_decay(n_items: int = 10000, seed: int = 42) -> pd.DataFrame:
+# Memory tiers by TVI score and their half-lives in days
+MEMORY_TIERS = [
+    ('Ephemeral', (0, 1)),
+    ('Viral', (1, 5)),
+    ('Cultural', (5, 15)),
+    ('Milestone', (15, 30)),
+    ('Foundation', (30, float('inf')))
+]
+
+MEMORY_HALF_LIVES = [
+    11,          # 11 days
+    180,         # 6 months
+    365 * 4.2,   # 4.2 years
+    365 * 10,    # 10 years
+    365 * 25,    # 25 years
+]
+
+MEMORY_CHECKPOINTS = [7, 30, 47, 90, 180, 365, 365*2, 365*5, 365*10]
+
+
+def memory_half_lives(tvi_scores, dtype=None) -> np.ndarray:
+    """Memory half-life in days for each TVI score."""
+    edges = [high for _, (low, high) in MEMORY_TIERS[:-1]]
+    half_lives = np.asarray(MEMORY_HALF_LIVES, dtype=resolve_dtype(dtype))
+    return half_lives[np.searchsorted(edges, tvi_scores, side='right')]
+
+
+def simulate_memory_decay(n_items: int = 10000, seed: int = 42, dtype=None) -> pd.DataFrame:
     """
     Simulate cultural memory decay by TVI tier.
     
+    `dtype` (default: the global precision) sets the type of the score,
+    half-life and retention arrays.
+    
     Returns
     -------
     pd.DataFrame
         Decay analysis results
     """
     np.random.seed(seed)
+    dtype = resolve_dtype(dtype)
     
     # Generate power-law distributed TVI scores
-    tvi_scores = np.random.pareto(1.5, n_items) * 2
+    tvi_scores = (np.random.pareto(1.5, n_items) * 2).astype(dtype, copy=False)
     
     # Assign half-lives by tier
-    half_lives = np.zeros(n_items)
-    for i, tvi in enumerate(tvi_scores):
-        if tvi < 1:
-            half_lives[i] = 11  # 11 days
-        elif tvi < 5:
-            half_lives[i] = 180  # 6 months
-        elif tvi < 15:
-            half_lives[i] = 365 * 4.2  # 4.2 years
-        elif tvi < 30:
-            half_lives[i] = 365 * 10  # 10 years
-        else:
-            half_lives[i] = 365 * 25  # 25 years
+    half_lives = memory_half_lives(tvi_scores, dtype)
     
     results = []
-    checkpoints = [7, 30, 47, 90, 180, 365, 365*2, 365*5, 365*10]
     
-    for t in checkpoints:
+    for t in MEMORY_CHECKPOINTS:
         memory_remaining = 0.5 ** (t / half_lives)
         
-        for tier_name, (low, high) in [
-            ('Ephemeral', (0, 1)),
-            ('Viral', (1, 5)),
-            ('Cultural', (5, 15)),
-            ('Milestone', (15, 30)),
-            ('Foundation', (30, float('inf')))
-        ]:
+        for tier_name, (low, high) in MEMORY_TIERS:
             mask = (tvi_scores >= low) & (tvi_scores < high)
             if mask.sum() > 0:
                 retention = (memory_remaining[mask] > 0.1).mean() * 100
@@ -751,19 +1824,24 @@ def simulate_memory_decay(n_items: int = 10000, seed: int = 42) -> pd.DataFrame:
 # POWER LAW ANALYSIS
 # =============================================================================
 
-def analyze_power_law(n_items: int = 100000, seed: int = 42) -> Dict:
+def memory_concentration(tvi_scores) -> Dict:
     """
-    Analyze power law distribution in cultural memory allocation.
+    Share of total memory weight held by the top and bottom of a score set.
+    
+    Memory weight is TVI × log10(TVI + 1); shares are percentages.
+    
+    Parameters
+    ----------
+    tvi_scores : array-like
+        TVI scores
     
     Returns
     -------
     Dict
-        Power law analysis results
+        top_0.1%_share, bottom_90%_share, top_20%_share, pareto_ratio and
+        gini_coefficient
     """
-    np.random.seed(seed)
-    
-    # Generate power-law TVI scores
-    tvi_scores = np.random.pareto(1.5, n_items) * 2
+    tvi_scores = np.asarray(tvi_scores, dtype=np.float64)
     
     # Memory weight = TVI × log(TVI + 1)
     memory_weight = tvi_scores * np.log10(tvi_scores + 1)
@@ -782,7 +1860,6 @@ def analyze_power_law(n_items: int = 100000, seed: int = 42) -> Dict:
     top_20_share = memory_weight[tvi_scores >= threshold_20].sum() / total
     
     return {
-        'n_items': n_items,
         'top_0.1%_share': round(top_share * 100, 1),
         'bottom_90%_share': round(bottom_share * 100, 1),
         'top_20%_share': round(top_20_share * 100, 1),
@@ -791,11 +1868,93 @@ def analyze_power_law(n_items: int = 100000, seed: int = 42) -> Dict:
     }
 
 
+def analyze_power_law(n_items: int = 100000, seed: int = 42, fit_tail: bool = False) -> Dict:
+    """
+    Analyze power law distribution in cultural memory allocation.
+    
+    Parameters
+    ----------
+    n_items : int
+        Number of simulated TVI scores
+    seed : int
+        Random seed
+    fit_tail : bool
+        Also fit α and x_min of the score tail (see fit_power_law)
+    
+    Returns
+    -------
+    Dict
+        Power law analysis results
+    """
+    np.random.seed(seed)
+    
+    # Generate power-law TVI scores
+    tvi_scores = np.random.pareto(1.5, n_items) * 2
+    
+    results = {'n_items': n_items}
+    results.update(memory_concentration(tvi_scores))
+    
+    if fit_tail:
+        fit = fit_power_law(tvi_scores)
+        results.update({
+            'fitted_alpha': round(fit.alpha, 3),
+            'fitted_alpha_se': round(fit.alpha_se, 3),
+            'fitted_x_min': round(fit.x_min, 3),
+            'fitted_ks': round(fit.ks, 4),
+            'fitted_n_tail': fit.n_tail
+        })
+    
+    return results
+
+
 # =============================================================================
 # COMPLETE EXPERIMENT RUNNER
 # =============================================================================
 
-def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
+def build_experiment_stages(seed: int = 42) -> Dict[str, Stage]:
+    """
+    Declare the experiment stages and their dependencies.
+    
+    Cache keys cover the source of this module and of every project module
+    it reaches (kernels, power_law_fit, ...), so stages list no helper
+    functions; `constants` also keys run-time edits to the tables read by
+    the simulations.
+    
+    Parameters
+    ----------
+    seed : int
+        Random seed for reproducibility
+    
+    Returns
+    -------
+    Dict[str, Stage]
+        Stages keyed by name, in execution order
+    """
+    series = Stage('cultural_series', generate_cultural_timeseries,
+                   params={'n': 2000, 'seed': seed})
+    
+    return {
+        'cultural_series': series,
+        'fractal_dimension': Stage('fractal_dimension', estimate_fractal_dimension,
+                                   depends_on=(series,)),
+        'isps_backtest': Stage('isps_backtest', backtest_isps),
+        'civilization_survival': Stage('civilization_survival', run_civilization_experiment,
+                                       params={'seed': seed},
+                                       constants={'threats': CIVILIZATION_THREATS,
+                                                  'tau_distributions': CIVILIZATION_TAU_DISTRIBUTIONS}),
+        'memory_decay': Stage('memory_decay', simulate_memory_decay,
+                              params={'seed': seed},
+                              constants={'tiers': MEMORY_TIERS,
+                                         'half_lives': MEMORY_HALF_LIVES,
+                                         'checkpoints': MEMORY_CHECKPOINTS}),
+        'power_law': Stage('power_law', analyze_power_law,
+                           params={'seed': seed}),
+    }
+
+
+def run_all_experiments(seed: int = 42, verbose: bool = True,
+                        cache_dir: Optional[str] = None,
+                        as_frames: bool = False) -> Dict:
     """
     Run all experiments and return complete results.
     
@@ -805,6 +1964,12 @@ def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
         Random seed for reproducibility
     verbose : bool
         Print results to console
+    cache_dir : str, optional
+        Directory for the content-addressed stage cache. When given, only
+        stages whose parameters, seed or code changed are recomputed.
+    as_frames : bool
+        Keep tabular results as DataFrames instead of lists of record dicts
+        (see `results_store.write_results`)
     
     Returns
     -------
@@ -812,6 +1977,8 @@ def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
         Complete experimental results
     """
     results = {}
+    stages = build_experiment_stages(seed=seed)
+    cache = ExperimentCache(cache_dir, verbose=verbose) if cache_dir else None
     
     # 1. Fractal Dimension
     if verbose:
@@ -819,8 +1986,7 @@ def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
         print("EXPERIMENT 1: FRACTAL DIMENSION ESTIMATION")
         print("=" * 70)
     
-    cultural_series = generate_cultural_timeseries(n=2000, seed=seed)
-    fractal_results = estimate_fractal_dimension(cultural_series)
+    fractal_results = run_stage(stages['fractal_dimension'], cache)
     results['fractal_dimension'] = fractal_results
     
     if verbose:
@@ -835,10 +2001,10 @@ def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
         print("EXPERIMENT 2: ISPS CRISIS PREDICTION BACKTEST")
         print("=" * 70)
     
-    isps_results = backtest_isps()
+    isps_results = run_stage(stages['isps_backtest'], cache)
     accuracy = isps_results['Correct'].mean() * 100
     results['isps_backtest'] = {
-        'data': isps_results.to_dict('records'),
+        'data': isps_results if as_frames else isps_results.to_dict('records'),
         'accuracy': round(accuracy, 1),
         'n_companies': len(isps_results)
     }
@@ -853,8 +2019,8 @@ def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
         print("EXPERIMENT 3: CIVILIZATION SURVIVAL SIMULATION")
         print("=" * 70)
     
-    civ_results = run_civilization_experiment(seed=seed)
-    results['civilization_survival'] = civ_results.to_dict('records')
+    civ_results = run_stage(stages['civilization_survival'], cache)
+    results['civilization_survival'] = civ_results if as_frames else civ_results.to_dict('records')
     
     if verbose:
         print(civ_results[['Distribution', 'civilizational_pct', 'avg_lifespan', 'survival_500y']].to_string(index=False))
@@ -865,8 +2031,8 @@ def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
         print("EXPERIMENT 4: MEMORY HALF-LIFE BY TVI TIER")
         print("=" * 70)
     
-    memory_results = simulate_memory_decay(seed=seed)
-    results['memory_decay'] = memory_results.to_dict('records')
+    memory_results = run_stage(stages['memory_decay'], cache)
+    results['memory_decay'] = memory_results if as_frames else memory_results.to_dict('records')
     
     if verbose:
         # Show key checkpoints
@@ -882,7 +2048,7 @@ def run_all_experiments(seed: int = 42, verbose: bool = True) -> Dict:
         print("EXPERIMENT 5: POWER LAW DISTRIBUTION")
         print("=" * 70)
     
-    power_law_results = analyze_power_law(seed=seed)
+    power_law_results = run_stage(stages['power_law'], cache)
     results['power_law'] = power_law_results
     
     if verbose:
@@ -1004,28 +2170,11 @@ if __name__ == "__main__":
     print("\n")
     
     # Run all experiments
-    results = run_all_experiments(seed=42, verbose=True)
-    
-    # Save results to JSON
-    # Convert numpy types for JSON serialization
-    def convert_types(obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, pd.DataFrame):
-            return obj.to_dict('records')
-        return obj
-    
-    results_json = json.loads(
-        json.dumps(results, default=convert_types)
-    )
+    results = run_all_experiments(seed=42, verbose=True, as_frames=True)
     
-    with open('experimental_results.json', 'w') as f:
-        json.dump(results_json, f, indent=2)
+    # Save results: tables as binary columns, scalars in a JSON manifest
+    manifest_path = write_results(results, 'experimental_results')
     
     print("\n" + "=" * 70)
-    print("Results saved to experimental_results.json")
+    print(f"Results saved to {manifest_path}")
     print("=" * 70)
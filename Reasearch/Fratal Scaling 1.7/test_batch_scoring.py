@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized TVI/ISPS/TDIS batch scorers.
+
+The batch scorers must agree with the scalar calculators item by item (which
+round scores to 2 decimals) and accept any mix of scalars and arrays, like
+the `*_score_array` functions.
+
+Run with: python -m pytest test_batch_scoring.py
+"""
+
+import numpy as np
+import pytest
+
+from temporal_validation_framework import (calculate_tvi, calculate_isps, calculate_tdis,
+                                           calculate_tvi_batch, calculate_isps_batch,
+                                           calculate_tdis_batch, tvi_score_array)
+
+
+@pytest.fixture
+def rng():
+    return np.random.RandomState(42)
+
+
+def test_tvi_batch_matches_scalar(rng):
+    n = 200
+    views = rng.pareto(1.2, n) * 1e6 + 1e3
+    year = rng.randint(1995, 2026, n)
+    users = rng.uniform(1e7, 2e9, n)
+    months = rng.randint(1, 240, n).astype(float)
+    rate = rng.uniform(0, 5, n)
+    batch = calculate_tvi_batch(views, year, users, months, rate, dtype='float64')
+    for i in range(n):
+        expected = calculate_tvi(views[i], int(year[i]), users[i], months[i], rate[i])
+        assert batch['score'][i] == pytest.approx(expected.score, abs=0.005 + 1e-9)
+        assert batch['tier'][i] == expected.tier
+
+
+def test_isps_batch_matches_scalar(rng):
+    n = 200
+    awareness = rng.uniform(0.01, 1, n)
+    position = rng.randint(1, 11, n)
+    founded = rng.randint(1850, 2026, n)
+    crises = rng.randint(0, 6, n)
+    batch = calculate_isps_batch(awareness, position, founded, crises, dtype='float64')
+    for i in range(n):
+        expected = calculate_isps(awareness[i], int(position[i]), int(founded[i]), int(crises[i]))
+        assert batch['score'][i] == pytest.approx(expected.score, abs=0.005 + 1e-9)
+        assert batch['tier'][i] == expected.tier
+        assert batch['survival_prediction'][i] == expected.survival_prediction
+
+
+def test_tdis_batch_matches_scalar(rng):
+    n = 200
+    citations = rng.randint(1, 1_000_000, n)
+    usage = rng.uniform(0.01, 1, n)
+    released = rng.randint(1980, 2026, n)
+    population = rng.uniform(1e2, 1e7, n)
+    batch = calculate_tdis_batch(citations, usage, released, population, dtype='float64')
+    for i in range(n):
+        expected = calculate_tdis(int(citations[i]), usage[i], int(released[i]), population[i])
+        assert batch['score'][i] == pytest.approx(expected.score, abs=0.005 + 1e-9)
+        assert batch['tier'][i] == expected.tier
+        assert batch['recommendation'][i] == expected.recommendation
+
+
+# =============================================================================
+# SCALAR AND ARRAY INPUTS MIXED
+# =============================================================================
+
+def test_tvi_batch_broadcasts_scalars():
+    views = np.array([1e6, 1e7])
+    batch = calculate_tvi_batch(views, 2010, 1e9, 24.0, 0.5)
+    assert len(batch) == 2
+    np.testing.assert_array_equal(batch['src'], batch['src'][0])
+    np.testing.assert_array_equal(batch['account_factor'], batch['account_factor'][0])
+    np.testing.assert_allclose(batch['score'], tvi_score_array(views, 2010, 1e9, 24.0, 0.5))
+
+
+def test_isps_batch_broadcasts_scalars():
+    batch = calculate_isps_batch(0.8, 10, np.array([1900, 1950, 2000]), 2)
+    assert len(batch) == 3
+    assert batch['saturation'].nunique() == 1
+    assert batch['score'].is_monotonic_decreasing
+
+
+def test_tdis_batch_broadcasts_scalars():
+    batch = calculate_tdis_batch(np.array([10, 1000, 100_000]), 0.5, 2015, 1e5)
+    assert len(batch) == 3
+    assert batch['tvs'].nunique() == 1
+    assert batch['score'].is_monotonic_increasing
+
+
+def test_batch_of_scalars_is_one_row():
+    assert len(calculate_tvi_batch(1e6, 2010, 1e9, 24.0)) == 1
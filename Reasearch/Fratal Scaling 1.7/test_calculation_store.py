@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Tests for the COPY-based calculation store.
+
+The CSV encoding and the COPY -> staging -> INSERT ... ON CONFLICT path are
+checked against an in-memory fake of the psycopg2 pool, including a commit
+whose acknowledgement is lost. The round trip against a real PostgreSQL
+runs only when TVI_TEST_DSN points at a database.
+
+Run with: python -m pytest test_calculation_store.py
+"""
+
+import csv
+import io
+import json
+import os
+import uuid
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import calculation_store
+from calculation_store import CalculationStore, encode_calculations
+
+
+TEST_DSN = os.environ.get('TVI_TEST_DSN')
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.RandomState(42)
+    n = 250
+    inputs = pd.DataFrame({'views': rng.randint(1_000, 10_000_000, n),
+                           'rate': rng.random_sample(n),
+                           'label': [f'item "{i}", with comma' for i in range(n)]})
+    outputs = pd.DataFrame({'score': rng.uniform(0, 10, n),
+                            'tier': rng.choice(['viral', 'cultural'], n)})
+    return inputs, outputs
+
+
+# =============================================================================
+# CSV ENCODING
+# =============================================================================
+
+def test_encode_calculations_rows(frames):
+    inputs, outputs = frames
+    rows = list(csv.reader(io.StringIO(encode_calculations('viral', inputs, outputs))))
+    assert len(rows) == len(inputs)
+    assert all(len(row) == len(calculation_store.COPY_COLUMNS) for row in rows)
+    
+    ids = [uuid.UUID(row[0]) for row in rows]
+    assert len(set(ids)) == len(ids)
+    assert {row[1] for row in rows} == {''}
+    assert {row[2] for row in rows} == {'viral'}
+    
+    decoded = pd.DataFrame([json.loads(row[3]) for row in rows])
+    pd.testing.assert_frame_equal(decoded, inputs, check_dtype=False)
+    np.testing.assert_allclose([json.loads(row[4])['score'] for row in rows], outputs['score'],
+                               rtol=1e-13)
+
+
+def test_encode_calculations_user_and_empty(frames):
+    inputs, outputs = frames
+    rows = list(csv.reader(io.StringIO(encode_calculations('viral', inputs[:2], outputs[:2],
+                                                           user_id='u-1'))))
+    assert [row[1] for row in rows] == ['u-1', 'u-1']
+    assert encode_calculations('viral', inputs[:0], outputs[:0]) == ''
+    with pytest.raises(ValueError):
+        encode_calculations('viral', inputs, outputs[:3])
+
+
+# =============================================================================
+# FAKE DATABASE
+# =============================================================================
+
+class OperationalError(Exception):
+    pass
+
+
+class InterfaceError(Exception):
+    pass
+
+
+class FakeDatabase:
+    """The calculations table, with per-connection staging and transactions."""
+    
+    def __init__(self):
+        self.table = {}
+        self.statements = []
+        self.drop_after_commit = 0
+        self.fail_copy = 0
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def execute(self, sql):
+        db = self.conn.db
+        db.statements.append(sql)
+        if sql.startswith('CREATE TEMP TABLE'):
+            self.conn.staging = []
+        elif sql.startswith('INSERT INTO'):
+            for row in self.conn.staging:
+                if row[0] not in db.table and row[0] not in self.conn.pending:
+                    self.conn.pending[row[0]] = row
+    
+    def copy_expert(self, sql, file):
+        db = self.conn.db
+        db.statements.append(sql)
+        if db.fail_copy:
+            db.fail_copy -= 1
+            raise OperationalError('server closed the connection unexpectedly')
+        self.conn.staging.extend(csv.reader(file))
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.staging = None
+        self.pending = {}
+    
+    def cursor(self):
+        return FakeCursor(self)
+    
+    def commit(self):
+        self.db.table.update(self.pending)
+        self.pending = {}
+        self.staging = None
+        if self.db.drop_after_commit:
+            self.db.drop_after_commit -= 1
+            raise OperationalError('connection dropped before the acknowledgement')
+    
+    def rollback(self):
+        self.pending = {}
+        self.staging = None
+
+
+class FakePool:
+    def __init__(self, db):
+        self.db = db
+        self.closed = 0
+    
+    def getconn(self):
+        return FakeConnection(self.db)
+    
+    def putconn(self, conn, close=False):
+        self.closed += close
+    
+    def closeall(self):
+        pass
+
+
+@pytest.fixture
+def database(monkeypatch):
+    db = FakeDatabase()
+    pool = SimpleNamespace(ThreadedConnectionPool=lambda low, high, dsn: FakePool(db))
+    errors = SimpleNamespace(OperationalError=OperationalError, InterfaceError=InterfaceError)
+    monkeypatch.setattr(calculation_store, 'psycopg2', errors)
+    monkeypatch.setattr(calculation_store, 'pg_pool', pool)
+    return db
+
+
+def _store(**kwargs):
+    return CalculationStore('postgresql://fake/tvi', retry_backoff=0.0, **kwargs)
+
+
+# =============================================================================
+# COPY -> STAGING -> INSERT
+# =============================================================================
+
+def test_batches_go_through_staging(database, frames):
+    inputs, outputs = frames
+    with _store(max_connections=2, batch_size=100) as store:
+        store.submit('viral', inputs, outputs)
+    
+    assert store.stats.rows == len(inputs) and store.stats.batches == 3
+    assert len(database.table) == len(inputs)
+    assert {row[2] for row in database.table.values()} == {'viral'}
+    
+    statements = database.statements[:3]
+    assert statements[0] == store.staging_sql
+    assert 'LIKE calculations INCLUDING DEFAULTS' in statements[0]
+    assert statements[1] == store.copy_sql
+    assert 'FROM STDIN WITH (FORMAT csv' in statements[1]
+    assert statements[2] == store.insert_sql
+    assert statements[2].endswith('ON CONFLICT (id) DO NOTHING')
+
+
+def test_retry_after_lost_acknowledgement_inserts_once(database, frames):
+    inputs, outputs = frames
+    database.drop_after_commit = 1
+    with _store(max_connections=1, batch_size=100) as store:
+        store.submit('viral', inputs, outputs)
+    assert store.stats.retries == 1
+    assert store._pool.closed == 1
+    assert len(database.table) == len(inputs)
+
+
+def test_broken_connection_is_retried(database, frames):
+    inputs, outputs = frames
+    database.fail_copy = 2
+    with _store(max_connections=1, batch_size=1000) as store:
+        store.submit('viral', inputs, outputs)
+    assert store.stats.retries == 2
+    assert len(database.table) == len(inputs)
+
+
+def test_retries_exhausted_raise(database, frames):
+    inputs, outputs = frames
+    database.fail_copy = 3
+    store = _store(max_connections=1, max_retries=3)
+    store.submit('viral', inputs, outputs)
+    with pytest.raises(OperationalError):
+        store.close()
+    assert database.table == {}
+
+
+# =============================================================================
+# REAL POSTGRESQL
+# =============================================================================
+
+@pytest.mark.skipif(TEST_DSN is None, reason="TVI_TEST_DSN is not set")
+@pytest.mark.skipif(calculation_store.psycopg2 is None, reason="psycopg2 is not installed")
+def test_postgres_roundtrip(frames):
+    inputs, outputs = frames
+    domain = f'test-{uuid.uuid4().hex}'
+    with CalculationStore(TEST_DSN, max_connections=2, batch_size=100) as store:
+        store.ensure_schema()
+        store.submit(domain, inputs, outputs)
+    
+    conn = calculation_store.psycopg2.connect(TEST_DSN)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT inputs, outputs FROM calculations WHERE domain = %s", (domain,))
+            rows = cur.fetchall()
+            cur.execute("DELETE FROM calculations WHERE domain = %s", (domain,))
+        conn.commit()
+    finally:
+        conn.close()
+    assert len(rows) == len(inputs)
+    assert sorted(row[0]['views'] for row in rows) == sorted(inputs['views'].tolist())
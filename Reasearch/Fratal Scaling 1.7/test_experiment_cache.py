@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed experiment cache.
+
+Run with: python -m pytest test_experiment_cache.py
+"""
+
+import importlib
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import kernels
+import temporal_validation_framework as tvf
+from experiment_cache import ExperimentCache, Stage
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ExperimentCache(str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A two-module project: stage.py calls a helper in helper.py."""
+    root = tmp_path / 'project'
+    root.mkdir()
+    (root / 'helper.py').write_text("def scale(x):\n    return 2 * x\n")
+    (root / 'stage.py').write_text("from helper import scale\n\n"
+                                   "def run(x=1):\n    return scale(x)\n")
+    monkeypatch.syspath_prepend(str(root))
+    yield root
+    for name in ('stage', 'helper'):
+        sys.modules.pop(name, None)
+
+
+def _edit(path, text):
+    path.write_text(text)
+    # mtime resolution can be coarse; force a visible change
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def test_key_follows_helper_module_source(cache, project):
+    stage = importlib.import_module('stage')
+    before = cache.key(Stage('demo', stage.run))
+    assert cache.key(Stage('demo', stage.run)) == before
+    
+    _edit(project / 'helper.py', "def scale(x):\n    return 3 * x\n")
+    assert cache.key(Stage('demo', stage.run)) != before
+
+
+def test_key_follows_precision_and_backend(cache, monkeypatch):
+    stage = tvf.build_experiment_stages(seed=1)['isps_backtest']
+    default = cache.key(stage)
+    
+    monkeypatch.setattr(tvf, '_precision', 'float32')
+    assert cache.key(stage) != default
+    monkeypatch.setattr(tvf, '_precision', 'float64')
+    
+    monkeypatch.setattr(kernels, 'resolve_backend', lambda backend=None: 'numba')
+    assert cache.key(stage) != default
+
+
+def test_key_follows_params_constants_and_upstream(cache):
+    base = Stage('demo', np.arange, params={'stop': 3})
+    assert cache.key(base) != cache.key(Stage('demo', np.arange, params={'stop': 4}))
+    assert cache.key(base) != cache.key(Stage('demo', np.arange, params={'stop': 3},
+                                              constants={'table': [1, 2]}))
+    child = Stage('child', np.cumsum, depends_on=(base,))
+    other = Stage('child', np.cumsum, depends_on=(Stage('demo', np.arange, params={'stop': 4}),))
+    assert cache.key(child) != cache.key(other)
+
+
+def test_unserializable_param_raises(cache):
+    with pytest.raises(TypeError):
+        cache.key(Stage('demo', np.arange, params={'stop': {1, 2}}))
+
+
+@pytest.mark.parametrize('value', [
+    np.arange(12.0).reshape(3, 4),
+    pd.DataFrame({'x': [1.5, 2.5], 'n': [1, 2], 'label': ['a', 'b']}),
+    {'score': np.float64(1.25), 'flag': np.bool_(True), 'items': [1, 2]},
+])
+def test_store_load_roundtrip(cache, value):
+    cache.store('k', value, stage_name='demo')
+    loaded = cache.load('k')
+    if isinstance(value, np.ndarray):
+        np.testing.assert_array_equal(loaded, value)
+    elif isinstance(value, pd.DataFrame):
+        pd.testing.assert_frame_equal(loaded, value, check_dtype=False)
+    else:
+        assert loaded == {'score': 1.25, 'flag': True, 'items': [1, 2]}
+    assert not [name for name in os.listdir(cache.cache_dir) if name.endswith('.tmp')]
+
+
+def test_run_hits_on_second_pass(tmp_path):
+    stages = tvf.build_experiment_stages(seed=3)
+    first = ExperimentCache(str(tmp_path))
+    expected = first.run(stages['power_law'])
+    again = ExperimentCache(str(tmp_path))
+    assert again.run(stages['power_law']) == expected
+    assert again.hits == ['power_law'] and again.misses == []
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Backend equivalence tests for the numerical kernels.
+
+Every kernel must give the same output under the NumPy and Numba backends
+for the same draws. The Numba cases are skipped when Numba is not
+installed; the NumPy paths are always checked against the reference loops.
+
+Run with: python -m pytest test_kernels.py
+"""
+
+import numpy as np
+import pytest
+
+import kernels
+from kernels import (NUMBA_AVAILABLE, decay_recurrence, civilization_lifespans,
+                     rescaled_range, dfa_fluctuation, resolve_backend)
+
+
+requires_numba = pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba is not installed")
+
+
+@pytest.fixture
+def draws():
+    rng = np.random.RandomState(42)
+    n = 5000
+    walk = np.cumsum(rng.randn(n))
+    return {
+        'bursts': np.where(rng.random_sample(n) < 0.02, rng.pareto(1.5, n) * 10, 0.0),
+        'noise': rng.randn(n) * 0.5,
+        'civilizations': rng.random_sample((500, 500, 6)),
+        'walk': walk,
+        'profile': np.cumsum(walk - walk.mean()),
+    }
+
+
+def _decay(d, backend):
+    return decay_recurrence(d['bursts'], d['noise'], decay=0.95, floor=0.0, backend=backend)
+
+
+def _lifespans(d, backend, exposure=(True, True, True), dtype=np.float64):
+    return civilization_lifespans(d['civilizations'].astype(dtype), 500, *exposure, backend=backend)
+
+
+def _rescaled_range(d, backend):
+    return np.array([rescaled_range(d['walk'], lag, backend=backend) for lag in (10, 37, 99, 2500)])
+
+
+def _dfa(d, backend):
+    return np.array([dfa_fluctuation(d['profile'], s, backend=backend) for s in (4, 32, 250)])
+
+
+# =============================================================================
+# NUMPY BACKEND AGAINST THE REFERENCE LOOPS
+# =============================================================================
+
+def test_decay_recurrence_numpy_matches_loop(draws):
+    expected = kernels._decay_loop(draws['bursts'], draws['noise'], 0.95, 0.0)
+    np.testing.assert_allclose(_decay(draws, 'numpy'), expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('exposure', [(True, True, True), (False, True, False), (False, False, False)])
+def test_civilization_lifespans_numpy_matches_loop(draws, exposure):
+    expected = kernels._civilization_loop(draws['civilizations'], 500, *exposure)
+    np.testing.assert_array_equal(_lifespans(draws, 'numpy', exposure), expected)
+
+
+def test_rescaled_range_numpy_matches_loop(draws):
+    expected = [kernels._rescaled_range_loop(draws['walk'], lag) for lag in (10, 37, 99, 2500)]
+    np.testing.assert_allclose(_rescaled_range(draws, 'numpy'), expected, rtol=1e-10)
+
+
+def test_dfa_fluctuation_numpy_matches_loop(draws):
+    expected = [kernels._dfa_loop(draws['profile'], s) for s in (4, 32, 250)]
+    np.testing.assert_allclose(_dfa(draws, 'numpy'), expected, rtol=1e-10)
+
+
+# =============================================================================
+# NUMPY AGAINST NUMBA
+# =============================================================================
+
+@requires_numba
+def test_decay_recurrence_backends_match(draws):
+    np.testing.assert_allclose(_decay(draws, 'numba'), _decay(draws, 'numpy'), rtol=1e-12)
+
+
+@requires_numba
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+@pytest.mark.parametrize('exposure', [(True, True, True), (False, True, False), (False, False, False)])
+def test_civilization_lifespans_backends_match(draws, exposure, dtype):
+    np.testing.assert_array_equal(_lifespans(draws, 'numba', exposure, dtype),
+                                  _lifespans(draws, 'numpy', exposure, dtype))
+
+
+@requires_numba
+def test_rescaled_range_backends_match(draws):
+    np.testing.assert_allclose(_rescaled_range(draws, 'numba'), _rescaled_range(draws, 'numpy'),
+                               rtol=1e-10)
+
+
+@requires_numba
+def test_dfa_fluctuation_backends_match(draws):
+    np.testing.assert_allclose(_dfa(draws, 'numba'), _dfa(draws, 'numpy'), rtol=1e-10)
+
+
+# =============================================================================
+# BACKEND SELECTION
+# =============================================================================
+
+def test_auto_backend_resolves_to_available():
+    assert resolve_backend('auto') == ('numba' if NUMBA_AVAILABLE else 'numpy')
+
+
+@pytest.mark.skipif(NUMBA_AVAILABLE, reason="numba is installed")
+def test_numba_backend_without_numba_raises():
+    with pytest.raises(ImportError):
+        resolve_backend('numba')
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tests for the incrementally maintained TVI leaderboard.
+
+After any sequence of inserts, updates and removals, the skip lists and
+every query must agree with a plain sort of the current items, and item
+scores with the scalar `calculate_tvi`.
+
+Run with: python -m pytest test_leaderboard.py
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from temporal_validation_framework import calculate_tvi
+from leaderboard import IndexableSkipList, TVILeaderboard, get_era
+
+
+PLATFORMS = ('youtube', 'tiktok', None)
+
+
+def _inputs(rng):
+    return {
+        'views': int(10 ** rng.uniform(4, 9)),
+        'year': rng.randint(1995, 2025),
+        'platform_users': int(10 ** rng.uniform(7, 9.3)),
+        'persistence_months': rng.randint(1, 240),
+        'resurfacing_rate': rng.uniform(0, 1.5),
+        'legacy_level': rng.choice([1.0, 2.0, 3.0]),
+    }
+
+
+@pytest.fixture
+def board():
+    """A leaderboard after random inserts, updates and removals."""
+    rng = random.Random(7)
+    board = TVILeaderboard(seed=1)
+    for i in range(300):
+        board.upsert(i, platform=rng.choice(PLATFORMS), **_inputs(rng))
+    for _ in range(200):
+        item = rng.randrange(300)
+        if item not in board.entries:
+            continue
+        action = rng.random()
+        if action < 0.4:
+            board.update(item, views=int(10 ** rng.uniform(4, 9)))
+        elif action < 0.6:
+            board.update(item, persistence_months=rng.randint(1, 240), platform=rng.choice(PLATFORMS))
+        elif action < 0.8:
+            board.remove(item)
+        else:
+            board.upsert(item, **_inputs(rng))
+    return board
+
+
+def _reference(board, tier=None, era=None, platform=None):
+    """Entries in scope, best first, by a plain sort."""
+    entries = [e for e in board.entries.values()
+               if (tier is None or e.tier == tier) and (era is None or e.era == era)
+               and (platform is None or e.platform == platform)]
+    return sorted(entries, key=lambda e: (-e.score, e.seq))
+
+
+# =============================================================================
+# SKIP LIST
+# =============================================================================
+
+def test_skip_list_matches_sorted_list():
+    rng = random.Random(3)
+    skip = IndexableSkipList(seed=5)
+    reference = []
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if key in reference and rng.random() < 0.5:
+            skip.remove(key)
+            reference.remove(key)
+        elif key not in reference:
+            skip.insert(key)
+            reference.append(key)
+    reference.sort()
+    
+    assert len(skip) == len(reference) and list(skip) == reference
+    assert [skip[i] for i in range(len(reference))] == reference
+    assert skip[-1] == reference[-1]
+    for key in range(0, 500, 7):
+        assert skip.rank(key) == sum(k < key for k in reference)
+    with pytest.raises(KeyError):
+        skip.remove(-1)
+
+
+# =============================================================================
+# LEADERBOARD AGAINST A PLAIN SORT
+# =============================================================================
+
+def test_scores_match_scalar_calculator(board):
+    for entry in list(board.entries.values())[:100]:
+        inputs = {k: v for k, v in entry.inputs.items() if v is not None}
+        assert entry.score == pytest.approx(calculate_tvi(**inputs).score, abs=0.005 + 1e-9)
+        assert entry.tier == calculate_tvi(**inputs).tier
+        assert entry.era == get_era(entry.inputs['year'])
+
+
+@pytest.mark.parametrize('scope', [{}, {'tier': 'cultural_event'}, {'platform': 'youtube'},
+                                   {'era': (2005, 2010)}, {'tier': 'viral_moment', 'platform': 'tiktok'}])
+def test_top_k_matches_sort(board, scope):
+    expected = _reference(board, **scope)[:25]
+    top = board.top_k(25, **scope)
+    assert list(top['Item']) == [e.item_id for e in expected]
+    assert list(top['Rank']) == list(range(1, len(expected) + 1))
+    np.testing.assert_allclose(top['TVI'], [round(e.score, 2) for e in expected])
+
+
+def test_top_k_by_year_uses_its_era(board):
+    pd.testing.assert_frame_equal(board.top_k(10, year=2007), board.top_k(10, era=(2005, 2010)))
+
+
+def test_percentile_and_score_rank_match_sort(board):
+    everything = _reference(board)
+    for entry in everything[::17]:
+        at_or_below = sum(e.score <= entry.score for e in everything)
+        assert board.percentile_rank(entry.item_id) == pytest.approx(100 * at_or_below / len(everything))
+        assert board.score_rank(entry.score) == 1 + sum(e.score > entry.score for e in everything)
+        
+        scoped = _reference(board, platform=entry.platform) if entry.platform else None
+        if scoped:
+            at_or_below = sum(e.score <= entry.score for e in scoped)
+            assert board.percentile_rank(entry.item_id, platform=entry.platform) == \
+                pytest.approx(100 * at_or_below / len(scoped))
+
+
+def test_partitions_hold_exactly_the_entries(board):
+    assert sum(len(p) for p in board.partitions.values()) == len(board)
+    for (tier, era, platform), partition in board.partitions.items():
+        assert len(partition) > 0
+        for neg_score, seq in partition:
+            entry = board._by_seq[seq]
+            assert (entry.tier, entry.era, entry.platform) == (tier, era, platform)
+            assert -neg_score == entry.score
+
+
+def test_load_frame_matches_upserts():
+    rng = random.Random(11)
+    rows = [dict(item_id=i, **_inputs(rng)) for i in range(50)]
+    bulk = TVILeaderboard(seed=1)
+    bulk.load_frame(pd.DataFrame(rows))
+    single = TVILeaderboard(seed=1)
+    for row in rows:
+        single.upsert(**row)
+    pd.testing.assert_frame_equal(bulk.top_k(50), single.top_k(50))
+
+
+def test_unknown_input_or_tier_raises(board):
+    item = next(iter(board.entries))
+    with pytest.raises(ValueError):
+        board.update(item, likes=3)
+    with pytest.raises(ValueError):
+        board.top_k(5, tier='legendary')
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the event-driven memory ecosystem.
+
+The simulator carries per-tier memory mass analytically between events and
+processes each bucket in vectorized rounds. The reference below draws the
+same random numbers but keeps one record per item, handles events one at a
+time and sums memory item by item at every sample, so counts must match
+exactly and masses to rounding.
+
+Run with: python -m pytest test_memory_ecosystem.py
+"""
+
+import numpy as np
+import pytest
+
+from temporal_validation_framework import MEMORY_TIERS, MEMORY_HALF_LIVES, memory_concentration
+from memory_ecosystem import DAYS_PER_YEAR, MEMORY_RESURFACING_RATES, simulate_memory_ecosystem
+
+
+# Fast resurfacing so buckets need several rounds
+RATES = {'Ephemeral': 30.0, 'Viral': 12.0}
+
+
+def _reference(years, arrivals_per_day, sample_days, resurfacing_rates, threshold=0.1, seed=42):
+    """Item-by-item simulation: per-sample arrived/remembered counts and tier masses."""
+    rng = np.random.RandomState(seed)
+    rates = dict(MEMORY_RESURFACING_RATES, **resurfacing_rates)
+    half_lives = [float(h) for h in MEMORY_HALF_LIVES]
+    per_day = [rates[name] / DAYS_PER_YEAR for name, _ in MEMORY_TIERS]
+    edges = [high for _, (low, high) in MEMORY_TIERS[:-1]]
+    n_tiers = len(MEMORY_TIERS)
+    n_buckets = int(np.ceil(years * DAYS_PER_YEAR / sample_days))
+    items = []
+    calendar = {}
+    arrived = [0] * n_tiers
+    counts = {'resurfaced': 0, 'forgotten': 0, 'events': 0}
+    samples = []
+    
+    def schedule(ids, bucket):
+        waits = rng.exponential(1.0, len(ids))
+        groups = {}
+        for item_id, wait in zip(ids, waits):
+            item = items[item_id]
+            resurface = item['now'] + wait / per_day[item['tier']]
+            forget = item['t_reset'] + half_lives[item['tier']] * np.log2(1 / threshold)
+            item['forget'] = forget <= resurface
+            item['next'] = min(forget, resurface)
+            target = int(item['next'] // sample_days)
+            if target < n_buckets:
+                groups.setdefault(target, []).append(item_id)
+        for target in sorted(groups):
+            if target != bucket:
+                calendar.setdefault(target, []).append(groups[target])
+        return groups.get(bucket, [])
+    
+    for b in range(n_buckets):
+        t_end = (b + 1) * sample_days
+        n_new = rng.poisson(arrivals_per_day * sample_days)
+        now = b * sample_days + rng.random_sample(n_new) * sample_days
+        tvi = rng.pareto(1.5, n_new) * 2
+        new = []
+        for k in range(n_new):
+            tier = sum(tvi[k] >= edge for edge in edges)
+            items.append({'tier': tier, 'tvi': tvi[k], 'm0': tvi[k] * np.log10(tvi[k] + 1),
+                          't_reset': now[k], 'now': now[k], 'alive': True})
+            new.append(len(items) - 1)
+            arrived[tier] += 1
+        counts['events'] += n_new
+        due = [schedule(new, b)] + calendar.pop(b, [])
+        
+        while due:
+            ids = [item_id for part in due for item_id in part]
+            due = []
+            if not ids:
+                break
+            counts['events'] += len(ids)
+            back = []
+            for item_id in ids:
+                item = items[item_id]
+                if item['forget']:
+                    item['alive'] = False
+                    counts['forgotten'] += 1
+                else:
+                    item['t_reset'] = item['now'] = item['next']
+                    counts['resurfaced'] += 1
+                    back.append(item_id)
+            if back:
+                due = [schedule(back, b)]
+        
+        mass = [0.0] * n_tiers
+        remembered = [0] * n_tiers
+        for item in items:
+            if item['alive']:
+                tier = item['tier']
+                mass[tier] += item['m0'] * 0.5 ** ((t_end - item['t_reset']) / half_lives[tier])
+                remembered[tier] += 1
+        samples.append({'arrived': list(arrived), 'remembered': remembered, 'mass': mass,
+                        'tvi': sorted(item['tvi'] for item in items if item['alive'])})
+    return samples, counts
+
+
+@pytest.fixture(scope='module')
+def runs():
+    kwargs = dict(years=2, arrivals_per_day=4, sample_days=30, resurfacing_rates=RATES)
+    result = simulate_memory_ecosystem(concentration_every=5, **kwargs)
+    return result, _reference(**kwargs)
+
+
+def test_counters_match_reference(runs):
+    result, (samples, counts) = runs
+    assert result.n_items == sum(samples[-1]['arrived'])
+    assert result.n_resurfaced == counts['resurfaced'] > 0
+    assert result.n_forgotten == counts['forgotten'] > 0
+    assert result.n_events == counts['events']
+
+
+def test_retention_matches_reference(runs):
+    result, (samples, _) = runs
+    n_tiers = len(MEMORY_TIERS)
+    assert len(result.retention) == len(samples) * n_tiers
+    np.testing.assert_array_equal(result.retention['arrived'].to_numpy().reshape(-1, n_tiers),
+                                  [s['arrived'] for s in samples])
+    np.testing.assert_array_equal(result.retention['remembered'].to_numpy().reshape(-1, n_tiers),
+                                  [s['remembered'] for s in samples])
+
+
+def test_memory_mass_matches_item_sum(runs):
+    result, (samples, _) = runs
+    expected = np.array([s['mass'] for s in samples])
+    total = expected.sum(axis=1)
+    np.testing.assert_allclose(result.memory['total_mass'], total, rtol=1e-9)
+    shares = result.memory[[f'{name} share' for name, _ in MEMORY_TIERS]].to_numpy()
+    np.testing.assert_allclose(shares, expected / total[:, None], rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(result.memory['herfindahl'], np.sum((expected / total[:, None]) ** 2, axis=1),
+                               rtol=1e-9)
+
+
+def test_concentration_of_remembered_scores(runs):
+    result, (samples, _) = runs
+    rows = result.memory.dropna(subset=['gini_coefficient'])
+    assert list(rows.index) == [i for i in range(len(samples)) if (i + 1) % 5 == 0]
+    for i in rows.index:
+        assert result.memory['remembered'][i] == len(samples[i]['tvi'])
+        for key, value in memory_concentration(np.array(samples[i]['tvi'])).items():
+            assert rows[key][i] == value
+
+
+def test_slab_growth_keeps_items():
+    # Start far above the slab's initial capacity in the first bucket
+    result = simulate_memory_ecosystem(years=0.2, arrivals_per_day=3000, sample_days=30,
+                                       concentration_every=0)
+    last = result.retention[result.retention['day'] == result.retention['day'].max()]
+    assert last['arrived'].sum() == result.n_items > 1 << 16
+    assert last['remembered'].sum() == result.n_items - result.n_forgotten
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy chunked pipeline.
+
+Chunks are folded in order and items depend only on their index, so the
+result must not depend on the executor or the chunk size. The planner must
+prune dead columns and reject columns that no stage produces.
+
+Run with: python -m pytest test_pipeline.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline import (CATALOG_COLUMNS, EXECUTORS, CollectAggregate, Pipeline, attention_pipeline,
+                      cultural_catalog, fractal_features)
+
+
+COLUMNS = ('hurst', 'fractal_dimension', 'resurfacing_rate', 'persistence_months', 'tvi', 'tvi_tier')
+
+
+def _pipeline(chunk_size=5, n_items=23):
+    return attention_pipeline(n_items=n_items, chunk_size=chunk_size, length=256) \
+        .aggregate(CollectAggregate(COLUMNS))
+
+
+@pytest.fixture(scope='module')
+def serial():
+    return _pipeline().run(executor='serial').value
+
+
+# =============================================================================
+# EXECUTORS AND CHUNKING
+# =============================================================================
+
+@pytest.mark.parametrize('executor', [e for e in EXECUTORS if e != 'serial'])
+def test_executors_match_serial(serial, executor):
+    result = _pipeline().run(executor=executor, n_jobs=2, max_in_flight=2)
+    assert result.executor == executor and result.n_chunks == 5
+    pd.testing.assert_frame_equal(result.value, serial)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 23, 100])
+def test_chunk_size_does_not_change_output(serial, chunk_size):
+    pd.testing.assert_frame_equal(_pipeline(chunk_size).run().value, serial)
+
+
+def test_concentration_aggregate_matches_collected(serial):
+    value = attention_pipeline(n_items=23, chunk_size=5, length=256).run().value
+    assert value['n_items'] == 23
+    assert value['mean_hurst'] == pytest.approx(serial['hurst'].mean(), rel=1e-12)
+    assert value['mean_persistence_months'] == pytest.approx(serial['persistence_months'].mean(),
+                                                             rel=1e-12)
+
+
+def test_timings_cover_every_stage():
+    timings = _pipeline().run().timings
+    assert list(timings['kind']) == ['source', 'map', 'map', 'aggregate']
+    assert timings['share'].sum() == pytest.approx(1.0)
+
+
+# =============================================================================
+# PLANNING
+# =============================================================================
+
+def test_plan_drops_dead_columns():
+    task = _pipeline().plan()
+    assert task.source_keep == CATALOG_COLUMNS
+    # hurst_r_squared is never read; series is dropped once scored
+    assert 'hurst_r_squared' not in task.keep[0]
+    assert task.keep[-1] == COLUMNS
+
+
+def test_unproduced_aggregate_column_raises():
+    with pytest.raises(ValueError, match='missing_column'):
+        _pipeline().aggregate(CollectAggregate(('tvi', 'missing_column'))).plan()
+
+
+def test_unproduced_map_input_raises():
+    pipe = (Pipeline.from_source(cultural_catalog, 4, ('views',), length=32)
+            .map(fractal_features, inputs=('series',), outputs=('hurst',))
+            .aggregate(CollectAggregate(('hurst',))))
+    with pytest.raises(ValueError, match='series'):
+        pipe.plan()
+
+
+def test_run_without_aggregate_raises():
+    with pytest.raises(ValueError):
+        Pipeline.from_source(cultural_catalog, 4, CATALOG_COLUMNS).run()
+
+
+def test_unknown_executor_raises():
+    with pytest.raises(ValueError):
+        _pipeline().run(executor='cluster')
+
+
+def test_items_depend_only_on_index():
+    whole = cultural_catalog(0, 6, length=64)
+    part = cultural_catalog(2, 5, length=64)
+    for name in CATALOG_COLUMNS:
+        np.testing.assert_array_equal(part[name], whole[name][2:5])
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the power-law tail fit against a brute-force KS scan.
+
+The reference tries every distinct x_min with a plain loop (MLE α, exact
+KS over the whole tail). max_candidates=None must reproduce its argmin;
+the default coarse-to-fine scan is a heuristic and must land close to it.
+
+Run with: python -m pytest test_power_law_fit.py
+"""
+
+import numpy as np
+import pytest
+
+from power_law_fit import fit_power_law
+
+
+def _brute_force(x, min_tail):
+    """(KS, x_min, α) minimizing KS over every distinct x_min."""
+    x = np.sort(x)
+    best = (np.inf, None, None)
+    for x_min in np.unique(x):
+        tail = x[x >= x_min]
+        m = len(tail)
+        if m < min_tail:
+            break
+        alpha = 1 + m / np.sum(np.log(tail / x_min))
+        model = 1 - (tail / x_min) ** (1 - alpha)
+        above = np.searchsorted(tail, tail, side='right') / m
+        below = np.searchsorted(tail, tail, side='left') / m
+        ks = max(np.abs(above - model).max(), np.abs(model - below).max())
+        if ks < best[0]:
+            best = (ks, x_min, alpha)
+    return best
+
+
+def _sample(seed, n_body=1500, n_tail=500, rounded=False):
+    """Log-normal body with a Pareto (α = 2.5) tail above 3."""
+    rng = np.random.RandomState(seed)
+    x = np.r_[rng.lognormal(0, 1, n_body), 3 * (1 - rng.random_sample(n_tail)) ** (-1 / 1.5)]
+    return np.ceil(x * 10) / 10 if rounded else x
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+@pytest.mark.parametrize('rounded', [False, True])
+def test_exact_scan_matches_brute_force(seed, rounded):
+    x = _sample(seed, rounded=rounded)
+    ks, x_min, alpha = _brute_force(x, 50)
+    fit = fit_power_law(x, max_candidates=None, ks_points=len(x))
+    assert fit.x_min == x_min
+    assert fit.ks == pytest.approx(ks, abs=1e-12)
+    assert fit.alpha == pytest.approx(alpha, rel=1e-10)
+    # every x_min leaving at least min_tail values was scored
+    assert len(fit.scan) == np.sum(np.unique(x) <= np.sort(x)[-50])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_coarse_to_fine_is_close_to_brute_force(seed):
+    x = _sample(seed)
+    ks, _, _ = _brute_force(x, 50)
+    fit = fit_power_law(x, max_candidates=20, ks_points=len(x))
+    assert ks - 1e-12 <= fit.ks <= ks + 0.005
+    assert len(fit.scan) < len(np.unique(x))
+
+
+def test_max_candidates_validated():
+    with pytest.raises(ValueError):
+        fit_power_law(_sample(0), max_candidates=4)
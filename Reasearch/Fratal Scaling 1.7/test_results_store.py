@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for the columnar results store.
+
+Category columns are encoded chunk by chunk; the decoded values must match
+what was written, whatever the column type and however the rows were split.
+
+Run with: python -m pytest test_results_store.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from results_store import ResultsWriter, ResultsReader
+
+
+@pytest.fixture
+def chunks():
+    rng = np.random.RandomState(42)
+    labels = np.array(['ephemeral', 'viral', 'cultural', 'milestone', 'foundation'])
+    out = []
+    for n, k in ((500, 2), (300, 5), (200, 3)):
+        picked = labels[rng.randint(0, k, n)]
+        out.append(pd.DataFrame({
+            'x': rng.randn(n),
+            'tier': pd.Categorical(picked, categories=labels),
+            'platform': picked.astype(object),
+            'meta': [{'k': int(i)} for i in rng.randint(0, 4, n)],
+        }))
+    return out
+
+
+def test_chunked_categories_roundtrip(tmp_path, chunks):
+    with ResultsWriter(str(tmp_path)) as writer:
+        for chunk in chunks:
+            writer.append_table('items', chunk)
+    
+    table = ResultsReader(str(tmp_path)).table('items')
+    expected = pd.concat(chunks, ignore_index=True)
+    np.testing.assert_array_equal(table['x'], expected['x'])
+    assert list(table['tier'].cat.categories) == list(chunks[0]['tier'].cat.categories)
+    np.testing.assert_array_equal(table['tier'].astype(str), expected['tier'].astype(str))
+    np.testing.assert_array_equal(table['platform'].astype(str), expected['platform'])
+    assert list(table['meta']) == list(expected['meta'])
+
+
+def test_categories_grow_only_by_new_values(tmp_path, chunks):
+    with ResultsWriter(str(tmp_path)) as writer:
+        writer.append_table('items', chunks[0])
+        first = list(writer.tables['items']['columns'][2]['categories'])
+        writer.append_table('items', chunks[1])
+        grown = writer.tables['items']['columns'][2]['categories']
+    assert grown[:len(first)] == first
+    assert len(grown) == len(set(grown)) == 5
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the rolling fractal dimension.
+
+Every window of the pyramid-based estimator must match a direct estimate
+on the window's own samples: dyadic boxes aligned with the series that lie
+inside the window, the variance of their means, and a least-squares fit
+of log variance on log scale.
+
+Run with: python -m pytest test_rolling_fractal.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_fractal import build_box_pyramid, rolling_fractal_dimension
+
+
+@pytest.fixture(scope='module')
+def series():
+    rng = np.random.RandomState(42)
+    n = 1500
+    bursts = np.where(rng.random_sample(n) < 0.02, rng.pareto(1.5, n) * 10, 0.0)
+    return rng.randn(n) + np.convolve(bursts, 0.9 ** np.arange(50))[:n]
+
+
+def _window_hurst(x, start, window, min_scale=1, min_boxes=8):
+    """(H, R², n_scales) of x[start:start + window] by direct box averaging."""
+    log_scales, log_vars = [], []
+    s = 1
+    while s <= max(window // min_boxes, 1):
+        if s >= min_scale:
+            first = -(-start // s)
+            last = (start + window) // s
+            means = np.array([x[k * s:(k + 1) * s].mean() for k in range(first, last)])
+            if len(means) >= min_boxes:
+                variance = means.var(ddof=1)
+                if variance > 0:
+                    log_scales.append(np.log(s))
+                    log_vars.append(np.log(variance))
+        s *= 2
+    if len(log_scales) < 3:
+        return np.nan, np.nan, len(log_scales)
+    slope = np.polyfit(log_scales, log_vars, 1)[0]
+    r = np.corrcoef(log_scales, log_vars)[0, 1]
+    return slope / 2 + 1, r ** 2, len(log_scales)
+
+
+# =============================================================================
+# AGAINST DIRECT ESTIMATES PER WINDOW
+# =============================================================================
+
+@pytest.mark.parametrize('window,step', [(64, 7), (200, 23), (1500, 1)])
+def test_rolling_matches_direct_estimate(series, window, step):
+    timeline = rolling_fractal_dimension(series, window=window, step=step)
+    starts = np.arange(0, len(series) - window + 1, step)
+    np.testing.assert_array_equal(timeline['start'], starts)
+    np.testing.assert_array_equal(timeline['end'], starts + window)
+    
+    expected = np.array([_window_hurst(series, start, window) for start in starts])
+    np.testing.assert_allclose(timeline['hurst_exponent'], expected[:, 0], rtol=1e-9)
+    np.testing.assert_allclose(timeline['r_squared'], expected[:, 1], rtol=1e-9)
+    np.testing.assert_array_equal(timeline['n_scales'], expected[:, 2])
+    np.testing.assert_allclose(timeline['fractal_dimension'], 2 - timeline['hurst_exponent'])
+
+
+def test_min_scale_and_min_boxes(series):
+    timeline = rolling_fractal_dimension(series, window=300, step=50, min_scale=2, min_boxes=4)
+    expected = np.array([_window_hurst(series, start, 300, min_scale=2, min_boxes=4)
+                         for start in range(0, len(series) - 299, 50)])
+    np.testing.assert_allclose(timeline['hurst_exponent'], expected[:, 0], rtol=1e-9)
+
+
+def test_several_windows_match_separate_runs(series):
+    together = rolling_fractal_dimension(series, window=(64, 256), step=40)
+    for w in (64, 256):
+        alone = rolling_fractal_dimension(series, window=w, step=40)
+        pd.testing.assert_frame_equal(together[together['window'] == w].reset_index(drop=True), alone)
+
+
+# =============================================================================
+# EDGE CASES
+# =============================================================================
+
+def test_series_index_labels_window_ends(series):
+    index = pd.date_range('2000-01-01', periods=len(series), freq='D')
+    timeline = rolling_fractal_dimension(pd.Series(series, index=index), window=365, step=100)
+    assert timeline['start'].iloc[1] == index[100]
+    assert timeline['end'].iloc[1] == index[100 + 364]
+
+
+def test_short_or_flat_windows_are_nan():
+    timeline = rolling_fractal_dimension(np.ones(100), window=32, step=10)
+    assert timeline['hurst_exponent'].isna().all()
+    assert rolling_fractal_dimension(np.random.RandomState(0).randn(40), window=16)['n_scales'].max() < 3
+
+
+def test_pyramid_levels_hold_aligned_box_sums(series):
+    pyramid = build_box_pyramid(series, max_scale=16)
+    centered = series - series.mean()
+    for s, sums in zip(pyramid.scales, pyramid.sums):
+        boxes = centered[:len(series) // s * s].reshape(-1, s).sum(axis=1)
+        np.testing.assert_allclose(np.diff(sums), boxes, atol=1e-9)
+
+
+def test_invalid_input_raises():
+    with pytest.raises(ValueError):
+        build_box_pyramid(np.array([1.0, np.nan, 2.0]))
+    with pytest.raises(ValueError):
+        rolling_fractal_dimension(np.ones(10), window=1)
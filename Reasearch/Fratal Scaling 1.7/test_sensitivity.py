@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the Sobol/Morris sensitivity engine.
+
+The chunked, vectorized model evaluations must agree with the scalar
+calculators point by point, and the index estimators with plain loops and
+with the analytic indices of an additive model.
+
+Run with: python -m pytest test_sensitivity.py
+"""
+
+import numpy as np
+import pytest
+
+from temporal_validation_framework import calculate_tvi, calculate_isps, calculate_tdis
+from sensitivity import (MODELS, _evaluate, _resolve_model, _sobol_indices, sobol_analysis,
+                         morris_analysis, morris_trajectories)
+
+
+SCALAR_CALCULATORS = {'tvi': calculate_tvi, 'isps': calculate_isps, 'tdis': calculate_tdis}
+
+# f = 1 x + 2 y + 3 z on the unit cube: S1 = ST = c_i^2 / sum(c^2)
+LINEAR_INPUTS = {'x': (0.0, 1.0), 'y': (0.0, 1.0), 'z': (0.0, 1.0)}
+LINEAR_S = np.array([1.0, 4.0, 9.0]) / 14.0
+
+
+def _linear(x, y, z):
+    return x + 2 * y + 3 * z
+
+
+# =============================================================================
+# MODEL EVALUATION AGAINST THE SCALAR CALCULATORS
+# =============================================================================
+
+@pytest.mark.parametrize('model', sorted(MODELS))
+def test_evaluate_matches_scalar_calculator(model):
+    score_fn, inputs, fixed = _resolve_model(model, None, None)
+    names = list(inputs)
+    bounds = np.array([inputs[name] for name in names], dtype=np.float64)
+    points = np.random.RandomState(42).random_sample((100, len(names)))
+    
+    scores = _evaluate(score_fn, names, bounds, fixed, points)
+    values = bounds[:, 0] + points * (bounds[:, 1] - bounds[:, 0])
+    for i in range(len(points)):
+        kwargs = dict(fixed, **{name: values[i, j] for j, name in enumerate(names)})
+        expected = SCALAR_CALCULATORS[model](**kwargs).score
+        assert scores[i] == pytest.approx(expected, abs=0.005 + 1e-9)
+
+
+# =============================================================================
+# SOBOL
+# =============================================================================
+
+def test_sobol_estimators_match_loops():
+    rng = np.random.RandomState(0)
+    fA, fB, fAB = rng.randn(50), rng.randn(50), rng.randn(50, 3)
+    first, total = _sobol_indices(fA, fB, fAB)
+    
+    variance = np.var(np.concatenate([fA, fB]))
+    for i in range(3):
+        s1 = sum(fB[j] * (fAB[j, i] - fA[j]) for j in range(50)) / 50 / variance
+        st = sum((fA[j] - fAB[j, i]) ** 2 for j in range(50)) / 100 / variance
+        assert first[i] == pytest.approx(s1, rel=1e-12)
+        assert total[i] == pytest.approx(st, rel=1e-12)
+
+
+def test_sobol_recovers_additive_indices():
+    result = sobol_analysis(_linear, inputs=LINEAR_INPUTS, n_samples=2 ** 12, n_bootstrap=20)
+    np.testing.assert_allclose(result['S1'], LINEAR_S, atol=0.02)
+    np.testing.assert_allclose(result['ST'], LINEAR_S, atol=0.02)
+    assert (result['S1_low'] <= result['S1_high']).all()
+    assert result.attrs['n_evaluations'] == 2 ** 12 * 5
+
+
+def test_sobol_chunk_size_does_not_change_indices():
+    one = sobol_analysis('tvi', n_samples=2 ** 10, chunk_size=2 ** 10, n_bootstrap=0)
+    many = sobol_analysis('tvi', n_samples=2 ** 10, chunk_size=2 ** 6, n_bootstrap=0)
+    np.testing.assert_allclose(many[['S1', 'ST']], one[['S1', 'ST']], rtol=1e-12)
+
+
+# =============================================================================
+# MORRIS
+# =============================================================================
+
+def test_morris_trajectories_step_one_input_at_a_time():
+    trajectories = morris_trajectories(200, 4, num_levels=4, seed=1)
+    steps = np.diff(trajectories, axis=1)
+    assert trajectories.shape == (200, 5, 4)
+    assert ((steps > 0).sum(axis=2) == 1).all()
+    np.testing.assert_allclose(steps.sum(axis=2), 4 / 6)
+    assert trajectories.min() >= 0 and trajectories.max() <= 1
+
+
+def test_morris_effects_of_additive_model():
+    result = morris_analysis(_linear, inputs=LINEAR_INPUTS, n_trajectories=50, chunk_size=7,
+                             n_bootstrap=0)
+    np.testing.assert_allclose(result['mu'], [1, 2, 3], rtol=1e-12)
+    np.testing.assert_allclose(result['mu_star'], [1, 2, 3], rtol=1e-12)
+    np.testing.assert_allclose(result['sigma'], 0, atol=1e-12)
+
+
+def test_morris_effects_match_loop():
+    score_fn, inputs, fixed = _resolve_model('isps', None, None)
+    names = list(inputs)
+    bounds = np.array([inputs[name] for name in names], dtype=np.float64)
+    d = len(names)
+    delta = 4 / 6
+    result = morris_analysis('isps', n_trajectories=30, n_bootstrap=0, seed=3)
+    
+    trajectories = morris_trajectories(30, d, num_levels=4, seed=3)
+    effects = np.empty((30, d))
+    for t in range(30):
+        outputs = _evaluate(score_fn, names, bounds, fixed, trajectories[t])
+        for k in range(d):
+            changed = int(np.flatnonzero(trajectories[t, k + 1] != trajectories[t, k])[0])
+            effects[t, changed] = (outputs[k + 1] - outputs[k]) / delta
+    np.testing.assert_allclose(result['mu'], effects.mean(axis=0), rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(result['sigma'], effects.std(axis=0, ddof=1), rtol=1e-12, atol=1e-12)
+
+
+def test_unknown_model_raises():
+    with pytest.raises(ValueError):
+        sobol_analysis('nope')
+    with pytest.raises(ValueError):
+        morris_analysis(_linear)
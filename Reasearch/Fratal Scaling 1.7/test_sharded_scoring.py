@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for sharded batch scoring on the file queue.
+
+Covers the happy path across worker processes and the recovery paths:
+expired leases, releases stranded in releasing/, a commit after the lease
+was lost, and shards parked as failed after max_attempts.
+
+Run with: python -m pytest test_sharded_scoring.py
+"""
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from temporal_validation_framework import calculate_tvi_batch
+from sharded_scoring import (FileQueue, Lease, publish_job, open_queue, run_worker,
+                             run_local_workers, collect_results, commit_output,
+                             score_shard, job_status)
+from results_store import ResultsReader
+
+
+LEASE = 0.5
+
+
+@pytest.fixture
+def catalog():
+    rng = np.random.RandomState(42)
+    n = 250
+    return pd.DataFrame({
+        'views': rng.pareto(1.2, n) * 1e6 + 1e3,
+        'year': rng.randint(1995, 2026, n),
+        'platform_users': rng.uniform(1e7, 2e9, n),
+        'persistence_months': rng.randint(1, 240, n).astype(float),
+    })
+
+
+@pytest.fixture
+def job(tmp_path, catalog):
+    root = str(tmp_path / 'job')
+    publish_job(catalog, root, kind='tvi', shard_size=100,
+                queue={'backend': 'file', 'lease_seconds': LEASE, 'max_attempts': 2})
+    return root
+
+
+def _expected(catalog):
+    return calculate_tvi_batch(**{c: catalog[c].to_numpy() for c in catalog.columns})
+
+
+def _input(root, shard):
+    return ResultsReader(os.path.join(root, 'shards', shard), mmap=False).table('input')
+
+
+def _age(path, seconds):
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime - seconds, stat.st_mtime - seconds))
+
+
+# =============================================================================
+# HAPPY PATH
+# =============================================================================
+
+def test_local_workers_score_every_shard_once(job, catalog):
+    stats = run_local_workers(job, n_workers=2, poll_interval=0.05)
+    assert sum(s.committed for s in stats) == 3
+    assert sum(s.rows for s in stats) == len(catalog)
+    assert job_status(job)['done'] == 3
+    
+    scores = collect_results(job)
+    np.testing.assert_array_equal(scores['row'], np.arange(len(catalog)))
+    np.testing.assert_allclose(scores['score'], _expected(catalog)['score'])
+
+
+def test_failing_shard_is_parked_after_max_attempts(job):
+    shutil.rmtree(os.path.join(job, 'shards', '000001'))
+    stats = run_local_workers(job, n_workers=2, poll_interval=0.05)
+    assert sum(s.committed for s in stats) == 2
+    assert sum(s.failed for s in stats) == 2
+    
+    status = job_status(job)
+    assert status['failed'] == 1 and status['pending'] == 0 and status['leased'] == 0
+    queue = open_queue(job)
+    with open(os.path.join(queue.path, 'failed', '000001')) as f:
+        assert 'attempts' in f.read()
+    with pytest.raises(RuntimeError):
+        collect_results(job)
+
+
+# =============================================================================
+# LEASE RECOVERY
+# =============================================================================
+
+def test_expired_lease_is_requeued(tmp_path):
+    queue = FileQueue(str(tmp_path), lease_seconds=LEASE, max_attempts=3)
+    queue.publish(['a'])
+    lease = queue.claim()
+    assert queue.requeue_expired() == 0
+    
+    _age(os.path.join(queue.path, 'leased', f'a.{lease.token}'), 2 * LEASE)
+    assert queue.requeue_expired() == 1
+    assert not queue.renew(lease) and not queue.complete(lease)
+    assert queue.claim().attempts == 1
+
+
+def test_stranded_release_is_finished(tmp_path):
+    queue = FileQueue(str(tmp_path), lease_seconds=LEASE, max_attempts=3)
+    queue.publish(['a'])
+    lease = queue.claim()
+    # A worker died between moving its lease to releasing/ and requeueing
+    name = f'a.{lease.token}'
+    os.rename(os.path.join(queue.path, 'leased', name), os.path.join(queue.path, 'releasing', name))
+    assert queue.status()['releasing'] == 1
+    assert queue.requeue_expired() == 0
+    
+    _age(os.path.join(queue.path, 'releasing', name), 2 * LEASE)
+    assert queue.requeue_expired() == 1
+    assert queue.status() == {'pending': 1, 'leased': 0, 'releasing': 0, 'done': 0, 'failed': 0}
+
+
+def test_worker_waits_for_stranded_release(job, catalog):
+    queue = open_queue(job)
+    for _ in range(2):
+        lease = queue.claim()
+        assert commit_output(job, lease, score_shard('tvi', _input(job, lease.shard)))
+        queue.complete(lease)
+    lease = queue.claim()
+    name = f'{lease.shard}.{lease.token}'
+    os.rename(os.path.join(queue.path, 'leased', name), os.path.join(queue.path, 'releasing', name))
+    
+    # Nothing pending or leased, but the stranded shard still has to be scored
+    stats = run_worker(job, poll_interval=0.05)
+    assert stats.committed == 1
+    np.testing.assert_allclose(collect_results(job)['score'], _expected(catalog)['score'])
+
+
+def test_commit_after_lost_lease_is_a_duplicate(job):
+    queue = open_queue(job)
+    slow = queue.claim()
+    scores = score_shard('tvi', _input(job, slow.shard))
+    
+    _age(os.path.join(queue.path, 'leased', f'{slow.shard}.{slow.token}'), 2 * LEASE)
+    queue.requeue_expired()
+    # The shard went back to the end of the sorted pending list
+    leases = [queue.claim() for _ in range(3)]
+    fast = next(lease for lease in leases if lease.shard == slow.shard)
+    assert fast.attempts == 1
+    assert commit_output(job, fast, scores) and queue.complete(fast)
+    
+    assert not commit_output(job, slow, scores)
+    assert not queue.complete(slow)
+    assert not [name for name in os.listdir(os.path.join(job, 'output')) if name.startswith('.')]
+
+
+def test_release_of_lost_lease_is_ignored(tmp_path):
+    queue = FileQueue(str(tmp_path), lease_seconds=LEASE, max_attempts=3)
+    queue.publish(['a'])
+    lease = queue.claim()
+    assert not queue.release(Lease('a', 'stale', 0), 'boom')
+    assert queue.release(lease, 'boom')
+    assert queue.claim().attempts == 1
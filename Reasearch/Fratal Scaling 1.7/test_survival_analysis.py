@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized survival analysis.
+
+The segment-sum Kaplan-Meier table, medians and log-rank statistics must
+agree with textbook loops over each group and each distinct time, on data
+with tied times and censoring.
+
+Run with: python -m pytest test_survival_analysis.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from survival_analysis import (kaplan_meier, median_survival, logrank_test, bootstrap_survival,
+                               isps_survival_analysis)
+
+
+@pytest.fixture(scope='module')
+def cohort():
+    rng = np.random.RandomState(42)
+    n = 400
+    groups = rng.choice(['a', 'b', 'c'], n)
+    scale = np.where(groups == 'a', 5.0, np.where(groups == 'b', 8.0, 12.0))
+    failure = np.ceil(rng.exponential(scale))
+    censor = np.ceil(rng.uniform(1, 25, n))
+    return {
+        'durations': np.minimum(failure, censor),
+        'events': (failure <= censor).astype(int),
+        'groups': groups,
+        'strata': rng.choice(['2001', '2008', '2020'], n),
+    }
+
+
+def _km_loop(durations, events):
+    """(time, at_risk, events, censored, S, Greenwood sum) per distinct time."""
+    rows = []
+    survival, greenwood = 1.0, 0.0
+    for t in np.unique(durations):
+        at_risk = int(np.sum(durations >= t))
+        deaths = int(np.sum((durations == t) & (events == 1)))
+        censored = int(np.sum((durations == t) & (events == 0)))
+        survival *= 1 - deaths / at_risk
+        if deaths < at_risk:
+            greenwood += deaths / (at_risk * (at_risk - deaths))
+        rows.append((t, at_risk, deaths, censored, survival, greenwood))
+    return rows
+
+
+def _logrank_loop(durations, events, groups, labels):
+    """Observed - expected deaths and covariance, one distinct time at a time."""
+    k = len(labels)
+    u = np.zeros(k)
+    v = np.zeros((k, k))
+    for t in np.unique(durations[events == 1]):
+        at_risk = np.array([np.sum((durations >= t) & (groups == g)) for g in labels], dtype=float)
+        deaths = np.array([np.sum((durations == t) & (events == 1) & (groups == g)) for g in labels])
+        N, D = at_risk.sum(), deaths.sum()
+        u += deaths - D * at_risk / N
+        if N > 1:
+            for i in range(k):
+                for j in range(k):
+                    v[i, j] += D * (N - D) / (N - 1) * (at_risk[i] / N * ((i == j) - at_risk[j] / N))
+    return u, v
+
+
+def _chi2(u, v):
+    statistic = u[:-1] @ np.linalg.inv(v[:-1, :-1]) @ u[:-1]
+    return statistic, stats.chi2.sf(statistic, len(u) - 1)
+
+
+# =============================================================================
+# KAPLAN-MEIER
+# =============================================================================
+
+def test_kaplan_meier_matches_loop(cohort):
+    km = kaplan_meier(cohort['durations'], cohort['events'], cohort['groups'])
+    for label in ('a', 'b', 'c'):
+        mask = cohort['groups'] == label
+        expected = np.array(_km_loop(cohort['durations'][mask], cohort['events'][mask]))
+        curve = km[km['group'] == label]
+        np.testing.assert_array_equal(curve['time'], expected[:, 0])
+        np.testing.assert_array_equal(curve['at_risk'], expected[:, 1])
+        np.testing.assert_array_equal(curve['events'], expected[:, 2])
+        np.testing.assert_array_equal(curve['censored'], expected[:, 3])
+        np.testing.assert_allclose(curve['survival'], expected[:, 4], rtol=1e-12, atol=1e-15)
+        np.testing.assert_allclose(curve['std_error'], expected[:, 4] * np.sqrt(expected[:, 5]),
+                                   rtol=1e-10, atol=1e-15)
+    assert ((km['ci_low'] <= km['survival']) & (km['survival'] <= km['ci_high'])).all()
+
+
+def test_kaplan_meier_wiped_out_group():
+    km = kaplan_meier([1, 2, 2, 3, 3], [1, 1, 1, 1, 1])
+    np.testing.assert_allclose(km['survival'], [0.8, 0.4, 0.0])
+    np.testing.assert_array_equal(km['std_error'][2], 0.0)
+    assert 'group' not in km
+
+
+def test_median_survival_matches_loop(cohort):
+    medians = median_survival(cohort['durations'], cohort['events'], cohort['groups'])
+    for label in ('a', 'b', 'c'):
+        mask = cohort['groups'] == label
+        curve = _km_loop(cohort['durations'][mask], cohort['events'][mask])
+        expected = next((t for t, *_, s, _ in curve if s <= 0.5), np.inf)
+        assert medians[label] == expected
+
+
+# =============================================================================
+# LOG-RANK
+# =============================================================================
+
+def test_logrank_matches_loop(cohort):
+    result = logrank_test(cohort['durations'], cohort['events'], cohort['groups'])
+    u, v = _logrank_loop(cohort['durations'], cohort['events'], cohort['groups'], ['a', 'b', 'c'])
+    statistic, p_value = _chi2(u, v)
+    assert result['chi2'][0] == pytest.approx(statistic, rel=1e-10)
+    assert result['p_value'][0] == pytest.approx(p_value, rel=1e-8)
+    assert result['df'][0] == 2
+
+
+def test_stratified_logrank_sums_strata(cohort):
+    result = logrank_test(cohort['durations'], cohort['events'], cohort['groups'], cohort['strata'])
+    total_u = np.zeros(3)
+    total_v = np.zeros((3, 3))
+    for k, stratum in enumerate(['2001', '2008', '2020']):
+        mask = cohort['strata'] == stratum
+        u, v = _logrank_loop(cohort['durations'][mask], cohort['events'][mask],
+                             cohort['groups'][mask], ['a', 'b', 'c'])
+        assert result['chi2'][k] == pytest.approx(_chi2(u, v)[0], rel=1e-10)
+        total_u += u
+        total_v += v
+    overall = result[result['stratum'] == 'overall'].iloc[0]
+    assert overall['chi2'] == pytest.approx(_chi2(total_u, total_v)[0], rel=1e-10)
+    assert overall['n'] == len(cohort['durations'])
+
+
+# =============================================================================
+# BOOTSTRAP AND ISPS PANELS
+# =============================================================================
+
+def test_bootstrap_is_deterministic_across_threads(cohort):
+    args = (cohort['durations'], cohort['events'], cohort['groups'])
+    one = bootstrap_survival(*args, n_bootstrap=40, n_jobs=1, seed=3)
+    many = bootstrap_survival(*args, n_bootstrap=40, n_jobs=3, seed=3)
+    pd.testing.assert_frame_equal(one, many)
+    assert ((one['ci_low'] <= one['estimate']) | np.isinf(one['estimate'])).all()
+
+
+def test_isps_survival_analysis_groups_by_tier(cohort):
+    panel = pd.DataFrame({'duration': cohort['durations'], 'event': cohort['events'],
+                          'isps': np.where(cohort['groups'] == 'a', 5.0, 500.0),
+                          'window': cohort['strata']})
+    result = isps_survival_analysis(panel, window='window')
+    assert len(result['logrank']) == 4
+    assert result['median'].index.str.contains(' / ').all()
+    assert len(result['km']['group'].unique()) == 6
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for as-of rescoring from cached time-invariant terms.
+
+Scoring as of a year must agree with a full rescore at that year: the
+vectorized `*_score_array` functions exactly, and the scalar calculators
+item by item (which round scores to 2 decimals).
+
+Run with: python -m pytest test_temporal_rescoring.py
+"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from temporal_validation_framework import (calculate_tvi, calculate_isps, calculate_tdis,
+                                           tvi_score_array, isps_score_array, tdis_score_array)
+from temporal_rescoring import AsOfTVIScorer, AsOfISPSScorer, AsOfTDISScorer
+
+
+YEARS = [2012, 2020, 2026, 2031]
+
+
+@pytest.fixture(scope='module')
+def catalogs():
+    rng = np.random.RandomState(42)
+    n = 120
+    return {
+        'tvi': {
+            'views': rng.pareto(1.2, n) * 1e6 + 1e3,
+            'year': rng.randint(1995, 2012, n),
+            'platform_users': rng.uniform(1e7, 2e9, n),
+            'persistence_months': rng.randint(1, 240, n).astype(float),
+            'resurfacing_rate': rng.uniform(0, 1.5, n),
+            'legacy_level': rng.choice([1.0, 2.0, 3.0], n),
+        },
+        'isps': {
+            'brand_awareness': rng.uniform(0.01, 1, n),
+            'market_position': rng.randint(1, 11, n),
+            'founding_year': rng.randint(1850, 2012, n),
+            'crisis_survival_score': rng.randint(0, 6, n),
+            'leadership_continuity': rng.uniform(0.5, 2.0, n),
+        },
+        'tdis': {
+            'citations': rng.randint(1, 1_000_000, n),
+            'usage_score': rng.uniform(0.01, 1, n),
+            'release_year': rng.randint(1980, 2012, n),
+            'researcher_population': rng.uniform(1e2, 1e7, n),
+        },
+    }
+
+
+MODELS = {
+    'tvi': (AsOfTVIScorer, tvi_score_array, calculate_tvi),
+    'isps': (AsOfISPSScorer, isps_score_array, calculate_isps),
+    'tdis': (AsOfTDISScorer, tdis_score_array, calculate_tdis),
+}
+
+
+def _item(inputs, i):
+    return {k: v[i].item() for k, v in inputs.items()}
+
+
+# =============================================================================
+# AGAINST A FULL RESCORE
+# =============================================================================
+
+@pytest.mark.parametrize('model', sorted(MODELS))
+def test_score_many_matches_array_rescore(catalogs, model):
+    scorer_class, score_array, _ = MODELS[model]
+    inputs = catalogs[model]
+    history = scorer_class(**inputs, dtype='float64').score_many(YEARS, chunk_size=50)
+    for j, year in enumerate(YEARS):
+        expected = score_array(**inputs, current_year=year, dtype='float64')
+        np.testing.assert_allclose(history[:, j], expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize('model', sorted(MODELS))
+def test_score_matches_scalar_calculator(catalogs, model):
+    scorer_class, _, calculate = MODELS[model]
+    inputs = catalogs[model]
+    scorer = scorer_class(**inputs, dtype='float64')
+    for year in YEARS:
+        scores = scorer.score(year)
+        for i in range(0, len(scores), 3):
+            expected = calculate(**_item(inputs, i), current_year=year).score
+            assert scores[i] == pytest.approx(expected, abs=0.005 + 1e-9)
+
+
+def test_explicit_account_factor_is_time_invariant(catalogs):
+    inputs = catalogs['tvi']
+    scorer = AsOfTVIScorer(**inputs, account_factor=2.0, dtype='float64')
+    history = scorer.score_many(YEARS)
+    np.testing.assert_allclose(history, history[:, :1].repeat(len(YEARS), axis=1))
+    np.testing.assert_allclose(history[:, 0], tvi_score_array(**inputs, account_factor=2.0,
+                                                              dtype='float64'), rtol=1e-12)
+
+
+# =============================================================================
+# INPUT FORMS
+# =============================================================================
+
+def test_dates_score_as_their_year(catalogs):
+    scorer = AsOfTDISScorer(**catalogs['tdis'], dtype='float64')
+    expected = scorer.score(2020)
+    for as_of in (date(2020, 6, 1), np.datetime64('2020-03-15'), 2020.0):
+        np.testing.assert_array_equal(scorer.score(as_of), expected)
+
+
+def test_chunk_size_and_out_buffer(catalogs, tmp_path):
+    scorer = AsOfISPSScorer(**catalogs['isps'], dtype='float64')
+    whole = scorer.score_many(YEARS)
+    out = np.lib.format.open_memmap(str(tmp_path / 'scores.npy'), mode='w+',
+                                    dtype=np.float64, shape=whole.shape)
+    assert scorer.score_many(YEARS, out=out, chunk_size=7) is out
+    np.testing.assert_array_equal(out, whole)
+
+
+def test_scalar_inputs_broadcast():
+    scorer = AsOfTDISScorer(np.array([10, 1000]), 0.5, 2015, 1e5, dtype='float64')
+    assert scorer.n_items == 2
+    np.testing.assert_allclose(scorer.score(2026),
+                               tdis_score_array(np.array([10, 1000]), 0.5, 2015, 1e5,
+                                                dtype='float64'), rtol=1e-12)
+
+
+def test_float32_scores(catalogs):
+    scorer = AsOfTVIScorer(**catalogs['tvi'], dtype='float32')
+    scores = scorer.score(2026)
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, tvi_score_array(**catalogs['tvi'], dtype='float64'),
+                               rtol=1e-5)